@@ -0,0 +1,99 @@
+"""
+Cold-start regression benchmark for the GUI.
+
+Each run starts a fresh interpreter that imports main.py, builds the main window
+(skipping the permission dialog), and reports the startup timeline when the
+window first paints. The medians are checked against cold_start_budget.json.
+
+    python benchmarks/cold_start.py [--runs 5] [--update-budget]
+
+Use QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cold_start_budget.json")
+TOLERANCE = 1.2  # A run fails when a median exceeds its budget by more than 20%
+
+def child():
+    """Runs in the fresh interpreter: build the window and print the timeline as JSON."""
+    sys.path.insert(0, REPO_ROOT)
+    import main
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    main.timeline.mark("QApplication created")
+    main.apply_stylesheet(app)
+    window = main.create_window()
+    main.timeline.mark("main window built")
+
+    def report(timeline):
+        result = timeline.summary()
+        result['loaded_modules'] = sorted(sys.modules)
+        print("COLD_START " + json.dumps(result), flush=True)
+        os._exit(0)  # The tracker thread does not need a clean shutdown here
+
+    main.timeline.watch_first_paint(window, report)
+    window.show()
+    app.exec_()
+
+def run_once():
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120
+    ).stdout
+    for line in output.splitlines():
+        if line.startswith("COLD_START "):
+            return json.loads(line[len("COLD_START "):])
+    raise RuntimeError("Child run did not reach first paint")
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the main window")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update-budget", action="store_true", help="Record these medians as the new budget")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return 0
+
+    runs = [run_once() for _ in range(args.runs)]
+    first_paint = statistics.median(
+        next(m['seconds'] for m in run['marks'] if m['label'] == "first paint") for run in runs
+    )
+    rss_mb = statistics.median(run['rss_bytes'] for run in runs) / (1024 * 1024)
+    print(f"Time to first paint: {first_paint * 1000:.1f} ms (median of {len(runs)})")
+    print(f"RSS at first paint:  {rss_mb:.1f} MB")
+    for span in runs[-1]['spans']:
+        print(f"  {span['label']:<28} {span['seconds'] * 1000:8.1f} ms  ({span['modules']} modules)")
+
+    with open(BUDGET_FILE, "r") as f:
+        budget = json.load(f)
+    if args.update_budget:
+        budget['time_to_first_paint_s'] = round(first_paint, 3)
+        budget['rss_mb'] = round(rss_mb, 1)
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(budget, f, indent=4)
+        print(f"Budget updated in {BUDGET_FILE}")
+        return 0
+
+    failures = []
+    if first_paint > budget['time_to_first_paint_s'] * TOLERANCE:
+        failures.append(f"time to first paint {first_paint:.3f}s over budget {budget['time_to_first_paint_s']}s")
+    if rss_mb > budget['rss_mb'] * TOLERANCE:
+        failures.append(f"RSS {rss_mb:.1f} MB over budget {budget['rss_mb']} MB")
+    loaded = set(runs[-1]['loaded_modules'])
+    for module in budget['deferred_modules']:
+        if module in loaded:
+            failures.append(f"{module} is imported before the window appears")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
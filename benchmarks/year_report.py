@@ -0,0 +1,98 @@
+"""
+Time and peak-memory benchmark for year-long PDF reports with per-day detail.
+
+Generates a synthetic year of sessions, then renders the daily-detail PDF in a
+fresh interpreter per mode and reports wall time and peak RSS:
+
+    stream  DailyDetailReport streamed through StreamingDocTemplate (what exports use)
+    list    The same flowables collected into one list and passed to doc.build()
+
+    python benchmarks/year_report.py [--days 365] [--sessions-per-day 120]
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = ["VS Code", "Chrome", "Firefox", "Figma", "Docker", "Postman", "PyCharm", "Windows Terminal",
+        "Slack Helper", "Sublime Text", "DBeaver", "Android Studio", "Edge", "Photoshop", "Powershell"]
+
+def write_synthetic_year(path, days, sessions_per_day, seed=42):
+    """Write `days` days of back-to-back session rows ending yesterday."""
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=days)
+    with open(path, "w") as f:
+        for offset in range(days):
+            current = datetime.combine(first_day + timedelta(days=offset), datetime.min.time()) + timedelta(hours=8)
+            for _ in range(sessions_per_day):
+                duration = rng.randint(20, 600)
+                end = current + timedelta(seconds=duration)
+                if end.date() != current.date():
+                    break
+                f.write(f"{current:%Y-%m-%d},{current:%H:%M:%S},{end:%H:%M:%S},{rng.choice(APPS)},{duration}\n")
+                current = end + timedelta(seconds=rng.randint(0, 120))
+    return first_day, first_day + timedelta(days=days - 1)
+
+def child(mode, data_dir, start, end):
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(data_dir)  # LogManager reads usage_data.txt from the working directory
+    from modules.log_manager import LogManager
+    from modules.streaming_report import DailyDetailReport, StreamingDocTemplate
+    from modules.report_renderer import page_decorator
+    from reportlab.platypus import SimpleDocTemplate
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+
+    logger = LogManager()
+    report = DailyDetailReport(logger, date.fromisoformat(start), date.fromisoformat(end))
+    logger.store.usage_cube()  # Build the shared rollups outside the timed section
+    logger.store.app_index()
+    output = os.path.join(data_dir, f"report_{mode}.pdf")
+    started = time.perf_counter()
+    if mode == "stream":
+        report.write(output)
+    else:
+        doc = SimpleDocTemplate(output, pagesize=letter, leftMargin=0.5*inch, rightMargin=0.5*inch,
+                                topMargin=1*inch, bottomMargin=0.75*inch)
+        on_page = page_decorator()
+        doc.build(list(report.flowables()), onFirstPage=on_page, onLaterPages=on_page)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+    print(f"RESULT {mode} {elapsed:.2f} {peak_mb:.1f} {os.path.getsize(output)}", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Year-long daily-detail PDF benchmark")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sessions-per-day", type=int, default=120)
+    parser.add_argument("--modes", default="stream,list")
+    parser.add_argument("--child", nargs=4, metavar=("MODE", "DIR", "START", "END"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        start, end = write_synthetic_year(os.path.join(data_dir, "usage_data.txt"), args.days, args.sessions_per_day)
+        size_mb = os.path.getsize(os.path.join(data_dir, "usage_data.txt")) / (1024 * 1024)
+        print(f"Synthetic data: {args.days} days, up to {args.sessions_per_day} sessions/day ({size_mb:.1f} MB)")
+        for mode in args.modes.split(","):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, data_dir, start.isoformat(), end.isoformat()],
+                capture_output=True, text=True
+            )
+            result = [line for line in output.stdout.splitlines() if line.startswith("RESULT ")]
+            if not result:
+                print(f"{mode}: failed\n{output.stderr[-2000:]}")
+                continue
+            _, mode, elapsed, peak_mb, pdf_bytes = result[0].split()
+            print(f"{mode:<7} {float(elapsed):8.2f} s  peak RSS {float(peak_mb):8.1f} MB  PDF {int(pdf_bytes) / (1024 * 1024):.1f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
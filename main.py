@@ -1,32 +1,56 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QDialog, QMessageBox
-from modules.gui import MainWindow, PermissionDialog
-from modules.activity_tracker import ActivityTracker
-from modules.log_manager import LogManager
+from modules.startup_timeline import startup_timeline
+timeline = startup_timeline()
+with timeline.span("import PyQt5.QtWidgets"):
+    from PyQt5.QtWidgets import QApplication, QDialog, QMessageBox
+with timeline.span("import modules.gui"):
+    from modules.gui import MainWindow, PermissionDialog
+with timeline.span("import tracker, log manager"):
+    from modules.activity_tracker import ActivityTracker, RemoteActivityTracker
+    from modules.tracker_client import TrackerClient
+    from modules.log_manager import LogManager
 
-def main():
-    app = QApplication(sys.argv)
+STYLESHEET_FILE = "assets/style.qss"
 
-    # Load stylesheet
+def apply_stylesheet(app):
+    """Load the stylesheet once, application-wide (the main window inherits it)."""
     try:
-        with open("assets/style.qss", "r") as f:
+        with open(STYLESHEET_FILE, "r") as f:
             app.setStyleSheet(f.read())
     except FileNotFoundError:
         print("Warning: style.qss not found. Proceeding with default styling.")
 
+def create_window():
+    logger = LogManager()
+    client = TrackerClient()
+    if client.available():
+        # A tracker daemon is running: attach to it instead of tracking in this process
+        print(f"Debug: Attaching to tracker daemon at {client.socket_path}")
+        tracker = RemoteActivityTracker(client)
+    else:
+        tracker = ActivityTracker()
+    return MainWindow(tracker, logger)
+
+def main():
+    app = QApplication(sys.argv)
+    timeline.mark("QApplication created")
+
+    apply_stylesheet(app)
+
     # Check permissions
     permission_dialog = PermissionDialog()
     if permission_dialog.exec_() != QDialog.Accepted:
         QMessageBox.critical(None, "Permission Required",
                              "Application cannot run without permissions")
         sys.exit(1)
+    timeline.mark("permission accepted")
 
     # Initialize components
-    logger = LogManager()
-    tracker = ActivityTracker()
-    window = MainWindow(tracker, logger)
+    window = create_window()
+    timeline.mark("main window built")
 
     # Show main window
+    timeline.watch_first_paint(window)
     window.show()
 
     sys.exit(app.exec_())
@@ -0,0 +1,77 @@
+from array import array
+
+MAX_LANES = 64  # One bit per app in each sample
+OTHER_LANE_NAME = "Other"
+
+class ActivityRingBuffer:
+    """
+    Fixed-size ring of per-tick app-presence samples. Each sample is a 64-bit mask
+    with one bit per app lane, so memory is constant however long tracking runs.
+    A lane whose app has no samples left in the window is given to the next new app;
+    apps beyond MAX_LANES - 1 present at once share the last "Other" lane.
+    """
+
+    def __init__(self, capacity=15 * 60):
+        self.capacity = capacity
+        self._samples = array('Q', bytes(8 * capacity))
+        self._head = 0  # Slot the next sample is written to
+        self.count = 0  # Samples currently held (<= capacity)
+        self.total_appended = 0  # Monotonic, lets readers find samples they have not drawn yet
+        self.lane_names = []  # lane index: app name
+        self.lane_ticks = [0] * MAX_LANES  # lane index: samples in the window with the lane set
+        self._lane_of = {}  # app name: lane index
+
+    def lane_for(self, app_name, in_use=0):
+        """Return the app's lane; in_use is a mask of lanes taken by the sample being built."""
+        lane = self._lane_of.get(app_name)
+        if lane is not None:
+            return lane
+        if len(self.lane_names) < MAX_LANES - 1:
+            lane = len(self.lane_names)
+            self.lane_names.append(app_name)
+        else:
+            lane = next((lane for lane in range(MAX_LANES - 1) if not self.lane_ticks[lane] and not in_use >> lane & 1), None)
+            if lane is None:
+                if len(self.lane_names) == MAX_LANES - 1:
+                    self.lane_names.append(OTHER_LANE_NAME)
+                return MAX_LANES - 1  # Not remembered, so the app gets its own lane once one frees up
+            del self._lane_of[self.lane_names[lane]]  # Its app has left the window
+            self.lane_names[lane] = app_name
+        self._lane_of[app_name] = lane
+        return lane
+
+    def active_lanes(self):
+        """Return the lanes set in at least one sample in the window, in lane order."""
+        return [lane for lane in range(len(self.lane_names)) if self.lane_ticks[lane]]
+
+    def _count_lanes(self, mask, step):
+        lane = 0
+        while mask:
+            if mask & 1:
+                self.lane_ticks[lane] += step
+            mask >>= 1
+            lane += 1
+
+    def append(self, active_apps):
+        """Record one tick; active_apps is any iterable of app names."""
+        if self.count == self.capacity:
+            self._count_lanes(self._samples[self._head], -1)  # The oldest sample leaves the window
+        mask = 0
+        for app in active_apps:
+            mask |= 1 << self.lane_for(app, mask)
+        self._count_lanes(mask, 1)
+        self._samples[self._head] = mask
+        self._head = (self._head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total_appended += 1
+
+    def sample(self, age):
+        """Return the mask recorded `age` ticks ago (0 = newest)."""
+        if age >= self.count:
+            return 0
+        return self._samples[(self._head - 1 - age) % self.capacity]
+
+    def samples_since(self, seen_total):
+        """Return masks appended after the reader's seen_total, oldest first (at most capacity)."""
+        new = min(self.total_appended - seen_total, self.count)
+        return [self.sample(age) for age in range(new - 1, -1, -1)]
\ No newline at end of file
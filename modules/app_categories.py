@@ -0,0 +1,30 @@
+from functools import lru_cache
+
+# App name keywords per category; the tracker's default tracked_apps is the union of these
+APP_CATEGORIES = {
+    'editors': (
+        'code', 'vscode', 'visual studio', 'android studio', 'studio', 'android-studio', 'pycharm',
+        'sublime', 'atom', 'notepad++', 'intellij', 'eclipse', 'cursor',
+    ),
+    'browsers': ('chrome', 'firefox', 'edge', 'safari', 'opera', 'brave'),
+    'design': ('photoshop', 'illustrator', 'figma', 'xd'),
+    'devtools': ('docker', 'postman', 'git', 'github desktop', 'wsl'),
+    'terminals': ('terminal', 'cmd', 'powershell', 'windows terminal', 'iterm'),
+    'databases': ('dbeaver', 'mysql', 'mongodb', 'postgresql'),
+}
+
+OTHER_CATEGORY = 'other'
+
+def all_keywords():
+    """Return every keyword across all categories."""
+    return {keyword for keywords in APP_CATEGORIES.values() for keyword in keywords}
+
+@lru_cache(maxsize=1024)
+def category_for(app_name):
+    """Return the category of an app name, matching keywords the same way the tracker does."""
+    app_lower = app_name.lower()
+    for category, keywords in APP_CATEGORIES.items():
+        for keyword in keywords:
+            if keyword in app_lower:
+                return category
+    return OTHER_CATEGORY
\ No newline at end of file
@@ -0,0 +1,79 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from heapq import merge
+
+def canonical_app_name(app_name):
+    """Key used to group spellings of the same app ("VS Code", "vs code ")."""
+    return " ".join(app_name.split()).casefold()
+
+class AppDayIndex:
+    """Inverted index from canonical app name to the sorted day numbers it was used on."""
+
+    def __init__(self):
+        self._days = {}  # canonical name: array of date ordinals, sorted and unique
+        self._names = {}  # canonical name: display name as last stored
+
+    def add_record(self, record):
+        """Store-view hook: index one usage record."""
+        self.add(record.app, record.day)
+
+    def add(self, app_name, day):
+        key = canonical_app_name(app_name)
+        ordinal = date.fromisoformat(day).toordinal()
+        days = self._days.get(key)
+        if days is None:
+            self._days[key] = array('I', [ordinal])
+            self._names[key] = app_name
+            return
+        # Records arrive almost in day order, so this is usually an append or a no-op
+        if days[-1] < ordinal:
+            days.append(ordinal)
+        elif days[-1] != ordinal:
+            pos = bisect_left(days, ordinal)
+            if pos == len(days) or days[pos] != ordinal:
+                insort(days, ordinal)
+
+    def apps(self):
+        """Return the display names of every indexed app."""
+        return sorted(self._names.values())
+
+    def match(self, query):
+        """Return canonical names matching a search string (exact match wins over substring)."""
+        key = canonical_app_name(query)
+        if not key:
+            return []
+        if key in self._days:
+            return [key]
+        return [name for name in self._days if key in name]
+
+    def days_for(self, app_name, start_date=None, end_date=None):
+        """
+        Return the days an app was used, optionally limited to a date range.
+        Args:
+            app_name (str): App name or search string
+            start_date (date): First day to include, or None
+            end_date (date): Last day to include, or None
+        Returns:
+            list: Sorted, de-duplicated dates
+        """
+        slices = []
+        for key in self.match(app_name):
+            days = self._days[key]
+            lo = bisect_left(days, start_date.toordinal()) if start_date else 0
+            hi = bisect_right(days, end_date.toordinal()) if end_date else len(days)
+            slices.append(days[lo:hi])
+        result = []
+        for ordinal in merge(*slices):
+            if not result or result[-1] != ordinal:
+                result.append(ordinal)
+        return [date.fromordinal(ordinal) for ordinal in result]
+
+    def last_used(self, app_name):
+        """Return the most recent day an app (or any matching app) was used, or None."""
+        last = max((self._days[key][-1] for key in self.match(app_name)), default=None)
+        return date.fromordinal(last) if last is not None else None
+
+    def display_names(self, query):
+        """Return the stored display names matching a search string."""
+        return [self._names[key] for key in self.match(query)]
\ No newline at end of file
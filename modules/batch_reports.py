@@ -0,0 +1,189 @@
+"""
+Batch report generation: aggregate many report specs from the shared rollups in
+this process, then render them in parallel worker processes.
+
+    python -m modules.batch_reports specs.json [--workers N]
+    python -m modules.batch_reports --month 2026-09 --per day --out-dir reports [--format pdf]
+
+A spec file is a JSON list of objects with "output", "start" and "end" (YYYY-MM-DD)
+and optionally "format" (pdf, txt, html), "apps", "categories", "time_window",
+"weekdays" and "log_file" (for reports on another person's usage file).
+"""
+import argparse
+import json
+import os
+import sys
+from calendar import monthrange
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime as dt, timedelta
+from modules.log_manager import LogManager
+from modules.exporter import ReportExporter
+from modules.usage_filter import UsageFilter
+from modules.report_renderer import REPORT_FORMATS, ReportRenderer
+
+DEFAULT_LOG_FILE = "usage_data.txt"
+
+class ReportSpec:
+    """One report to produce: output path, format, inclusive date range, optional filter and source log."""
+
+    def __init__(self, output, start_date, end_date, report_format="pdf", usage_filter=None, log_file=DEFAULT_LOG_FILE):
+        self.output = output
+        self.start_date = start_date
+        self.end_date = end_date
+        self.report_format = report_format
+        self.usage_filter = usage_filter
+        self.log_file = log_file
+
+    @classmethod
+    def from_dict(cls, data):
+        usage_filter = None
+        if any(data.get(key) for key in ("apps", "categories", "time_window", "weekdays")):
+            usage_filter = UsageFilter(data.get("apps"), data.get("categories"),
+                                       data.get("time_window"), data.get("weekdays"))
+        return cls(data["output"], date.fromisoformat(data["start"]), date.fromisoformat(data["end"]),
+                   data.get("format", "pdf"), usage_filter, data.get("log_file", DEFAULT_LOG_FILE))
+
+    def __repr__(self):
+        return f"ReportSpec({self.output!r}, {self.start_date} to {self.end_date}, {self.report_format})"
+
+class BatchResult:
+    def __init__(self, spec, error=None, size=0):
+        self.spec = spec
+        self.error = error  # None on success, otherwise the failure message for this spec only
+        self.size = size  # Bytes written
+
+    @property
+    def ok(self):
+        return self.error is None
+
+def month_specs(year, month, per="day", out_dir=".", report_format="pdf", usage_filter=None,
+                log_file=DEFAULT_LOG_FILE, name_prefix="TimeReport"):
+    """Specs for one report per day, per ISO week (clipped to the month) or for the whole month."""
+    first = date(year, month, 1)
+    last = date(year, month, monthrange(year, month)[1])
+    ranges = []
+    if per == "day":
+        ranges = [(first + timedelta(days=i),) * 2 for i in range((last - first).days + 1)]
+    elif per == "week":
+        start = first
+        while start <= last:
+            end = min(start + timedelta(days=6 - start.weekday()), last)
+            ranges.append((start, end))
+            start = end + timedelta(days=1)
+    else:
+        ranges = [(first, last)]
+    specs = []
+    for start, end in ranges:
+        label = start.isoformat() if start == end else f"{start.isoformat()}_{end.isoformat()}"
+        output = os.path.join(out_dir, f"{name_prefix}_{label}.{report_format}")
+        specs.append(ReportSpec(output, start, end, report_format, usage_filter, log_file))
+    return specs
+
+def _render_job(report, report_format, output):
+    """Worker-process entry point: render one aggregate and write it atomically."""
+    data = ReportRenderer(max_entries=0).render(report, report_format)
+    temp_path = output + ".part"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, output)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return len(data)
+
+def run_batch(specs, workers=None, generated_at=None, progress=None):
+    """
+    Aggregate every spec here, render them in a process pool and return BatchResults in spec order.
+    Args:
+        specs (list): ReportSpec objects
+        workers (int): Worker processes, defaults to the CPU count; 1 renders in this process
+        generated_at (str): Footer timestamp for every report, defaults to the batch start; fixing it
+            (with the same data) makes the output byte-for-byte identical between runs
+        progress (callable): Optional progress(done, total, result) as each report finishes
+    """
+    generated_at = generated_at or dt.now().strftime('%Y-%m-%d %H:%M:%S')
+    workers = workers or os.cpu_count() or 1
+    results = [BatchResult(spec) for spec in specs]
+    exporters = {}  # log file: ReportExporter, so specs on one log share its store, cube and query cache
+    jobs = []  # (index, report data)
+    for index, spec in enumerate(specs):
+        try:
+            if spec.report_format not in REPORT_FORMATS:
+                raise ValueError(f"Unsupported report format: {spec.report_format}")
+            exporter = exporters.get(spec.log_file)
+            if exporter is None:
+                if not os.path.exists(spec.log_file):
+                    raise FileNotFoundError(f"Usage file not found: {spec.log_file}")
+                exporter = exporters[spec.log_file] = ReportExporter(LogManager(spec.log_file))
+            jobs.append((index, exporter.report_data(spec.start_date, spec.end_date, spec.usage_filter,
+                                                     generated_at=generated_at)))
+        except Exception as e:
+            results[index].error = f"Aggregation failed: {e}"
+
+    done = 0
+    def finish(index, size=0, error=None):
+        nonlocal done
+        results[index].size = size
+        results[index].error = error
+        done += 1
+        if progress is not None:
+            progress(done, len(specs), results[index])
+
+    for index, _ in enumerate(results):
+        if results[index].error is not None:
+            finish(index, error=results[index].error)
+
+    if workers == 1:
+        for index, report in jobs:
+            try:
+                finish(index, _render_job(report, specs[index].report_format, specs[index].output))
+            except Exception as e:
+                finish(index, error=f"Rendering failed: {e}")
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_render_job, report, specs[index].report_format, specs[index].output): index
+                   for index, report in jobs}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                finish(index, future.result())
+            except Exception as e:
+                finish(index, error=f"Rendering failed: {e}")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render many reports in parallel")
+    parser.add_argument("specs", nargs="?", help="JSON file with a list of report specs")
+    parser.add_argument("--month", help="YYYY-MM: generate specs for this month instead of reading a file")
+    parser.add_argument("--per", choices=("day", "week", "month"), default="day")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="pdf")
+    parser.add_argument("--log-file", default=DEFAULT_LOG_FILE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--generated-at", help="Fixed footer timestamp, for reproducible output")
+    args = parser.parse_args(argv)
+
+    if args.month:
+        year, month = (int(part) for part in args.month.split("-"))
+        os.makedirs(args.out_dir, exist_ok=True)
+        specs = month_specs(year, month, args.per, args.out_dir, args.format, log_file=args.log_file)
+    elif args.specs:
+        with open(args.specs, "r", encoding="utf-8") as f:
+            specs = [ReportSpec.from_dict(item) for item in json.load(f)]
+    else:
+        parser.error("give a spec file or --month")
+
+    def report(done, total, result):
+        status = f"{result.size} bytes" if result.ok else f"FAILED: {result.error}"
+        print(f"[{done}/{total}] {result.spec.output}: {status}")
+
+    started = dt.now()
+    results = run_batch(specs, args.workers, args.generated_at, report)
+    failed = sum(1 for result in results if not result.ok)
+    print(f"{len(results) - failed} of {len(results)} reports written in {(dt.now() - started).total_seconds():.1f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,189 @@
+import heapq
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta
+from modules.app_categories import APP_CATEGORIES, category_for
+from modules.app_index import canonical_app_name
+from utils.helpers import format_duration
+
+RULES_FILE = "budgets.txt"  # One rule per line, e.g. "Chrome <= 2h" or "terminals >= 4h"
+
+_RULE_PATTERN = re.compile(r'^\s*(.+?)\s*(<=|>=|≤|≥|<|>)\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*$', re.IGNORECASE)
+_UNIT_SECONDS = {'': 3600, 'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
+                 'm': 60, 'min': 60, 'mins': 60, 'minutes': 60, 's': 1, 'sec': 1, 'secs': 1}
+
+BudgetAlert = namedtuple('BudgetAlert', ['rule', 'total_seconds', 'crossed_at'])
+
+class BudgetRule:
+    """
+    Daily time budget for an app or a category.
+    kind "max" alerts when the day's total goes over the limit, "min" when a goal is reached.
+    """
+
+    def __init__(self, target, limit_seconds, kind="max"):
+        self.target = target.strip()
+        self.limit_seconds = float(limit_seconds)
+        self.kind = kind
+        self.is_category = self.target.lower() in APP_CATEGORIES
+        self._key = self.target.lower() if self.is_category else canonical_app_name(self.target)
+
+    def matches(self, app_name):
+        if self.is_category:
+            return category_for(app_name) == self._key
+        return canonical_app_name(app_name) == self._key
+
+    def describe(self):
+        operator = "≤" if self.kind == "max" else "≥"
+        return f"{self.target} {operator} {format_duration(self.limit_seconds)}"
+
+    def message(self, total_seconds):
+        if self.kind == "max":
+            return f"{self.target} is over its daily budget: {format_duration(total_seconds)} ({self.describe()})"
+        return f"{self.target} reached its daily goal: {format_duration(total_seconds)} ({self.describe()})"
+
+def parse_rule(text):
+    """
+    Parse "Chrome <= 2h", "terminals >= 4h" or "Figma < 90 min" into a BudgetRule.
+    A bare number is hours. Raises ValueError for anything else.
+    """
+    match = _RULE_PATTERN.match(text)
+    if not match or match.group(4).lower() not in _UNIT_SECONDS:
+        raise ValueError(f"Invalid budget rule: {text.strip()!r}")
+    target, operator, amount, unit = match.groups()
+    kind = "max" if operator in ("<=", "≤", "<") else "min"
+    return BudgetRule(target, float(amount) * _UNIT_SECONDS[unit.lower()], kind)
+
+def parse_rules(text):
+    """Parse one rule per line, skipping blank lines and # comments."""
+    rules = []
+    for line in text.splitlines():
+        line = line.split('#', 1)[0]
+        if line.strip():
+            rules.append(parse_rule(line))
+    return rules
+
+def load_rules(path=RULES_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return parse_rules(f.read())
+    except FileNotFoundError:
+        return []
+    except ValueError as e:
+        print(f"Error loading budget rules: {e}")
+        return []
+
+class BudgetMonitor:
+    """
+    Evaluates daily budget rules against live activity without re-aggregating.
+
+    Each rule keeps the seconds already committed today plus the count and summed
+    start times of its running apps, so its total at time t is
+    committed + count * t - sum(starts). From that, the moment each rule crosses
+    its limit is computed once and kept in a heap; start/stop events only touch
+    the rules of that app, and check() just compares the heap head with the clock.
+    """
+
+    def __init__(self, rules, baseline=None, active_apps=None, now=None):
+        """
+        Args:
+            rules (list): BudgetRule objects
+            baseline (dict): Seconds per app already recorded today
+            active_apps (dict): app: start timestamp for apps running right now
+            now (float): Current timestamp, defaults to the clock
+        """
+        self.rules = list(rules)
+        self._rules_for = {}  # app: [rule indices], memoized; empty for apps without rules
+        self._reset_day(now if now is not None else datetime.now().timestamp(), baseline or {}, active_apps or {})
+
+    def _rule_indices(self, app_name):
+        indices = self._rules_for.get(app_name)
+        if indices is None:
+            indices = [i for i, rule in enumerate(self.rules) if rule.matches(app_name)]
+            self._rules_for[app_name] = indices
+        return indices
+
+    def _reset_day(self, now, baseline, active_apps):
+        day_start = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        self._day_start = day_start.timestamp()
+        self._next_day_start = (day_start + timedelta(days=1)).timestamp()
+        count = len(self.rules)
+        self._committed = [0.0] * count
+        self._active_count = [0] * count
+        self._active_start_sum = [0.0] * count
+        self._fired = [False] * count
+        self._versions = [0] * count
+        self._heap = []  # (crossing time, version, rule index)
+        self._active = {}  # app: start timestamp, only for apps that have rules
+        for app, seconds in baseline.items():
+            for i in self._rule_indices(app):
+                self._committed[i] += seconds
+        for app, start in active_apps.items():
+            self._start(app, start)
+        for i in range(count):
+            self._schedule(i, now)
+
+    def total(self, index, now):
+        """Seconds counted towards rule `index` at time `now`."""
+        return self._committed[index] + self._active_count[index] * now - self._active_start_sum[index]
+
+    def _schedule(self, index, now):
+        self._versions[index] += 1
+        if self._fired[index]:
+            return
+        count = self._active_count[index]
+        remaining = self.rules[index].limit_seconds - self.total(index, now)
+        if remaining <= 0:
+            crossing = now
+        elif count:
+            crossing = now + remaining / count
+        else:
+            return  # Nothing running for this rule, so it cannot cross
+        heapq.heappush(self._heap, (crossing, self._versions[index], index))
+
+    def _start(self, app_name, start):
+        indices = self._rule_indices(app_name)
+        if not indices or app_name in self._active:
+            return []
+        start = max(start, self._day_start)
+        self._active[app_name] = start
+        for i in indices:
+            self._active_count[i] += 1
+            self._active_start_sum[i] += start
+        return indices
+
+    def app_started(self, app_name, start, now=None):
+        """Record an app becoming active; a no-op for apps without rules."""
+        for i in self._start(app_name, start):
+            self._schedule(i, now if now is not None else start)
+
+    def app_stopped(self, app_name, end):
+        """Record an app closing; its time so far is committed to its rules."""
+        start = self._active.pop(app_name, None)
+        if start is None:
+            return
+        for i in self._rules_for[app_name]:
+            self._committed[i] += max(0.0, end - start)
+            self._active_count[i] -= 1
+            self._active_start_sum[i] -= start
+            self._schedule(i, end)
+
+    def check(self, now):
+        """Return the alerts due at `now`; each rule fires at most once per day."""
+        if now >= self._next_day_start:
+            self._reset_day(now, {}, {app: self._next_day_start for app in self._active})
+        alerts = []
+        while self._heap and self._heap[0][0] <= now:
+            crossing, version, index = heapq.heappop(self._heap)
+            if version != self._versions[index] or self._fired[index]:
+                continue  # Stale entry, superseded by a later start/stop
+            self._fired[index] = True
+            alerts.append(BudgetAlert(self.rules[index], self.total(index, now), crossing))
+        return alerts
+
+    def next_wakeup(self):
+        """Earliest time check() can have something to do: the next crossing or midnight."""
+        while self._heap and self._heap[0][1] != self._versions[self._heap[0][2]]:
+            heapq.heappop(self._heap)
+        if self._heap:
+            return min(self._heap[0][0], self._next_day_start)
+        return self._next_day_start
\ No newline at end of file
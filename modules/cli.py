@@ -0,0 +1,227 @@
+"""
+Command-line reports without the GUI; nothing on this path imports Qt or psutil.
+
+    python -m modules.cli summary [DAY]
+    python -m modules.cli range START END [--by app|category|day]
+    python -m modules.cli export FORMAT FILE [--start DAY] [--end DAY]
+    python -m modules.cli email RECIPIENT [--start DAY] [--end DAY] --server HOST --user ADDRESS
+    python -m modules.cli status | start | stop        (talk to the tracker daemon)
+
+DAY is YYYY-MM-DD, "today", "yesterday" or -N for N days ago. summary, range and
+export take --apps, --categories, --hours 09:00-17:00 and --weekdays Mon,Tue to
+filter, and summary and range print JSON with --json. Debug output goes to stderr,
+so stdout holds only the result and can be piped.
+"""
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from datetime import date, datetime as dt
+from modules.log_manager import LogManager
+from modules.app_categories import category_for
+from modules.focus_analytics import format_focus_summary
+from modules.usage_filter import UsageFilter
+from modules.tracker_client import TrackerClient
+from utils import helpers
+from utils.helpers import format_duration
+
+DEFAULT_LOG_FILE = "usage_data.txt"
+EXPORT_FORMATS = ("pdf", "txt", "html", "daily_pdf", "raw_data", "daily_data", "total_data")
+DAEMON_COMMANDS = ("status", "start", "stop")  # Answered by the tracker daemon, not the usage file
+
+def parse_day(value):
+    """argparse type for YYYY-MM-DD, "today", "yesterday" or -N (days ago)."""
+    try:
+        return helpers.parse_day(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def usage_rows(usage):
+    """[(app, category, seconds, share)] sorted by time, share as a fraction of the total."""
+    total = sum(usage.values()) or 1
+    return [(app, category_for(app), seconds, seconds / total)
+            for app, seconds in sorted(usage.items(), key=lambda x: x[1], reverse=True)]
+
+def format_table(rows, total, heading):
+    lines = [heading]
+    width = max([len(row[0]) for row in rows] + [3])
+    for label, category, seconds, share in rows:
+        lines.append(f"  {label:<{width}}  {format_duration(seconds):>15}  {share * 100:5.1f}%  {category}".rstrip())
+    lines.append(f"  {'Total':<{width}}  {format_duration(total):>15}")
+    return lines
+
+def cmd_summary(logger, args):
+    day = args.day
+    usage = logger.aggregate_usage(day, day, args.usage_filter)
+    focus = format_focus_summary(logger.focus_metrics(day, day, args.usage_filter))
+    if args.json:
+        return {'day': day.isoformat(), 'total_seconds': round(sum(usage.values()), 1),
+                'apps': {app: round(seconds, 1) for app, seconds in usage.items()}, 'focus': focus}
+    if not usage:
+        return [f"No usage recorded on {day}"]
+    return format_table(usage_rows(usage), sum(usage.values()), f"Usage on {day}:") + [""] + focus
+
+def cmd_range(logger, args):
+    if args.end < args.start:
+        raise ValueError("END is before START")
+    if args.by == "day":
+        totals = logger.store.day_totals(args.start, args.end)
+        if args.usage_filter is not None:
+            totals = {day: sum(logger.aggregate_usage(day, day, args.usage_filter).values()) for day in totals}
+            totals = {day: seconds for day, seconds in totals.items() if seconds}
+        rows = [(day, date.fromisoformat(day).strftime("%a"), seconds, seconds / (sum(totals.values()) or 1))
+                for day, seconds in sorted(totals.items())]
+    else:
+        usage = logger.aggregate_usage(args.start, args.end, args.usage_filter)
+        if args.by == "category":
+            totals = {}
+            for app, seconds in usage.items():
+                category = category_for(app)
+                totals[category] = totals.get(category, 0) + seconds
+            rows = [(category, "", seconds, share) for category, _, seconds, share in usage_rows(totals)]
+        else:
+            totals = usage
+            rows = usage_rows(usage)
+    if args.json:
+        return {'start': args.start.isoformat(), 'end': args.end.isoformat(), 'by': args.by,
+                'total_seconds': round(sum(totals.values()), 1),
+                'rows': {label: round(seconds, 1) for label, _, seconds, _ in rows}}
+    if not rows:
+        return [f"No usage recorded from {args.start} to {args.end}"]
+    return format_table(rows, sum(totals.values()), f"Usage by {args.by} from {args.start} to {args.end}:")
+
+def cmd_export(logger, args):
+    from modules.exporter import ReportExporter  # reportlab loads only for exports
+    start, end = args.start, args.end
+    if args.format in ("raw_data", "daily_data", "total_data"):
+        start = args.start if args.start_given else None  # Data exports default to all history
+        end = args.end if args.end_given else None
+    ReportExporter(logger).export(args.format, args.file, start, end, args.usage_filter,
+                                  progress=lambda fraction, message: print(f"Debug: {message}"))
+    return [f"Wrote {args.file} ({os.path.getsize(args.file)} bytes)"]
+
+def cmd_email(logger, args):
+    from modules.email_handler import EmailHandler
+    from modules.email_outbox import EmailAccount, EmailOutbox
+    from modules.exporter import ReportExporter
+    password = os.environ.get(args.password_env) if args.password_env else None
+    if args.password_env and password is None:
+        raise ValueError(f"Environment variable {args.password_env} is not set")
+    handler = EmailHandler(args.server, args.port, args.user, password)
+    report = ReportExporter(logger).report_data(args.start, args.end, args.usage_filter)
+    outbox = EmailOutbox(args.outbox, timeout=args.timeout)
+    account = EmailAccount(args.server, args.port, args.user, args.security)
+    outbox.set_credentials(account, password)
+    message_id = outbox.enqueue(account, handler.build_report_message(args.recipient, report))
+    outbox.start()
+    outbox.flush(args.timeout * 2)
+    outbox.stop()
+    waiting = [meta for meta in outbox.pending() + outbox.failed() if meta['id'] == message_id]
+    if waiting:
+        raise RuntimeError(f"Email not sent, left in {args.outbox} as {waiting[0]['status']}: {waiting[0]['last_error']}")
+    return [f"Sent report for {args.start} to {args.end} to {args.recipient}"]
+
+def cmd_status(logger, args):
+    stats = TrackerClient(args.socket).stats()
+    if args.json:
+        return stats
+    now = dt.now().timestamp()
+    lines = [f"Tracker daemon {stats['pid']}: {'tracking' if stats['tracking'] else 'paused'}"]
+    for app, started in sorted(stats['active_apps'].items(), key=lambda x: x[1]):
+        lines.append(f"  running  {app} for {format_duration(now - started)}")
+    today = stats['today']
+    if today:
+        lines.append("")
+        lines.extend(format_table(usage_rows(today), sum(today.values()), "Today so far:"))
+    return lines
+
+def cmd_tracking(logger, args):
+    client = TrackerClient(args.socket)
+    stats = client.start_tracking() if args.command == "start" else client.stop_tracking()
+    return stats if args.json else [f"Tracking {'started' if stats['tracking'] else 'stopped'}"]
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m modules.cli", description="Time tracking reports without the GUI")
+    parser.add_argument("--log-file", default=DEFAULT_LOG_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--apps", nargs="+", help="Only these apps")
+    filters.add_argument("--categories", nargs="+", help="Only these categories")
+    filters.add_argument("--hours", help="Time-of-day window, e.g. 09:00-17:00")
+    filters.add_argument("--weekdays", help="Comma-separated weekdays, e.g. Mon,Tue,Wed")
+
+    summary = commands.add_parser("summary", parents=[filters], help="Per-app usage for one day")
+    summary.add_argument("day", nargs="?", type=parse_day, default=date.today())
+    summary.add_argument("--json", action="store_true")
+    summary.set_defaults(handler=cmd_summary)
+
+    usage_range = commands.add_parser("range", parents=[filters], help="Usage totals over a date range")
+    usage_range.add_argument("start", type=parse_day)
+    usage_range.add_argument("end", type=parse_day)
+    usage_range.add_argument("--by", choices=("app", "category", "day"), default="app")
+    usage_range.add_argument("--json", action="store_true")
+    usage_range.set_defaults(handler=cmd_range)
+
+    export = commands.add_parser("export", parents=[filters], help="Write a report or data export")
+    export.add_argument("format", choices=EXPORT_FORMATS)
+    export.add_argument("file")
+    export.add_argument("--start", type=parse_day)
+    export.add_argument("--end", type=parse_day)
+    export.set_defaults(handler=cmd_export, json=False)
+
+    email = commands.add_parser("email", help="Email a PDF report")
+    email.add_argument("recipient")
+    email.add_argument("--start", type=parse_day)
+    email.add_argument("--end", type=parse_day)
+    email.add_argument("--server", required=True)
+    email.add_argument("--port", type=int, default=587)
+    email.add_argument("--user", required=True, help="Sender address and SMTP login")
+    email.add_argument("--security", choices=("starttls", "ssl", "none"), default="starttls")
+    email.add_argument("--password-env", default="TIMETRACKER_SMTP_PASSWORD",
+                       help="Environment variable holding the SMTP password (empty for no login)")
+    email.add_argument("--timeout", type=float, default=30)
+    email.add_argument("--outbox", default="outbox", help="Outbox directory; unsent mail stays there")
+    email.set_defaults(handler=cmd_email, json=False, apps=None, categories=None, hours=None, weekdays=None)
+
+    for name, handler, help_text in (("status", cmd_status, "Live stats from the tracker daemon"),
+                                     ("start", cmd_tracking, "Tell the tracker daemon to start tracking"),
+                                     ("stop", cmd_tracking, "Tell the tracker daemon to stop tracking")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--socket", help="Tracker daemon socket (default: per-user runtime dir)")
+        command.add_argument("--json", action="store_true")
+        command.set_defaults(handler=handler, apps=None, categories=None, hours=None, weekdays=None)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command not in DAEMON_COMMANDS and not os.path.exists(args.log_file):
+        parser.error(f"usage file not found: {args.log_file}")
+    if args.command in ("export", "email"):
+        # One day (today) unless a range is given; a lone --start or --end is a single day
+        args.start_given, args.end_given = args.start is not None, args.end is not None
+        args.start = args.start or args.end or date.today()
+        args.end = args.end or args.start
+    try:
+        args.usage_filter = UsageFilter.from_options(args.apps, args.categories, args.hours, args.weekdays)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # The library's debug output goes to stderr so stdout is only the result
+    try:
+        with redirect_stdout(sys.stderr):
+            logger = LogManager(args.log_file) if args.command not in DAEMON_COMMANDS else None
+            result = args.handler(logger, args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print("\n".join(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,125 @@
+import csv
+import gzip
+import io
+import json
+from modules.app_categories import category_for
+from modules.usage_records import record_interval
+
+DATA_FORMATS = ("csv", "jsonl")
+CHUNK_ROWS = 10000  # Rows serialized per write call
+WRITE_BUFFER = 1 << 20
+
+RAW_FIELDS = ("start", "end", "day", "app", "category", "seconds", "kind")
+DAILY_FIELDS = ("day", "app", "category", "seconds")
+TOTAL_FIELDS = ("app", "category", "seconds")
+
+def raw_rows(store, start_date=None, end_date=None, usage_filter=None):
+    """Yield one tuple per stored interval (RAW_FIELDS), straight from a single storage scan."""
+    for record in store.scan(start_date, end_date, usage_filter):
+        start, end = record_interval(record)
+        yield (start.isoformat(), end.isoformat(), record.day, record.app,
+               category_for(record.app), round(record.duration, 1), record.kind)
+
+def daily_rows(store, start_date=None, end_date=None, usage_filter=None):
+    """
+    Yield per-day, per-app totals (DAILY_FIELDS) by the day rows are stamped with;
+    only one day's totals are held at a time.
+    """
+    for day in store.stamped_days(start_date, end_date):
+        totals = {}
+        for record in store.scan(day, day, usage_filter):
+            totals[record.app] = totals.get(record.app, 0) + record.duration
+        for app, seconds in sorted(totals.items(), key=lambda x: x[1], reverse=True):
+            yield (day, app, category_for(app), round(seconds, 1))
+
+def total_rows(store, start_date=None, end_date=None, usage_filter=None):
+    """Yield per-app totals over the whole range (TOTAL_FIELDS)."""
+    totals = store.app_totals(start_date, end_date, usage_filter)
+    for app, seconds in sorted(totals.items(), key=lambda x: x[1], reverse=True):
+        yield (app, category_for(app), round(seconds, 1))
+
+DATA_VIEWS = {
+    'raw': (raw_rows, RAW_FIELDS),
+    'daily': (daily_rows, DAILY_FIELDS),
+    'total': (total_rows, TOTAL_FIELDS),
+}
+
+def _open_output(filename, compress):
+    if compress:
+        return gzip.open(filename, "wt", encoding="utf-8", newline="", compresslevel=6)
+    return open(filename, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER)
+
+def _csv_chunks(rows, fields, chunk_rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % chunk_rows == 0:
+            yield buffer.getvalue(), count
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue(), count
+
+def _jsonl_chunks(rows, fields, chunk_rows):
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    lines = []
+    count = 0
+    for row in rows:
+        lines.append(dumps(dict(zip(fields, row))))
+        count += 1
+        if len(lines) >= chunk_rows:
+            lines.append("")
+            yield "\n".join(lines), count
+            lines = []
+    if lines:
+        lines.append("")
+    yield "\n".join(lines), count
+
+def write_rows(filename, rows, fields, data_format="csv", compress=None, chunk_rows=CHUNK_ROWS, progress=None):
+    """
+    Serialize rows to CSV or JSON Lines in chunks of chunk_rows and return the row count.
+    Args:
+        filename (str): Output path; compressed with gzip when compress is True, or when
+            compress is None and the name ends in ".gz"
+        rows (iterable): Tuples in the order of fields
+        fields (tuple): Column names
+        data_format (str): "csv" or "jsonl"
+        progress (callable): Optional progress(rows written, message) after each chunk; may raise to abort
+    """
+    if data_format not in DATA_FORMATS:
+        raise ValueError(f"Unsupported data format: {data_format}")
+    if compress is None:
+        compress = filename.endswith(".gz")
+    chunks = _csv_chunks if data_format == "csv" else _jsonl_chunks
+    count = 0
+    with _open_output(filename, compress) as f:
+        for text, count in chunks(rows, fields, chunk_rows):
+            f.write(text)
+            if progress is not None:
+                progress(count, f"{count} rows written")
+    return count
+
+def data_format_for(filename):
+    """Guess "csv" or "jsonl" from a file name, ignoring a trailing ".gz"."""
+    name = filename.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return "jsonl" if name.endswith((".jsonl", ".json", ".ndjson")) else "csv"
+
+def export_data(store, filename, view="raw", start_date=None, end_date=None, usage_filter=None,
+                data_format=None, compress=None, progress=None):
+    """
+    Stream a data export from storage to a file and return the number of rows.
+    Args:
+        store (UsageStore): Source storage
+        view (str): "raw" intervals, "daily" per-day app totals or "total" per-app totals
+        start_date, end_date: Optional inclusive day range (None for all history)
+        usage_filter (UsageFilter): Same filter options as the reports
+        data_format (str): "csv" or "jsonl", guessed from the file name when None
+    """
+    row_source, fields = DATA_VIEWS[view]
+    rows = row_source(store, start_date, end_date, usage_filter)
+    return write_rows(filename, rows, fields, data_format or data_format_for(filename), compress, progress=progress)
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""
+Scheduled digest emails (daily, weekly, monthly) that run without the window open.
+
+    python -m modules.digest_scheduler [--config digests.json] [--once] [--force NAME]
+
+The config file is JSON:
+
+    {
+        "log_file": "usage_data.txt",
+        "smtp": {"server": "smtp.gmail.com", "port": 587, "username": "me@example.com",
+                 "security": "starttls", "password_env": "TIMETRACKER_SMTP_PASSWORD"},
+        "digests": [
+            {"name": "daily", "period": "daily", "at": "07:00", "recipients": ["me@example.com"]},
+            {"name": "team", "period": "weekly", "at": "08:30", "format": "html",
+             "recipients": ["lead@example.com", "me@example.com"]}
+        ]
+    }
+
+Each digest covers the last complete day, ISO week (Monday to Sunday) or month and
+is sent once that period is over and the "at" time has passed. After downtime only
+the latest missed period is sent. The password is read from the environment variable
+named by "password_env" (leave it out for a local relay without login).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime as dt, time as dt_time, timedelta
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from modules.email_outbox import EmailAccount, EmailOutbox
+from modules.report_renderer import ReportData, format_hms, report_renderer
+from modules.usage_store import get_store
+
+CONFIG_FILE = "digests.json"
+STATE_FILE = "digest_state.json"  # Digest name: end day of the last period queued
+PERIODS = ("daily", "weekly", "monthly")
+PERIOD_LABELS = {'daily': "day", 'weekly': "week", 'monthly': "month"}
+ATTACHMENT_TYPES = {'pdf': ("application", "pdf"), 'html': ("text", "html"), 'txt': ("text", "plain")}
+
+def period_range(period, reference_day):
+    """Return (start, end) of the last complete period that ends before reference_day."""
+    if period == "daily":
+        day = reference_day - timedelta(days=1)
+        return day, day
+    if period == "weekly":
+        end = reference_day - timedelta(days=reference_day.weekday() + 1)  # Last Sunday
+        return end - timedelta(days=6), end
+    if period == "monthly":
+        end = reference_day.replace(day=1) - timedelta(days=1)
+        return end.replace(day=1), end
+    raise ValueError(f"Unknown digest period: {period}")
+
+def previous_range(start_date, end_date):
+    """The equally long range just before [start_date, end_date]."""
+    length = end_date - start_date + timedelta(days=1)
+    return start_date - length, start_date - timedelta(days=1)
+
+def digest_report(store, start_date, end_date, generated_at=None):
+    """
+    Build a digest ReportData from the usage cube months covering the period and the one
+    before it: the cost depends on those months and their apps, not on how much history
+    the usage file holds.
+    """
+    previous_start, previous_end = previous_range(start_date, end_date)
+    cube = store.period_cube(previous_start, end_date)
+    usage = {app: sum(hours) for app, hours in cube.heatmap(start_date, end_date, "app").items()}
+    heatmap = cube.heatmap(start_date, end_date, "category")
+    total = sum(usage.values())
+    previous_total = sum(cube.day_totals(previous_start, previous_end).values())
+    period = "day" if start_date == end_date else f"{(end_date - start_date).days + 1} days"
+    lines = [f"Total tracked: {format_hms(total)}"]
+    if previous_total:
+        change = (total - previous_total) / previous_total * 100
+        lines.append(f"Previous {period}: {format_hms(previous_total)} ({change:+.0f}%)")
+    if heatmap:
+        category, hours = max(heatmap.items(), key=lambda x: sum(x[1]))
+        busiest_hour = max(range(len(hours)), key=lambda hour: hours[hour])
+        lines.append(f"Top category: {category}, busiest hour {busiest_hour:02d}:00")
+    return ReportData(start_date, end_date, usage, heatmap, lines, None, generated_at)
+
+class DigestJob:
+    def __init__(self, name, period, recipients, at="07:00", report_format="pdf"):
+        if period not in PERIODS:
+            raise ValueError(f"Unknown digest period: {period}")
+        if report_format not in ATTACHMENT_TYPES:
+            raise ValueError(f"Unsupported digest format: {report_format}")
+        self.name = name
+        self.period = period
+        self.recipients = list(recipients)
+        self.at = dt_time.fromisoformat(at)
+        self.report_format = report_format
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['period'], data['recipients'], data.get('at', "07:00"),
+                   data.get('format', "pdf"))
+
+    def latest_period(self, now):
+        """The newest period whose digest may be sent at `now`."""
+        reference_day = now.date() if now.time() >= self.at else now.date() - timedelta(days=1)
+        return period_range(self.period, reference_day)
+
+    def next_run(self, now, last_end):
+        """The datetime this job next becomes due, given the end day of the last period queued."""
+        for offset in range(33):  # A new period completes at least once a month
+            candidate = now if offset == 0 else dt.combine(now.date() + timedelta(days=offset), self.at)
+            if last_end is None or self.latest_period(candidate)[1].isoformat() > last_end:
+                return candidate
+        return None
+
+    def __repr__(self):
+        return f"DigestJob({self.name!r}, {self.period}, {len(self.recipients)} recipient(s))"
+
+class DigestScheduler:
+    """
+    Queues digest emails in an EmailOutbox when they come due.
+    Each digest is aggregated from the usage cube and rendered once, then one message
+    per recipient shares the rendered attachment; the outbox sends the batch over a
+    single SMTP session and retries failures in the background.
+    """
+
+    def __init__(self, jobs, account, outbox, store, sender=None, state_file=STATE_FILE):
+        self.jobs = jobs
+        self.account = account
+        self.outbox = outbox
+        self.store = store
+        self.sender = sender or account.username
+        self.state_file = state_file
+        self.state = self._load_state()
+
+    @classmethod
+    def from_config(cls, config, outbox=None, state_file=STATE_FILE):
+        smtp = config['smtp']
+        account = EmailAccount(smtp['server'], smtp.get('port', 587), smtp['username'], smtp.get('security', "starttls"))
+        outbox = outbox or EmailOutbox(timeout=smtp.get('timeout', 30))
+        password_env = smtp.get('password_env')
+        outbox.set_credentials(account, os.environ.get(password_env) if password_env else None)
+        jobs = [DigestJob.from_dict(item) for item in config.get('digests', [])]
+        store = get_store(config.get('log_file', "usage_data.txt"))
+        return cls(jobs, account, outbox, store, smtp.get('sender'), state_file)
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Debug: Ignoring unreadable digest state {self.state_file}: {e}")
+            return {}
+
+    def _save_state(self):
+        temp_path = self.state_file + ".part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temp_path, self.state_file)
+
+    def due_jobs(self, now):
+        """Return [(job, start, end)] for every job whose latest period has not been queued yet."""
+        due = []
+        for job in self.jobs:
+            start, end = job.latest_period(now)
+            last_end = self.state.get(job.name)
+            if last_end is None or end.isoformat() > last_end:
+                due.append((job, start, end))
+        return due
+
+    def next_wakeup(self, now):
+        """The earliest time any job becomes due, or None without jobs."""
+        times = [job.next_run(now, self.state.get(job.name)) for job in self.jobs]
+        times = [when for when in times if when is not None]
+        return min(times) if times else None
+
+    def run_due(self, now=None, force=None):
+        """
+        Queue every due digest (or just the job named by force, even if already sent).
+        Returns [(job, message ids)].
+        """
+        now = now or dt.now()
+        if force is not None:
+            jobs = [(job,) + job.latest_period(now) for job in self.jobs if job.name == force]
+        else:
+            jobs = self.due_jobs(now)
+        sent = []
+        rendered = {}  # (start, end, format): bytes, so digests sharing a period render once
+        for job, start, end in jobs:
+            key = (start, end, job.report_format)
+            if key not in rendered:
+                report = digest_report(self.store, start, end, now.strftime('%Y-%m-%d %H:%M:%S'))
+                rendered[key] = (report, report_renderer().render(report, job.report_format))
+            report, data = rendered[key]
+            message_ids = [self.outbox.enqueue(self.account, self.build_message(job, recipient, report, data))
+                           for recipient in job.recipients]
+            # Queued messages are on disk, so the period counts as done even if delivery is retried
+            self.state[job.name] = end.isoformat()
+            self._save_state()
+            print(f"Debug: Queued {job.name} digest for {start} to {end} to {len(message_ids)} recipient(s)")
+            sent.append((job, message_ids))
+        if jobs:
+            self.store.save_checkpoint()  # Next start replays only rows appended after this
+        return sent
+
+    def build_message(self, job, recipient, report, data):
+        msg = MIMEMultipart()
+        msg['From'] = self.sender
+        msg['To'] = recipient
+        label = report.start_date if report.start_date == report.end_date else f"{report.start_date} to {report.end_date}"
+        msg['Subject'] = f"Productivity Tracker Pro - {job.period.capitalize()} Digest ({label})"
+
+        body = f"Your {PERIOD_LABELS[job.period]} in review ({label}):\n\n"
+        body += "\n".join(report.focus_lines) + "\n\n"
+        for app, seconds in report.sorted_usage()[:10]:
+            body += f"{app}: {format_hms(seconds)}\n"
+        body += "\nThe full report is attached.\n\nBest regards,\nProductivity Tracker Pro"
+        msg.attach(MIMEText(body, 'plain'))
+
+        maintype, subtype = ATTACHMENT_TYPES[job.report_format]
+        if maintype == "text":
+            attachment = MIMEText(data.decode("utf-8"), subtype, "utf-8")
+        else:
+            attachment = MIMEApplication(data, _subtype=subtype)
+        attachment.add_header('Content-Disposition', 'attachment',
+                              filename=f"Digest_{report.start_date}_{report.end_date}.{job.report_format}")
+        msg.attach(attachment)
+        return msg
+
+    def run_forever(self, poll=300):
+        """Queue digests as they come due; wakes at least every `poll` seconds to notice clock changes."""
+        self.outbox.start()
+        try:
+            while True:
+                self.run_due()
+                now = dt.now()
+                wakeup = self.next_wakeup(now)
+                wait = poll if wakeup is None else min(poll, max((wakeup - now).total_seconds(), 1))
+                time.sleep(wait)
+        finally:
+            self.outbox.stop()
+
+def load_config(path=CONFIG_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send scheduled usage digests by email")
+    parser.add_argument("--config", default=CONFIG_FILE)
+    parser.add_argument("--state-file", default=STATE_FILE)
+    parser.add_argument("--once", action="store_true", help="Queue due digests, wait for delivery and exit (for cron)")
+    parser.add_argument("--force", metavar="NAME", help="Send this digest for its latest period now, even if already sent")
+    args = parser.parse_args(argv)
+
+    scheduler = DigestScheduler.from_config(load_config(args.config), state_file=args.state_file)
+    if args.once or args.force:
+        scheduler.outbox.start()
+        sent = scheduler.run_due(force=args.force)
+        # Messages still waiting on a retry stay in the outbox for the next run
+        delivered = scheduler.outbox.flush() and not scheduler.outbox.pending()
+        scheduler.outbox.stop()
+        print(f"{len(sent)} digest(s) queued; {len(scheduler.outbox.pending())} message(s) still in the outbox")
+        return 0 if delivered else 1
+    scheduler.run_forever()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -2,12 +2,10 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-import os
-import tempfile
+from modules.report_renderer import format_hms, report_renderer
+from modules.email_outbox import EmailAccount
+
+SMTP_TIMEOUT = 30  # Seconds for connect and each SMTP command
 
 class EmailHandler:
     def __init__(self, smtp_server, smtp_port, sender_email, password):
@@ -15,78 +13,63 @@ class EmailHandler:
         self.smtp_port = smtp_port
         self.sender_email = sender_email
         self.password = password
+        self.renderer = report_renderer()
 
-    def generate_pdf_report(self, usage_data):
-        # Create a temporary PDF file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        doc = SimpleDocTemplate(temp_file.name, pagesize=letter)
-        styles = getSampleStyleSheet()
-        elements = []
-
-        # Add title
-        title = Paragraph("Time Tracking Report", styles['Title'])
-        elements.append(title)
-        elements.append(Spacer(1, 12))
-
-        # Create table data
-        data = [["Application", "Time Spent"]]
-        for app, seconds in usage_data.items():
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            secs = seconds % 60
-            data.append([app, f"{hours:02d}:{minutes:02d}:{secs:02d}"])
+    def generate_pdf_report(self, report):
+        """Return the PDF bytes for a ReportData; reuses the render of a just-exported report."""
+        return self.renderer.render(report, "pdf")
 
-        # Style the table
-        table = Table(data)
-        table.setStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ])
-        elements.append(table)
+    def account(self):
+        """The EmailAccount (server and login) this handler sends through."""
+        return EmailAccount(self.smtp_server, self.smtp_port, self.sender_email)
 
-        # Build PDF
-        doc.build(elements)
-        return temp_file.name
-
-    def send_report(self, recipient, usage_data):
-        # Create email message
+    def build_report_message(self, recipient, report):
+        """
+        Build the report email with its PDF attached, without sending it.
+        Args:
+            recipient (str): Destination address
+            report (ReportData): The aggregate to send, as built by ReportExporter.report_data
+        """
         msg = MIMEMultipart()
         msg['From'] = self.sender_email
         msg['To'] = recipient
         msg['Subject'] = "Productivity Tracker Pro - Activity Report"
 
         # Create text body
-        body = "Dear User,\n\nHere is your time tracking report:\n\n"
-        for app, seconds in usage_data.items():
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            secs = seconds % 60
-            body += f"{app}: {hours:02d}:{minutes:02d}:{secs:02d}\n"
+        body = f"Dear User,\n\nHere is your time tracking report ({report.start_date} to {report.end_date}):\n\n"
+        for app, seconds in report.sorted_usage():
+            body += f"{app}: {format_hms(seconds)}\n"
         body += "\nA detailed PDF report is attached.\n\nBest regards,\nProductivity Tracker Pro"
         msg.attach(MIMEText(body, 'plain'))
 
-        # Generate and attach PDF
-        pdf_path = self.generate_pdf_report(usage_data)
-        try:
-            with open(pdf_path, 'rb') as f:
-                pdf = MIMEApplication(f.read(), _subtype="pdf")
-                pdf.add_header(
-                    'Content-Disposition',
-                    'attachment',
-                    filename="TimeTrackingReport.pdf"
-                )
-                msg.attach(pdf)
-        finally:
-            os.unlink(pdf_path)  # Clean up temporary file
+        # Attach the PDF straight from memory
+        pdf = MIMEApplication(self.generate_pdf_report(report), _subtype="pdf")
+        pdf.add_header(
+            'Content-Disposition',
+            'attachment',
+            filename="TimeTrackingReport.pdf"
+        )
+        msg.attach(pdf)
+        return msg
+
+    def queue_report(self, outbox, recipient, report):
+        """
+        Queue a report email in an EmailOutbox and return the message id.
+        report may be a ReportData or a callable returning one; either way the
+        aggregation and PDF render run on the outbox's sender thread.
+        """
+        outbox.set_credentials(self.account(), self.password)
+        return outbox.enqueue(self.account(), lambda: self.build_report_message(
+            recipient, report() if callable(report) else report))
 
-        # Send email
+    def send_report(self, recipient, report, timeout=SMTP_TIMEOUT):
+        """
+        Email a report with its PDF attached right away, blocking until it is sent.
+        Prefer queue_report() from the GUI, which sends in the background and retries.
+        """
+        msg = self.build_report_message(recipient, report)
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=timeout) as server:
                 server.starttls()
                 server.login(self.sender_email, self.password)
                 server.send_message(msg)
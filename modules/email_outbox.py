@@ -0,0 +1,394 @@
+import json
+import os
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+from email.utils import getaddresses
+
+OUTBOX_DIR = "outbox"
+CLAIM_SUFFIX = ".sending"  # <id>.json is renamed to this while one process sends the message
+STALE_CLAIM = 600  # Seconds after which a claim left behind by a crashed process is released
+
+class EmailAccount:
+    """
+    SMTP server and login used to send; also the key sessions are shared by.
+    security is "starttls", "ssl" or "none" (e.g. for a local test server).
+    """
+
+    def __init__(self, server, port, username, security="starttls"):
+        self.server = server
+        self.port = int(port)
+        self.username = username
+        self.security = security
+
+    def key(self):
+        return (self.server, self.port, self.username, self.security)
+
+    def to_dict(self):
+        return {'server': self.server, 'port': self.port, 'username': self.username, 'security': self.security}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['server'], data['port'], data['username'], data.get('security', "starttls"))
+
+    def __repr__(self):
+        return f"EmailAccount({self.username}@{self.server}:{self.port})"
+
+def default_smtp_factory(account, timeout):
+    """Open a connection for an account; swap this out to test against a local stand-in."""
+    if account.security == "ssl":
+        return smtplib.SMTP_SSL(account.server, account.port, timeout=timeout,
+                                context=ssl.create_default_context())
+    return smtplib.SMTP(account.server, account.port, timeout=timeout)
+
+class EmailOutbox:
+    """
+    Persistent email queue with a background sender.
+
+    Each message is stored as <id>.eml plus <id>.json metadata in the outbox
+    directory, so queued mail survives restarts. The sender thread sends due
+    messages grouped by account over one authenticated session per account,
+    kept open for idle_timeout seconds so bursts share the connection setup.
+    Transient failures are retried with exponential backoff up to max_attempts.
+    Passwords are only held in memory: messages queued by an earlier run wait
+    until set_credentials() is called for their account.
+
+    Several processes (the window, the CLI, the digest scheduler) can share one
+    outbox directory: a message is claimed by renaming <id>.json to <id>.sending
+    before it is sent, so only one process sends it, and the directory is
+    re-read whenever the sender is idle to pick up other processes' mail.
+
+    Listeners are called on the sender thread as listener(event, message_id, detail)
+    with event "queued", "sent", "retry" or "failed".
+    """
+
+    def __init__(self, directory=OUTBOX_DIR, smtp_factory=None, timeout=30, max_attempts=5,
+                 backoff=30, max_backoff=1800, idle_timeout=60):
+        self.directory = directory
+        self.smtp_factory = smtp_factory or default_smtp_factory
+        self.timeout = timeout  # Seconds for connect and each SMTP command
+        self.max_attempts = max_attempts
+        self.backoff = backoff  # Seconds before the first retry, doubled each attempt
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Condition()
+        self._messages = {}  # message id: metadata dict
+        self._builds = []  # (message id, account, build callable) waiting to be rendered on the sender thread
+        self._passwords = {}  # account key: password
+        self._sessions = {}  # account key: (smtp connection, last used)
+        self._listeners = []
+        self._thread = None
+        self._stopping = False
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        with self._lock:
+            self._messages = self._read_directory()
+        if self._messages:
+            print(f"Debug: Outbox has {len(self._messages)} message(s) from an earlier run")
+
+    def _read_directory(self):
+        """Return {id: metadata} for every unclaimed message on disk, releasing stale claims first."""
+        messages = {}
+        now = time.time()
+        for filename in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, filename)
+            if filename.endswith(CLAIM_SUFFIX):
+                try:
+                    if now - os.path.getmtime(path) > STALE_CLAIM:
+                        print(f"Debug: Releasing stale outbox claim {filename}")
+                        os.replace(path, path[:-len(CLAIM_SUFFIX)] + ".json")
+                        filename = filename[:-len(CLAIM_SUFFIX)] + ".json"
+                        path = os.path.join(self.directory, filename)
+                except OSError:
+                    continue
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if os.path.exists(self._path(meta['id'], ".eml")):
+                    messages[meta['id']] = meta
+            except FileNotFoundError:
+                continue  # Claimed or sent by another process meanwhile
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Debug: Skipping unreadable outbox entry {filename}: {e}")
+        return messages
+
+    def _path(self, message_id, suffix):
+        return os.path.join(self.directory, message_id + suffix)
+
+    def _save_meta(self, meta):
+        temp_path = self._path(meta['id'], ".json.part")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self._path(meta['id'], ".json"))
+
+    def _claim(self, meta):
+        """Take a message for this process; False if another process is sending it or already has."""
+        claim_path = self._path(meta['id'], CLAIM_SUFFIX)
+        try:
+            os.rename(self._path(meta['id'], ".json"), claim_path)
+            os.utime(claim_path)  # Claim age, for releasing claims of crashed processes
+            return True
+        except FileNotFoundError:
+            with self._lock:
+                self._messages.pop(meta['id'], None)
+            return False
+        except OSError as e:
+            print(f"Debug: Could not claim email {meta['id']}: {e}")
+            return False
+
+    def _release(self, meta):
+        """Write back a claimed message's metadata so any process can send it later."""
+        self._save_meta(meta)
+        try:
+            os.remove(self._path(meta['id'], CLAIM_SUFFIX))
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, message_id):
+        for suffix in (".eml", ".json", CLAIM_SUFFIX):
+            try:
+                os.remove(self._path(message_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, message_id, detail=""):
+        for listener in self._listeners:
+            try:
+                listener(event, message_id, detail)
+            except Exception as e:
+                print(f"Error in outbox listener: {e}")
+
+    def set_credentials(self, account, password):
+        with self._lock:
+            self._passwords[account.key()] = password
+            self._lock.notify_all()
+
+    def enqueue(self, account, message):
+        """
+        Queue a message and return its id.
+        Args:
+            account (EmailAccount): Account to send through
+            message: An email.message.Message, or a callable returning one; a callable is
+                run on the sender thread, so expensive rendering stays off the caller's thread
+        """
+        message_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        with self._lock:
+            if callable(message):
+                self._builds.append((message_id, account, message))
+            else:
+                self._store(message_id, account, message)
+            self._lock.notify_all()
+        self._notify("queued", message_id)
+        return message_id
+
+    def _store(self, message_id, account, message):
+        headers = [value for field in ("To", "Cc", "Bcc") for value in (message.get_all(field) or [])]
+        recipients = [address for _, address in getaddresses(headers) if address]
+        del message['Bcc']
+        with open(self._path(message_id, ".eml"), "wb") as f:
+            f.write(message.as_bytes())
+        meta = {
+            'id': message_id,
+            'account': account.to_dict(),
+            'sender': message['From'],
+            'recipients': recipients,
+            'subject': message['Subject'],
+            'attempts': 0,
+            'next_attempt': 0,
+            'status': "queued",
+            'last_error': None
+        }
+        self._save_meta(meta)
+        self._messages[message_id] = meta
+
+    def pending(self):
+        """Return metadata for queued (not failed) messages."""
+        with self._lock:
+            return [dict(meta) for meta in self._messages.values() if meta['status'] == "queued"] + \
+                   [{'id': message_id, 'status': "building"} for message_id, _, _ in self._builds]
+
+    def failed(self):
+        with self._lock:
+            return [dict(meta) for meta in self._messages.values() if meta['status'] == "failed"]
+
+    def retry_failed(self):
+        """Queue every failed message again with a fresh attempt budget."""
+        with self._lock:
+            for meta in self._messages.values():
+                if meta['status'] == "failed":
+                    meta.update(status="queued", attempts=0, next_attempt=0)
+                    self._save_meta(meta)
+            self._lock.notify_all()
+
+    def start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait=5):
+        """Stop the sender; queued messages stay on disk for the next run."""
+        with self._lock:
+            self._stopping = True
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join(wait)
+            self._thread = None
+
+    def flush(self, timeout=30):
+        """Block until nothing is building or due-and-sendable, or the timeout passes (mainly for tests)."""
+        deadline = time.time() + timeout
+        with self._lock:
+            while self._builds or self._due(time.time()):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._lock.wait(min(remaining, 0.1))
+        return True
+
+    def _due(self, now):
+        return [meta for meta in self._messages.values()
+                if meta['status'] == "queued" and meta['next_attempt'] <= now
+                and EmailAccount.from_dict(meta['account']).key() in self._passwords]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._stopping:
+                    break
+                builds = list(self._builds)
+            for entry in builds:
+                message_id, account, build = entry
+                try:
+                    message = build()
+                    with self._lock:
+                        self._store(message_id, account, message)
+                        self._builds.remove(entry)  # Only now, so pending() and flush() never miss it
+                except Exception as e:
+                    with self._lock:
+                        self._builds.remove(entry)
+                    print(f"Error building email {message_id}: {e}")
+                    self._notify("failed", message_id, f"Could not build the message: {e}")
+
+            with self._lock:
+                now = time.time()
+                due = self._due(now)
+                if not due and not self._builds:
+                    waits = [meta['next_attempt'] - now for meta in self._messages.values()
+                             if meta['status'] == "queued"]
+                    wait = min([self.idle_timeout] + [w for w in waits if w > 0])
+                    self._lock.notify_all()  # Wake flush() callers
+                    self._lock.wait(max(wait, 0.05))
+                    self._messages = self._read_directory()  # Mail queued or sent by other processes
+                    due = []
+            if due:
+                groups = {}
+                for meta in due:
+                    groups.setdefault(EmailAccount.from_dict(meta['account']).key(), []).append(meta)
+                for key, metas in groups.items():
+                    self._send_group(key, metas)
+            self._close_idle_sessions()
+        for key in list(self._sessions):
+            self._close_session(key)
+
+    def _session(self, key):
+        """Return an authenticated connection for an account, reusing the open one if it still answers."""
+        entry = self._sessions.get(key)
+        if entry is not None:
+            try:
+                if entry[0].noop()[0] == 250:
+                    return entry[0]
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_session(key)
+        account = EmailAccount(*key)
+        smtp = self.smtp_factory(account, self.timeout)
+        if account.security == "starttls":
+            smtp.starttls(context=ssl.create_default_context())
+        password = self._passwords.get(key)
+        if password:
+            smtp.login(account.username, password)
+        self._sessions[key] = (smtp, time.time())
+        print(f"Debug: Opened SMTP session for {account}")
+        return smtp
+
+    def _close_session(self, key):
+        entry = self._sessions.pop(key, None)
+        if entry is not None:
+            try:
+                entry[0].quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+
+    def _close_idle_sessions(self):
+        now = time.time()
+        for key, (_, last_used) in list(self._sessions.items()):
+            if now - last_used >= self.idle_timeout:
+                self._close_session(key)
+
+    def _send_group(self, key, metas):
+        metas = [meta for meta in metas if self._claim(meta)]
+        if not metas:
+            return
+        try:
+            smtp = self._session(key)
+        except smtplib.SMTPAuthenticationError as e:
+            with self._lock:
+                self._passwords.pop(key, None)  # Wrong password: wait for new credentials instead of retrying
+            for meta in metas:
+                self._fail(meta, f"Authentication failed: {e}", retry=False)
+            return
+        except OSError as e:  # Includes SMTPException: refused connections, timeouts, 4xx greetings
+            for meta in metas:
+                self._fail(meta, f"Could not connect: {e}", retry=True)
+            return
+
+        for meta in metas:
+            try:
+                with open(self._path(meta['id'], ".eml"), "rb") as f:
+                    raw = f.read()
+                refused = smtp.sendmail(meta['sender'], meta['recipients'], raw)
+                self._sessions[key] = (smtp, time.time())
+                with self._lock:
+                    self._messages.pop(meta['id'], None)
+                    self._remove(meta['id'])
+                    self._lock.notify_all()
+                self._notify("sent", meta['id'], f"Refused: {', '.join(refused)}" if refused else "")
+            except smtplib.SMTPResponseException as e:
+                # 4xx is the server asking us to come back later; 5xx will not change on retry
+                self._fail(meta, f"{e.smtp_code} {e.smtp_error!r}", retry=400 <= e.smtp_code < 500)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPNotSupportedError) as e:
+                self._fail(meta, str(e), retry=False)
+            except OSError as e:  # Dropped connection or timeout: the session is unusable
+                self._close_session(key)
+                self._fail(meta, str(e), retry=True)
+                # The rest of the group goes back to the queue without using up an attempt
+                for rest in metas[metas.index(meta) + 1:]:
+                    self._fail(rest, str(e), retry=True, count_attempt=False)
+                return
+
+    def _fail(self, meta, error, retry, count_attempt=True):
+        with self._lock:
+            if count_attempt:
+                meta['attempts'] += 1
+            meta['last_error'] = error
+            if retry and meta['attempts'] < self.max_attempts:
+                delay = min(self.backoff * 2 ** max(meta['attempts'] - 1, 0), self.max_backoff)
+                meta['next_attempt'] = time.time() + delay
+                event = "retry"
+            else:
+                meta['status'] = "failed"
+                event = "failed"
+            self._release(meta)
+            self._lock.notify_all()
+        print(f"Debug: Email {meta['id']} {event}: {error}")
+        self._notify(event, meta['id'], error)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import queue
+import threading
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its job has been cancelled."""
+
+class ExportJob:
+    def __init__(self, job_id, export_format, filename, start_date, end_date, usage_filter=None):
+        self.job_id = job_id
+        self.export_format = export_format  # "pdf", "daily_pdf", "txt", "html" or a data export (see exporter.DATA_EXPORTS)
+        self.filename = filename
+        self.start_date = start_date
+        self.end_date = end_date
+        self.usage_filter = usage_filter
+        self.cancelled = threading.Event()
+
+    def describe(self):
+        return os.path.basename(self.filename)
+
+class _ExportWorker(QThread):
+    def __init__(self, jobs):
+        super().__init__()
+        self.jobs = jobs
+
+    def run(self):
+        while True:
+            job = self.jobs._queue.get()
+            if job is None:
+                return  # Shutdown sentinel
+            self.jobs._run_job(job)
+
+class ExportJobQueue(QObject):
+    """
+    Runs report exports one after another on a worker thread, reporting progress
+    through signals. Jobs can be queued while another is running and cancelled
+    either before they start or cooperatively at the next progress checkpoint.
+    The exporter comes from exporter_factory on the first job, so its PDF
+    dependencies load on the worker thread rather than at startup.
+    """
+    job_queued = pyqtSignal(int, str)  # job_id, description
+    job_progress = pyqtSignal(int, int, str)  # job_id, percent, message
+    job_finished = pyqtSignal(int, str)  # job_id, filename
+    job_failed = pyqtSignal(int, str)  # job_id, error message
+    job_cancelled = pyqtSignal(int)  # job_id
+    active_changed = pyqtSignal(int)  # number of queued + running jobs
+
+    def __init__(self, exporter_factory, parent=None):
+        super().__init__(parent)
+        self.exporter_factory = exporter_factory
+        self.exporter = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs = {}  # job_id: ExportJob, queued or running
+        self._next_id = 0
+        self._worker = _ExportWorker(self)
+        self._worker.start()
+
+    def submit(self, export_format, filename, start_date, end_date, usage_filter=None):
+        """Queue an export and return its job id."""
+        with self._lock:
+            self._next_id += 1
+            job = ExportJob(self._next_id, export_format, filename, start_date, end_date, usage_filter)
+            self._jobs[job.job_id] = job
+            active = len(self._jobs)
+        self._queue.put(job)
+        self.job_queued.emit(job.job_id, job.describe())
+        self.active_changed.emit(active)
+        return job.job_id
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns False if it already finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancelled.set()
+        return True
+
+    def cancel_all(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancelled.set()
+
+    def active_jobs(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def _run_job(self, job):
+        def progress(fraction, message):
+            if job.cancelled.is_set():
+                raise ExportCancelled()
+            self.job_progress.emit(job.job_id, int(fraction * 100), message)
+
+        try:
+            progress(0, "Starting")
+            if self.exporter is None:
+                self.exporter = self.exporter_factory()
+            self.exporter.export(job.export_format, job.filename, job.start_date, job.end_date,
+                                 job.usage_filter, progress=progress)
+            progress(1, "Done")
+            self.job_finished.emit(job.job_id, job.filename)
+        except ExportCancelled:
+            # The exporter writes through a temporary file, so an existing report is left as it was
+            self.job_cancelled.emit(job.job_id)
+        except Exception as e:
+            print(f"Error exporting {job.filename}: {e}")
+            self.job_failed.emit(job.job_id, str(e))
+        finally:
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+                active = len(self._jobs)
+            self.active_changed.emit(active)
+
+    def shutdown(self):
+        """Cancel pending work and stop the worker thread."""
+        self.cancel_all()
+        self._queue.put(None)
+        self._worker.wait()
\ No newline at end of file
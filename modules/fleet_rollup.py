@@ -0,0 +1,328 @@
+"""
+Org-wide rollups from many workstations' usage logs.
+
+    python -m modules.fleet_rollup ingest DROP_DIR [--state fleet_state.json]
+    python -m modules.fleet_rollup watch DROP_DIR [--interval 30]
+    python -m modules.fleet_rollup report [--top 20] [--json]
+
+Machines drop their usage_data.txt into DROP_DIR, either as DROP_DIR/<machine>/<file>
+or as DROP_DIR/<machine>.txt. Each file is parsed once into a small UsageSummary kept
+in the state file; a file that grows later only has its new lines parsed, and a file
+whose content was already ingested (a replayed copy, or an older snapshot of a log)
+is recognised by its content hash and skipped. Files can be deleted from DROP_DIR
+after ingestion. Reports merge the stored summaries and never read raw logs.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from modules.app_categories import category_for
+from modules.usage_records import parse_line
+from modules.usage_summary import HOURS, UsageSummary, sketch_quantile
+from utils.helpers import format_duration
+
+STATE_FILE = "fleet_state.json"
+STATE_VERSION = 1
+HASH_HISTORY = 50  # Content hashes kept per source, so earlier ingests of a log are recognised
+MARK_BYTES = 64 * 1024  # Spacing of the prefix hashes used to recognise older snapshots
+
+def _prefix_hashes(data, offsets):
+    """Return {offset: sha256 of data[:offset]} for sorted offsets, in one pass over data."""
+    hashes = {}
+    digest = hashlib.sha256()
+    position = 0
+    for offset in offsets:
+        digest.update(data[position:offset])
+        position = offset
+        hashes[offset] = digest.hexdigest()
+    return hashes
+
+def _marks(data, complete):
+    """
+    [offset, prefix hash] pairs at line ends past 1 KB, 2 KB, 4 KB... and then every
+    MARK_BYTES, so snapshots of any size but the first few lines can be matched.
+    """
+    offsets = []
+    offset = data.find(b"\n", 1023, complete) + 1
+    while offset:
+        offsets.append(offset)
+        offset = data.find(b"\n", min(2 * offset, offset + MARK_BYTES) - 1, complete) + 1
+    return [[offset, content_hash] for offset, content_hash in _prefix_hashes(data, offsets).items()]
+
+def machine_for(relative_path):
+    """Machine name for a file in the drop directory: its folder, or the file name without extension."""
+    parts = relative_path.replace(os.sep, "/").split("/")
+    if len(parts) > 1:
+        return parts[0]
+    return os.path.splitext(parts[0])[0]
+
+class FleetRollup:
+    """
+    Incremental ingestion of a drop directory into per-source summaries.
+    State per source (a file path relative to the drop directory): its machine, the
+    stat and byte offset last ingested, the content hash of bytes [0, offset), prefix
+    hashes every MARK_BYTES, recent hashes of earlier ingests, and the UsageSummary
+    of those bytes.
+    """
+
+    def __init__(self, state_file=STATE_FILE):
+        self.state_file = state_file
+        self.sources = {}  # relative path: source state
+        self.duplicates = {}  # relative path: {'stat': [size, mtime_ns], 'duplicate_of': relative path}
+        self._summaries = {}  # relative path: UsageSummary
+        self.dirty = False  # Changed since the last save_state()
+        self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get('version') != STATE_VERSION:
+                print(f"Debug: Ignoring fleet state {self.state_file} from another version")
+                return
+            self.sources = state['sources']
+            self.duplicates = state['duplicates']
+            self._summaries = {path: UsageSummary.from_state(source['summary']) for path, source in self.sources.items()}
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Debug: Ignoring unreadable fleet state {self.state_file}: {e}")
+            self.sources, self.duplicates, self._summaries = {}, {}, {}
+
+    def save_state(self):
+        for path, source in self.sources.items():
+            source['summary'] = self._summaries[path].to_state()
+        state = {'version': STATE_VERSION, 'sources': self.sources, 'duplicates': self.duplicates}
+        temp_path = self.state_file + ".part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(temp_path, self.state_file)
+        self.dirty = False
+
+    def _known_hashes(self):
+        """content hash: source path, over every ingest of every source."""
+        known = {}
+        for path, source in self.sources.items():
+            for content_hash in source['history']:
+                known[content_hash] = path
+        return known
+
+    def ingest_directory(self, drop_dir):
+        """
+        Ingest new and grown files under drop_dir.
+        Returns:
+            dict: counts of files 'added', 'appended', 'replaced', 'duplicate' and 'unchanged'
+        """
+        counts = dict.fromkeys(("added", "appended", "replaced", "duplicate", "unchanged"), 0)
+        known_hashes = self._known_hashes()
+        for root, dirs, files in os.walk(drop_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                if name.startswith(".") or name.endswith(".part"):
+                    continue
+                path = os.path.join(root, name)
+                outcome = self.ingest_file(path, os.path.relpath(path, drop_dir), known_hashes)
+                counts[outcome] += 1
+        return counts
+
+    def _related_source(self, data, complete, known_hashes):
+        """
+        Find a source this content was already (partly) ingested from.
+        Returns:
+            tuple: ("extends", path) when the content continues that source's ingested
+            bytes, ("seen", path) when it is an earlier ingest or an older snapshot of
+            it, or (None, None) for content not seen before
+        """
+        owner = known_hashes.get(hashlib.sha256(data[:complete]).hexdigest())
+        if owner is not None:
+            return "seen", owner
+        # Hash the content once, at every offset some source can be compared at
+        wanted = {}
+        for path, source in self.sources.items():
+            if source['offset'] <= complete:
+                wanted.setdefault(source['offset'], []).append(("extends", path, source['hash']))
+            else:
+                # Logs only grow, so a shorter file matching a source up to its last mark is an older snapshot
+                marks = [mark for mark in source.get('marks', []) if mark[0] <= complete]
+                if marks:
+                    wanted.setdefault(marks[-1][0], []).append(("seen", path, marks[-1][1]))
+        for offset, content_hash in _prefix_hashes(data, sorted(wanted)).items():
+            for relation, path, expected in wanted[offset]:
+                if offset and content_hash == expected:
+                    return relation, path
+        return None, None
+
+    def ingest_file(self, path, relative_path, known_hashes=None):
+        """
+        Ingest one file; returns "added", "appended", "replaced", "duplicate" or "unchanged".
+        Content that was already ingested from any source, including an older snapshot
+        of this file, is never counted again; a file continuing another source's log
+        has only its new lines added to that source.
+        """
+        if known_hashes is None:
+            known_hashes = self._known_hashes()
+        st = os.stat(path)
+        stat = [st.st_size, st.st_mtime_ns]
+        source = self.sources.get(relative_path)
+        if (source or self.duplicates.get(relative_path, {})).get('stat') == stat:
+            return "unchanged"
+
+        self.dirty = True
+        with open(path, "rb") as f:
+            data = f.read()
+        complete = data.rfind(b"\n") + 1  # A half-written last line waits for the next ingest
+
+        if source is not None and complete >= source['offset'] \
+                and hashlib.sha256(data[:source['offset']]).hexdigest() == source['hash']:
+            outcome = "appended" if complete > source['offset'] else "unchanged"
+            self._append(relative_path, data, complete, known_hashes)
+            source['stat'] = stat
+            return outcome
+
+        relation, owner = self._related_source(data, complete, known_hashes)
+        if relation == "extends":
+            print(f"Debug: {relative_path} continues {owner}, adding its new lines there")
+            self._append(owner, data, complete, known_hashes)
+        elif relation == "seen":
+            print(f"Debug: {relative_path} repeats content already ingested from {owner}, skipping")
+        if relation is not None:
+            if source is not None:
+                source['stat'] = stat  # Keep what was ingested from this path; the file is a replay
+            else:
+                self.duplicates[relative_path] = {'stat': stat, 'duplicate_of': owner}
+            return "duplicate"
+
+        outcome = "added" if source is None else "replaced"
+        if source is not None:
+            print(f"Debug: {relative_path} was rewritten with new content, re-reading it")
+        self._summaries[relative_path] = UsageSummary()
+        history = source['history'] if source is not None else []
+        self.sources[relative_path] = {'machine': machine_for(relative_path), 'history': history, 'offset': 0}
+        self.duplicates.pop(relative_path, None)
+        self._append(relative_path, data, complete, known_hashes)
+        self.sources[relative_path]['stat'] = stat
+        return outcome
+
+    def _append(self, relative_path, data, complete, known_hashes):
+        """Add data[offset:complete] to a source whose ingested bytes data starts with."""
+        source = self.sources[relative_path]
+        self._add_lines(self._summaries[relative_path], data[source['offset']:complete])
+        content_hash = hashlib.sha256(data[:complete]).hexdigest()
+        source.update(offset=complete, hash=content_hash, marks=_marks(data, complete))
+        if content_hash not in source['history']:
+            source['history'] = (source['history'] + [content_hash])[-HASH_HISTORY:]
+        known_hashes[content_hash] = relative_path
+
+    def _add_lines(self, summary, data):
+        for raw in data.splitlines():
+            record = parse_line(raw.decode("utf-8", "replace"))
+            if record is not None:
+                summary.add_record(record)
+
+    def machine_summaries(self):
+        """Return {machine: UsageSummary} merged from each machine's sources."""
+        machines = {}
+        for path, source in self.sources.items():
+            machine = machines.get(source['machine'])
+            if machine is None:
+                machine = machines[source['machine']] = UsageSummary()
+            machine.merge(self._summaries[path])
+        return machines
+
+def org_report(machines, top=None):
+    """
+    Org-wide totals from per-machine summaries; costs O(machines x apps), plus
+    O(machines x days) for the daily series.
+    Args:
+        machines (dict): machine name -> UsageSummary
+        top (int): Keep only this many apps, by total time
+    Returns:
+        dict: JSON-able report
+    """
+    org = UsageSummary()
+    machine_rows = {}
+    app_machines = {}
+    for name, summary in sorted(machines.items()):
+        org.merge(summary)
+        first_day, last_day = summary.day_range()
+        machine_rows[name] = {'total_seconds': round(summary.total_seconds(), 1), 'apps': len(summary.apps),
+                              'first_day': first_day, 'last_day': last_day}
+        for app in summary.apps:
+            app_machines[app] = app_machines.get(app, 0) + 1
+
+    apps = {}
+    categories = {}
+    for app, (seconds, intervals, sketch) in sorted(org.apps.items(), key=lambda x: x[1][0], reverse=True):
+        category = category_for(app)
+        categories[category] = categories.get(category, 0) + seconds
+        if top is None or len(apps) < top:
+            apps[app] = {'category': category, 'seconds': round(seconds, 1), 'machines': app_machines[app],
+                         'intervals': intervals, 'median_interval': round(sketch_quantile(sketch, 0.5) or 0),
+                         'p90_interval': round(sketch_quantile(sketch, 0.9) or 0)}
+    first_day, last_day = org.day_range()
+    return {
+        'machines': machine_rows,
+        'total_seconds': round(org.total_seconds(), 1),
+        'first_day': first_day,
+        'last_day': last_day,
+        'apps': apps,
+        'categories': {category: round(seconds, 1) for category, seconds in
+                       sorted(categories.items(), key=lambda x: x[1], reverse=True)},
+        'hourly': [round(org.hourly[hour], 1) for hour in range(HOURS)],
+        'days': {day: round(seconds, 1) for day, seconds in sorted(org.days.items())}
+    }
+
+def format_org_report(report):
+    if not report['machines']:
+        return ["No machines ingested yet"]
+    lines = [f"{len(report['machines'])} machine(s), {report['first_day']} to {report['last_day']}: "
+             f"{format_duration(report['total_seconds'])}", ""]
+    width = max(len(name) for name in list(report['machines']) + list(report['apps']) + ["Machine"])
+    lines.append(f"  {'Machine':<{width}}  {'Time':>15}  Apps  Days")
+    for name, row in report['machines'].items():
+        lines.append(f"  {name:<{width}}  {format_duration(row['total_seconds']):>15}  {row['apps']:>4}  "
+                     f"{row['first_day']} to {row['last_day']}")
+    lines.extend(["", f"  {'App':<{width}}  {'Time':>15}  Machines  Median session"])
+    for app, row in report['apps'].items():
+        median = format_duration(row['median_interval']) if row['median_interval'] else "-"
+        lines.append(f"  {app:<{width}}  {format_duration(row['seconds']):>15}  {row['machines']:>8}  {median}")
+    lines.extend(["", "  Categories:"])
+    for category, seconds in report['categories'].items():
+        lines.append(f"  {category:<{width}}  {format_duration(seconds):>15}")
+    return lines
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m modules.fleet_rollup", description="Org-wide usage rollups")
+    parser.add_argument("--state", default=STATE_FILE, help="Summary state file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Ingest new and grown logs from a drop directory")
+    ingest.add_argument("drop_dir")
+    watch = commands.add_parser("watch", help="Keep ingesting a drop directory as files arrive")
+    watch.add_argument("drop_dir")
+    watch.add_argument("--interval", type=float, default=30, help="Seconds between directory scans")
+    report = commands.add_parser("report", help="Org-wide report from the ingested summaries")
+    report.add_argument("--top", type=int, default=20, help="Apps to list (0 for all)")
+    report.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    rollup = FleetRollup(args.state)
+    if args.command == "report":
+        result = org_report(rollup.machine_summaries(), args.top or None)
+        print(json.dumps(result, indent=2) if args.json else "\n".join(format_org_report(result)))
+        return 0
+    if not os.path.isdir(args.drop_dir):
+        parser.error(f"not a directory: {args.drop_dir}")
+    while True:
+        counts = rollup.ingest_directory(args.drop_dir)
+        if rollup.dirty:
+            rollup.save_state()
+        if counts['unchanged'] < sum(counts.values()) or args.command == "ingest":
+            print(", ".join(f"{count} {outcome}" for outcome, count in counts.items()))
+        if args.command == "ingest":
+            return 0
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
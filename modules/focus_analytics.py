@@ -0,0 +1,158 @@
+from modules.usage_records import SESSION_KIND, record_interval
+
+class FocusAnalytics:
+    """
+    Single-pass focus and context-switch metrics over foreground sessions.
+    Sessions must be fed in chronological order; every metric keeps O(1) state,
+    so a year of sessions can be streamed straight from the usage file.
+    Args:
+        focus_threshold (float): Minimum block length (seconds) that counts as focused work
+        interruption_threshold (float): Sessions shorter than this (seconds) can be interruptions
+        merge_gap (float): Gap (seconds) between sessions of the same app still treated as one block
+    """
+
+    def __init__(self, focus_threshold=25 * 60, interruption_threshold=120, merge_gap=60):
+        self.focus_threshold = focus_threshold
+        self.interruption_threshold = interruption_threshold
+        self.merge_gap = merge_gap
+
+        self.sessions = 0
+        self.switches = 0
+        self.tracked_seconds = 0.0
+
+        # Uninterrupted blocks (runs of the same app)
+        self.blocks = 0
+        self.longest_block_seconds = 0.0
+        self.longest_block_app = None
+        self.longest_block_start = None
+        self.focus_blocks = 0
+        self.focus_seconds = 0.0
+        self.current_focus_streak = 0
+        self.longest_focus_streak = 0
+        self._block_app = None
+        self._block_start = None
+        self._block_end = None
+        self._block_seconds = 0.0
+
+        # Interruptions: A -> short B -> back to A
+        self.interruptions = 0
+        self.interruptions_by_hour = [0] * 24
+        self._prev_prev_app = None
+        self._prev_app = None
+        self._prev_short = False
+
+    def add_record(self, record):
+        """Store-view hook: feed session records, ignore app-close usage records."""
+        if record.kind == SESSION_KIND:
+            start, end = record_interval(record)
+            self.add_session(record.app, start, end)
+
+    def add_session(self, app, start, end):
+        """Feed one foreground session."""
+        duration = (end - start).total_seconds()
+        if duration <= 0:
+            return
+        self.sessions += 1
+        self.tracked_seconds += duration
+        if self._prev_app is not None and app != self._prev_app:
+            self.switches += 1
+
+        if self._prev_prev_app == app and self._prev_app != app and self._prev_short:
+            self.interruptions += 1
+            self.interruptions_by_hour[start.hour] += 1
+        self._prev_prev_app = self._prev_app
+        self._prev_app = app
+        self._prev_short = duration < self.interruption_threshold
+
+        if (app == self._block_app and
+                (start - self._block_end).total_seconds() <= self.merge_gap):
+            self._block_seconds += duration
+            self._block_end = max(self._block_end, end)
+        else:
+            self._close_block()
+            self._block_app = app
+            self._block_start = start
+            self._block_end = end
+            self._block_seconds = duration
+
+    def _close_block(self):
+        if self._block_app is None:
+            return
+        self.blocks += 1
+        if self._block_seconds > self.longest_block_seconds:
+            self.longest_block_seconds = self._block_seconds
+            self.longest_block_app = self._block_app
+            self.longest_block_start = self._block_start
+        if self._block_seconds >= self.focus_threshold:
+            self.focus_blocks += 1
+            self.focus_seconds += self._block_seconds
+            self.current_focus_streak += 1
+            self.longest_focus_streak = max(self.longest_focus_streak, self.current_focus_streak)
+        else:
+            self.current_focus_streak = 0
+        self._block_app = None
+
+    def summary(self):
+        """Return the metrics as a dict, counting the still-open block without closing it."""
+        blocks = self.blocks
+        longest_seconds = self.longest_block_seconds
+        longest_app = self.longest_block_app
+        longest_start = self.longest_block_start
+        focus_blocks = self.focus_blocks
+        focus_seconds = self.focus_seconds
+        streak = self.current_focus_streak
+        longest_streak = self.longest_focus_streak
+        if self._block_app is not None:
+            blocks += 1
+            if self._block_seconds > longest_seconds:
+                longest_seconds = self._block_seconds
+                longest_app = self._block_app
+                longest_start = self._block_start
+            if self._block_seconds >= self.focus_threshold:
+                focus_blocks += 1
+                focus_seconds += self._block_seconds
+                streak += 1
+                longest_streak = max(longest_streak, streak)
+            else:
+                streak = 0
+
+        tracked_hours = self.tracked_seconds / 3600
+        peak_hour = max(range(24), key=lambda h: self.interruptions_by_hour[h]) if self.interruptions else None
+        return {
+            'sessions': self.sessions,
+            'switches': self.switches,
+            'switches_per_hour': self.switches / tracked_hours if tracked_hours else 0.0,
+            'tracked_seconds': self.tracked_seconds,
+            'blocks': blocks,
+            'average_block_seconds': self.tracked_seconds / blocks if blocks else 0.0,
+            'longest_block_seconds': longest_seconds,
+            'longest_block_app': longest_app,
+            'longest_block_start': longest_start,
+            'focus_blocks': focus_blocks,
+            'focus_seconds': focus_seconds,
+            'focus_ratio': focus_seconds / self.tracked_seconds if self.tracked_seconds else 0.0,
+            'current_focus_streak': streak,
+            'longest_focus_streak': longest_streak,
+            'interruptions': self.interruptions,
+            'interruptions_by_hour': list(self.interruptions_by_hour),
+            'peak_interruption_hour': peak_hour,
+        }
+
+def format_focus_summary(summary):
+    """Render focus metrics as short "label: value" lines for the summary panel and reports."""
+    def minutes(seconds):
+        return f"{int(seconds // 60)} min"
+
+    if not summary['sessions']:
+        return ["No foreground sessions recorded"]
+    lines = [
+        f"Context switches: {summary['switches']} ({summary['switches_per_hour']:.1f}/hr)",
+        f"Longest uninterrupted block: {minutes(summary['longest_block_seconds'])}"
+        + (f" ({summary['longest_block_app']})" if summary['longest_block_app'] else ""),
+        f"Focus blocks: {summary['focus_blocks']} ({summary['focus_ratio'] * 100:.0f}% of tracked time)",
+        f"Longest focus streak: {summary['longest_focus_streak']} block(s)",
+        f"Interruptions: {summary['interruptions']}",
+    ]
+    if summary['peak_interruption_hour'] is not None:
+        lines[-1] += f" (peak around {summary['peak_interruption_hour']:02d}:00)"
+    return lines
\ No newline at end of file
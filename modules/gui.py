@@ -1,16 +1,35 @@
 import os
+import threading
 import time
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QCalendarWidget,
-    QTableWidget, QTableWidgetItem, QPushButton, QListWidget, QDialog,
-    QDialogButtonBox, QLabel, QLineEdit, QMessageBox, QFileDialog, QStatusBar, QListWidgetItem
+    QTableView, QHeaderView, QPushButton, QListWidget, QDialog,
+    QDialogButtonBox, QLabel, QLineEdit, QMessageBox, QFileDialog, QStatusBar, QListWidgetItem,
+    QComboBox, QPlainTextEdit, QSystemTrayIcon
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QIcon, QColor
+from PyQt5.QtCore import Qt, QTimer, QDate, QObject, pyqtSignal
+from PyQt5.QtGui import QIcon, QColor, QTextCharFormat
 from datetime import datetime as dt
-from modules.email_handler import EmailHandler
-from modules.exporter import ReportExporter
+from modules.focus_analytics import format_focus_summary
+from modules.budget_rules import BudgetMonitor, RULES_FILE, load_rules, parse_rules
+from modules.report_loader import ReportLoader
+from modules.export_jobs import ExportJobQueue
 from ui.components.chart_view import ChartView
+from ui.components.timeline_view import TimelineView
+from ui.components.icon_cache import icon_cache
+from ui.components.summary_model import UsageSummaryModel, UsageSortProxy, TIME_COLUMN
+from utils.helpers import format_duration
+
+LIVE_ITEM_COLOR = QColor("#2DA44E")
+HEAT_LOW_COLOR = QColor("#2A3536")
+HEAT_HIGH_COLOR = QColor("#0969DA")
+HEAT_FULL_SECONDS = 8 * 3600  # A day with this much tracked time gets the strongest shade
+SEARCH_WARM_UP_DELAY_MS = 1000  # Build the history search index once the window is up, not during first paint
+YEARLY_PDF_FILTER = "Yearly PDF with Daily Detail (*.pdf)"
+DATA_EXPORT_FILTERS = {  # File dialog filter: export format; CSV or JSON Lines by extension, .gz compresses
+    "Raw Intervals, All History (*.csv *.jsonl *.csv.gz *.jsonl.gz)": "raw_data",
+    "Daily Totals, All History (*.csv *.jsonl *.csv.gz *.jsonl.gz)": "daily_data",
+}
 
 class PermissionDialog(QDialog):
     def __init__(self, parent=None):
@@ -60,35 +79,69 @@ class EmailDialog(QDialog):
         layout.addWidget(self.send_btn)
         self.setLayout(layout)
 
+class BudgetDialog(QDialog):
+    def __init__(self, rules_text, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Daily Time Budgets")
+        self.setWindowIcon(QIcon("icons/app_icon.png"))
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(
+            "One rule per line, app or category, e.g.\n"
+            "Chrome <= 2h   (alert when exceeded)\n"
+            "terminals >= 4h   (notify when reached)"
+        ))
+        self.rules_edit = QPlainTextEdit(rules_text)
+        layout.addWidget(self.rules_edit)
+        buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+class OutboxEvents(QObject):
+    """Relays EmailOutbox listener calls from its sender thread to the GUI thread."""
+    event = pyqtSignal(str, str, str)  # event, message_id, detail
+
 class MainWindow(QMainWindow):
     def __init__(self, tracker, logger):
         super().__init__()
         self.tracker = tracker
         self.logger = logger
-        self.exporter = ReportExporter(logger)
+        self.report_loader = ReportLoader(parent=self)
+        self.export_jobs = ExportJobQueue(self._create_exporter, parent=self)
+        self.calendar_loader = ReportLoader(max_threads=1, parent=self)
+        self.search_loader = ReportLoader(max_threads=1, parent=self)
+        self.budget_loader = ReportLoader(max_threads=1, parent=self)
+        self.heat_shaded_days = []  # Calendar dates shaded for the current page
         self.total_times = {}  # app: seconds
         self.total_elapsed_time = 0  # Total time since tracking started
         self.session_start_time = None
         self.active_apps = {}  # app: start_time
         self.app_durations = {}  # app: total duration
+        self.search_highlighted_days = []  # Calendar dates highlighted by the last history search
+        self._live_items = {}  # app: QListWidgetItem in the live tracking list
+        self._live_placeholder = False  # True while the "no applications" item is shown
+        self.budget_monitor = None  # Built once today's stored totals have loaded
+        self.tray_icon = None  # Created on the first budget alert when a system tray exists
+        self.outbox = None  # EmailOutbox, created on the first email so smtplib stays out of startup
+        icon_cache().preload()
         self.init_ui()
         self.init_timers()
         self.setup_connections()
+        self._rebuild_budget_monitor()
         self.tracker.set_tracked_apps()
         self.tracker.start()
+        if self.tracker.tracking_enabled:  # Attached to a tracker daemon that is already running
+            self.session_start_time = dt.now()
+            self._show_tracking_controls(True)
+        self.on_calendar_page_changed(self.calendar.yearShown(), self.calendar.monthShown())
+        QTimer.singleShot(SEARCH_WARM_UP_DELAY_MS, self._start_search_warm_up)
 
     def init_ui(self):
         self.setWindowTitle("Productivity Tracker Pro")
         self.setGeometry(100, 100, 1200, 800)
         self.setWindowIcon(QIcon("icons/app_icon.png"))
 
-        # Load stylesheet from file
-        try:
-            with open("assets/style.qss", "r") as f:
-                self.setStyleSheet(f.read())
-        except Exception as e:
-            print(f"Error loading stylesheet: {e}")
-
         main_widget = QWidget()
         main_layout = QHBoxLayout()
 
@@ -118,31 +171,69 @@ class MainWindow(QMainWindow):
         left_panel.addLayout(control_layout)
         left_panel.addWidget(QLabel("Live Tracking:"))
         left_panel.addWidget(self.live_tracking_list)
+        self.timeline_view = TimelineView(self.tracker.timeline)
+        left_panel.addWidget(QLabel("Recent Activity:"))
+        left_panel.addWidget(self.timeline_view)
 
         # Right Panel
         right_panel = QVBoxLayout()
+        self.app_search = QLineEdit()
+        self.app_search.setPlaceholderText("Search app history (e.g. Figma) and press Enter")
         self.calendar = QCalendarWidget()
         self.chart_view = ChartView()
         self.chart_view.setMinimumHeight(300)  # Ensure enough space for the chart
-        self.summary_table = QTableWidget(0, 2)
-        self.summary_table.setHorizontalHeaderLabels(["Application", "Time Spent"])
+        self.heatmap_btn = QPushButton("Hourly Heatmap")
+        self.heatmap_btn.setCheckable(True)
+        self.chart_detail_combo = QComboBox()
+        self.chart_detail_combo.addItem("All Apps", None)
+        self.chart_detail_combo.addItem("Top 10", 10)
+        self.chart_detail_combo.addItem("Top 25", 25)
+        self.sort_chart_btn = QPushButton("Sort by Time")
+        self.sort_chart_btn.setCheckable(True)
+        self.summary_model = UsageSummaryModel(icon_provider=self._get_app_icon)
+        self.summary_proxy = UsageSortProxy()
+        self.summary_proxy.setSourceModel(self.summary_model)
+        self.summary_table = QTableView()
+        self.summary_table.setObjectName("summaryTable")
+        self.summary_table.setModel(self.summary_proxy)
+        self.summary_table.setSortingEnabled(True)
+        self.summary_table.sortByColumn(TIME_COLUMN, Qt.DescendingOrder)
         self.summary_table.setStyleSheet("selection-background-color: #0969DA;")
         self.summary_table.verticalHeader().hide()
+        # Fixed row heights keep layout O(visible rows) for long ranges
+        self.summary_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.summary_table.setColumnWidth(0, 250)
         self.summary_table.setColumnWidth(1, 150)
+        self.summary_table.horizontalHeader().setStretchLastSection(True)
+        self.focus_summary_label = QLabel("")
+        self.focus_summary_label.setWordWrap(True)
+        self.focus_summary_label.setStyleSheet("font-size: 12px; color: #D3D7D9;")
 
         export_layout = QHBoxLayout()
         self.export_btn = QPushButton("Export Report")
         self.email_btn = QPushButton("Email Report")
+        self.cancel_export_btn = QPushButton("Cancel Export")
+        self.cancel_export_btn.setEnabled(False)
+        self.budget_btn = QPushButton("Budgets")
         export_layout.addWidget(self.export_btn)
+        export_layout.addWidget(self.cancel_export_btn)
         export_layout.addWidget(self.email_btn)
+        export_layout.addWidget(self.budget_btn)
 
         right_panel.addWidget(QLabel("Select Date:"))
+        right_panel.addWidget(self.app_search)
         right_panel.addWidget(self.calendar)
-        right_panel.addWidget(QLabel("Usage Distribution:"))
+        chart_header = QHBoxLayout()
+        chart_header.addWidget(QLabel("Usage Distribution:"))
+        chart_header.addStretch()
+        chart_header.addWidget(self.chart_detail_combo)
+        chart_header.addWidget(self.sort_chart_btn)
+        chart_header.addWidget(self.heatmap_btn)
+        right_panel.addLayout(chart_header)
         right_panel.addWidget(self.chart_view)
         right_panel.addWidget(QLabel("Summary:"))
         right_panel.addWidget(self.summary_table)
+        right_panel.addWidget(self.focus_summary_label)
         right_panel.addLayout(export_layout)
 
         main_layout.addLayout(left_panel, 1)
@@ -158,59 +249,107 @@ class MainWindow(QMainWindow):
         self.start_btn.clicked.connect(self.start_tracking)
         self.stop_btn.clicked.connect(self.stop_tracking)
         self.calendar.clicked.connect(self.update_report)
+        self.app_search.returnPressed.connect(self.search_app_history)
+        self.heatmap_btn.toggled.connect(self.toggle_heatmap)
+        self.chart_detail_combo.currentIndexChanged.connect(
+            lambda index: self.chart_view.set_level_of_detail(self.chart_detail_combo.itemData(index))
+        )
+        self.sort_chart_btn.toggled.connect(self.chart_view.set_sort_by_duration)
         self.export_btn.clicked.connect(self.export_report)
         self.email_btn.clicked.connect(self.show_email_dialog)
+        self.budget_btn.clicked.connect(self.show_budget_dialog)
+        self.cancel_export_btn.clicked.connect(self.export_jobs.cancel_all)
+        self.export_jobs.job_progress.connect(self.on_export_progress)
+        self.export_jobs.job_finished.connect(self.on_export_finished)
+        self.export_jobs.job_failed.connect(self.on_export_failed)
+        self.export_jobs.job_cancelled.connect(
+            lambda job_id: self.status_bar.showMessage("Export cancelled", 3000)
+        )
+        self.export_jobs.active_changed.connect(lambda active: self.cancel_export_btn.setEnabled(active > 0))
         self.tracker.activity_changed.connect(self.on_activity_changed)
         self.tracker.tracking_update.connect(self.update_tracking_status)
         self.tracker.apps_updated.connect(self.on_apps_updated)
         self.tracker.active_apps_updated.connect(self.on_active_apps_updated)
+        self.report_loader.result_ready.connect(self.on_report_loaded)
+        self.report_loader.query_failed.connect(self.on_report_failed)
+        self.report_loader.loading_changed.connect(self.on_report_loading_changed)
+        self.calendar.currentPageChanged.connect(self.on_calendar_page_changed)
+        self.calendar_loader.result_ready.connect(self.on_month_totals_loaded)
+        self.search_loader.result_ready.connect(self.on_search_loaded)
+        self.search_loader.query_failed.connect(self.on_search_failed)
+        self.budget_loader.result_ready.connect(self.on_budget_baseline_loaded)
+        self.budget_loader.query_failed.connect(lambda request_id, error: print(f"Error loading budget totals: {error}"))
 
     def init_timers(self):
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_total_time)
+        # Fires only at the next budget crossing (or midnight), never per tick
+        self.budget_timer = QTimer()
+        self.budget_timer.setSingleShot(True)
+        self.budget_timer.timeout.connect(self.check_budgets)
 
     def start_tracking(self):
         dialog = PermissionDialog(self)
         if dialog.exec_() == QDialog.Accepted:
-            self.live_tracking_list.clear()
+            self._clear_live_tracking_list()
             self.total_times.clear()
             self.active_apps.clear()
             self.app_durations.clear()
             self.total_elapsed_time = 0
             self.session_start_time = dt.now()
             self.tracker.toggle_tracking(True)
-            self.start_btn.setEnabled(False)
-            self.stop_btn.setEnabled(True)
-            self.timer.start(1000)
-            self.current_app_label.setText("Tracking: All Applications")
+            self._show_tracking_controls(True)
             self.status_bar.showMessage("Tracking started", 3000)
-            self.logger.log_activity(
-                dt.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "Session Started"
-            )
+            if not self.tracker.remote:  # A tracker daemon writes its own session markers
+                self.logger.log_activity(
+                    dt.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "Session Started"
+                )
         else:
             self.status_bar.showMessage("Permission Denied - Tracking Not Started", 3000)
             print("Debug: Permission denied")
 
     def stop_tracking(self):
         self.tracker.toggle_tracking(False)
-        self.start_btn.setEnabled(True)
-        self.stop_btn.setEnabled(False)
-        self.timer.stop()
-        self.current_app_label.setText("Tracking: Inactive")
-        self.live_tracking_list.clear()
+        self._show_tracking_controls(False)
+        self._clear_live_tracking_list()
         self.status_bar.showMessage("Tracking stopped", 3000)
-        self.logger.end_current_session()
-        self.logger.log_activity(
-            dt.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "Session Ended"
-        )
+        if not self.tracker.remote:
+            self.logger.end_current_session()
+            self.logger.log_activity(
+                dt.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "Session Ended"
+            )
+
+    def _show_tracking_controls(self, active):
+        self.start_btn.setEnabled(not active)
+        self.stop_btn.setEnabled(active)
+        if active:
+            self.timer.start(1000)
+            self.current_app_label.setText("Tracking: All Applications")
+        else:
+            self.timer.stop()
+            self.current_app_label.setText("Tracking: Inactive")
 
     def on_activity_changed(self, timestamp, app_name, is_active):
         try:
             print(f"Debug: Activity changed - {timestamp}, {app_name}, is_active: {is_active}")
+            event_time = dt.strptime(timestamp, "%Y-%m-%d %H:%M:%S").timestamp()
             if is_active:
-                self.logger.log_activity(timestamp, app_name)
+                if self.budget_monitor is not None:
+                    self.budget_monitor.app_started(app_name, event_time)
+                if self.tracker.remote:
+                    # The daemon logged the session; its rows reach this process's store as appends
+                    if self.calendar.selectedDate().toPyDate() == dt.now().date():
+                        today = dt.now().date()
+                        self.update_focus_summary(self.logger.focus_metrics(today, today))
+                else:
+                    self.logger.log_activity(timestamp, app_name)
+                    if self.calendar.selectedDate().toPyDate() == dt.now().date():
+                        self.update_focus_summary(self.logger.live_focus_metrics())
+            elif self.budget_monitor is not None:
+                self.budget_monitor.app_stopped(app_name, event_time)
+            self._arm_budget_timer()
         except Exception as e:
             print(f"Error in on_activity_changed: {e}")
 
@@ -220,6 +359,7 @@ class MainWindow(QMainWindow):
             self.active_apps = app_start_times.copy()
             self.app_durations = app_durations.copy()
             self.update_live_tracking_list()
+            self.timeline_view.refresh()
             # Update chart with current session data
             combined_usage = self.tracker.read_app_usage(dt.now().strftime("%Y-%m-%d")).copy()
             for app, duration in self.app_durations.items():
@@ -229,30 +369,105 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Error updating live tracking list: {e}")
 
-    def update_live_tracking_list(self):
+    def _rebuild_budget_monitor(self):
+        """Load the rules and today's stored totals on the budget worker; the monitor starts when they arrive."""
+        today = dt.now().strftime("%Y-%m-%d")
+        self.budget_loader.submit(lambda is_cancelled: (load_rules(), self.logger.store.app_totals(today, today)))
+
+    def on_budget_baseline_loaded(self, request_id, result):
+        if request_id != self.budget_loader.latest_id:
+            return  # The rules changed again while this loaded
+        rules, baseline = result
+        # Apps running now are taken here, on the GUI thread that also receives their start/stop events
+        active_apps = self.tracker.get_current_stats()['active_apps']
+        self.budget_monitor = BudgetMonitor(rules, baseline, active_apps)
+        self._arm_budget_timer()
+        print(f"Debug: Budget rules: {[rule.describe() for rule in self.budget_monitor.rules]}")
+
+    def _arm_budget_timer(self):
+        if self.budget_monitor is None or not self.budget_monitor.rules:
+            self.budget_timer.stop()
+            return
+        delay = max(0.0, self.budget_monitor.next_wakeup() - time.time())
+        self.budget_timer.start(int(min(delay, 24 * 3600) * 1000) + 50)  # Land just after the crossing
+
+    def check_budgets(self):
+        for alert in self.budget_monitor.check(time.time()):
+            self.show_budget_alert(alert)
+        self._arm_budget_timer()
+
+    def show_budget_alert(self, alert):
+        message = alert.rule.message(alert.total_seconds)
+        print(f"Debug: Budget alert - {message}")
+        self.status_bar.showMessage(message, 10000)
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            if self.tray_icon is None:
+                self.tray_icon = QSystemTrayIcon(self.windowIcon(), self)
+                self.tray_icon.show()
+            icon = QSystemTrayIcon.Warning if alert.rule.kind == "max" else QSystemTrayIcon.Information
+            self.tray_icon.showMessage("Time Budget", message, icon, 10000)
+
+    def show_budget_dialog(self):
+        try:
+            with open(RULES_FILE, "r", encoding="utf-8") as f:
+                rules_text = f.read()
+        except FileNotFoundError:
+            rules_text = ""
+        dialog = BudgetDialog(rules_text, self)
+        while dialog.exec_() == QDialog.Accepted:
+            rules_text = dialog.rules_edit.toPlainText()
+            try:
+                parse_rules(rules_text)
+            except ValueError as e:
+                QMessageBox.warning(self, "Invalid Rule", str(e))
+                continue
+            with open(RULES_FILE, "w", encoding="utf-8") as f:
+                f.write(rules_text)
+            self._rebuild_budget_monitor()
+            self.status_bar.showMessage("Budgets saved", 3000)
+            break
+
+    def _clear_live_tracking_list(self):
         self.live_tracking_list.clear()
+        self._live_items.clear()
+        self._live_placeholder = False
+
+    def update_live_tracking_list(self):
+        """Update the live list in place: only new, removed, reordered or re-timed items are touched."""
         if not self.active_apps:
-            self.live_tracking_list.addItem("No applications currently active")
+            if not self._live_placeholder:
+                self._clear_live_tracking_list()
+                self.live_tracking_list.addItem("No applications currently active")
+                self._live_placeholder = True
             return
+        if self._live_placeholder:
+            self._clear_live_tracking_list()
 
-        current_time = time.time()
-        app_times = {}
-        for app, start_time in self.active_apps.items():
-            live_duration = current_time - start_time
-            total_duration = self.app_durations.get(app, 0)
-            app_times[app] = total_duration
+        # Drop apps that are no longer active
+        for app in [app for app in self._live_items if app not in self.active_apps]:
+            item = self._live_items.pop(app)
+            self.live_tracking_list.takeItem(self.live_tracking_list.row(item))
 
+        current_time = time.time()
         # Sort apps by total duration (most used first)
-        sorted_apps = sorted(app_times.items(), key=lambda x: x[1], reverse=True)
-
-        for app, total_duration in sorted_apps:
-            start_time = self.active_apps[app]
-            live_duration = current_time - start_time
-            formatted_time = self.format_time(live_duration)
-            item = QListWidgetItem(f"{app}: {formatted_time}")
-            item.setIcon(self._get_app_icon(app.lower()))
-            item.setForeground(QColor("#2DA44E"))
-            self.live_tracking_list.addItem(item)
+        sorted_apps = sorted(self.active_apps, key=lambda app: self.app_durations.get(app, 0), reverse=True)
+        for row, app in enumerate(sorted_apps):
+            live_duration = current_time - self.active_apps[app]
+            text = f"{app}: {self.format_time(live_duration)}"
+            item = self._live_items.get(app)
+            if item is None:
+                item = QListWidgetItem(text)
+                item.setIcon(icon_cache().icon_for(app))
+                item.setForeground(LIVE_ITEM_COLOR)
+                self._live_items[app] = item
+                self.live_tracking_list.insertItem(row, item)
+                continue
+            if item.text() != text:
+                item.setText(text)
+            current_row = self.live_tracking_list.row(item)
+            if current_row != row:
+                self.live_tracking_list.takeItem(current_row)
+                self.live_tracking_list.insertItem(row, item)
 
     def on_apps_updated(self, app_durations):
         try:
@@ -274,106 +489,212 @@ class MainWindow(QMainWindow):
         print(f"Debug: Total time updated - {self.total_elapsed_time} seconds")
 
     def format_time(self, seconds):
-        try:
-            total_seconds = float(seconds)
-            total_seconds = round(total_seconds)
-            hours = int(total_seconds // 3600)
-            minutes = int((total_seconds % 3600) // 60)
-            secs = int(total_seconds % 60)
-            if hours > 0:
-                return f"{hours} hr {minutes} min"
-            elif minutes > 0:
-                return f"{minutes} min {secs} sec"
-            else:
-                return f"{secs} sec"
-        except (ValueError, TypeError):
-            return "0 sec"
+        return format_duration(seconds)
 
     def update_summary_table(self):
-        self.summary_table.setRowCount(0)
-        if not self.total_times:
-            return
-        total_tracked = sum(self.total_times.values())
-        for app, seconds in sorted(self.total_times.items(), key=lambda x: x[1], reverse=True):
-            row = self.summary_table.rowCount()
-            self.summary_table.insertRow(row)
-            percentage = (seconds / total_tracked) * 100 if total_tracked > 0 else 0
-            app_item = QTableWidgetItem(app)
-            app_item.setIcon(self._get_app_icon(app.lower()))
-            self.summary_table.setItem(row, 0, app_item)
-            time_str = f"{self.format_time(seconds)} ({percentage:.1f}%)"
-            time_item = QTableWidgetItem(time_str)
-            time_item.setTextAlignment(Qt.AlignCenter)
-            self.summary_table.setItem(row, 1, time_item)
+        self.summary_model.set_totals(self.total_times)
 
     def _get_app_icon(self, app_name):
-        icon_map = {
-            'chrome': 'browser',
-            'firefox': 'browser',
-            'edge': 'browser',
-            'safari': 'browser',
-            'opera': 'browser',
-            'brave': 'browser',
-            'code': 'vscode',
-            'vscode': 'vscode',
-            'visual studio': 'vs',
-            'sublime': 'sublime',
-            'atom': 'atom',
-            'android studio': 'android',
-            'pycharm': 'pycharm',
-            'intellij': 'intellij',
-            'photoshop': 'photoshop',
-            'illustrator': 'illustrator',
-            'figma': 'figma',
-            'docker': 'docker',
-            'postman': 'postman'
-        }
-        for key, icon in icon_map.items():
-            if key in app_name.lower():
-                return QIcon(f"icons/{icon}.png")
-        return QIcon("icons/default.png")
+        return icon_cache().icon_for(app_name)
 
     def update_report(self):
         selected_date = self.calendar.selectedDate().toPyDate()
+        # In-memory data (if tracking is active) is captured here; storage is read off the GUI thread
+        current_usage = self.tracker.get_current_stats()['durations']
+        with_heatmap = self.heatmap_btn.isChecked()
+        self.report_loader.submit(
+            lambda is_cancelled: self._load_report(selected_date, current_usage, with_heatmap, is_cancelled)
+        )
+
+    def _load_report(self, selected_date, current_usage, with_heatmap, is_cancelled):
+        """Runs on a report worker thread; returns None if superseded part-way."""
         date_str = selected_date.strftime("%Y-%m-%d")
-        try:
-            # Read stored usage data for the selected date
-            stored_usage = self.tracker.read_app_usage(date_str)
-            # Combine with in-memory data (if tracking is active)
-            current_usage = self.tracker.get_current_stats()['durations']
-            combined_usage = stored_usage.copy()
-            for app, duration in current_usage.items():
-                combined_usage[app] = combined_usage.get(app, 0) + duration
+        # Read stored usage data for the selected date
+        combined_usage = self.tracker.read_app_usage(date_str).copy()
+        for app, duration in current_usage.items():
+            combined_usage[app] = combined_usage.get(app, 0) + duration
+        if is_cancelled():
+            return None
+        heatmap = self.logger.usage_heatmap(selected_date, selected_date) if with_heatmap else None
+        if is_cancelled():
+            return None
+        focus = self.logger.focus_metrics(selected_date, selected_date)
+        return {'date': selected_date, 'usage': combined_usage, 'heatmap': heatmap, 'focus': focus}
+
+    def on_report_loaded(self, request_id, result):
+        if result is None or request_id != self.report_loader.latest_id:
+            return  # A newer request superseded this one
+        selected_date = result['date']
+        self.total_times = result['usage']
+        print(f"Debug: Updating chart with data for {selected_date}: {self.total_times}")
+        self.update_summary_table()
+        self.chart_view.update_chart(self.total_times)
+        if result['heatmap'] is not None:
+            self.chart_view.update_heatmap(result['heatmap'])
+        self.update_focus_summary(result['focus'])
+        self.status_bar.showMessage(f"Showing report for {selected_date}", 3000)
+
+    def on_report_failed(self, request_id, error):
+        if request_id == self.report_loader.latest_id:
+            self.status_bar.showMessage(f"Error loading report: {error}", 5000)
+            print(f"Error loading report: {error}")
+
+    def on_report_loading_changed(self, loading):
+        if loading:
+            self.status_bar.showMessage("Loading report...")
+
+    def on_calendar_page_changed(self, year, month):
+        # Shade instantly from the query cache when possible, then prefetch the neighbours
+        cached = self.logger.month_totals(year, month, cached_only=True)
+        if cached is not None:
+            self.shade_calendar(year, month, cached)
+        pages = [(year, month)]
+        for step in (-1, 1):
+            y, m = divmod(year * 12 + (month - 1) + step, 12)
+            pages.append((y, m + 1))
+        self.calendar_loader.submit(lambda is_cancelled: self._load_month_totals(pages, is_cancelled))
+
+    def _load_month_totals(self, pages, is_cancelled):
+        """Runs on the calendar worker: one batched query per month, shown month first."""
+        results = {}
+        for year, month in pages:
+            if is_cancelled():
+                break
+            results[(year, month)] = self.logger.month_totals(year, month)
+        return results
+
+    def on_month_totals_loaded(self, request_id, results):
+        page = (self.calendar.yearShown(), self.calendar.monthShown())
+        if page in results:
+            self.shade_calendar(page[0], page[1], results[page])
+
+    def shade_calendar(self, year, month, day_totals):
+        """Shade each day of the shown month by its total tracked time."""
+        for day in self.heat_shaded_days:
+            self.calendar.setDateTextFormat(QDate(day), QTextCharFormat())
+        self.heat_shaded_days = []
+        for day_str, seconds in day_totals.items():
+            day = dt.strptime(day_str, "%Y-%m-%d").date()
+            if (day.year, day.month) != (year, month) or seconds <= 0:
+                continue
+            fraction = min(1.0, seconds / HEAT_FULL_SECONDS)
+            shade = QTextCharFormat()
+            shade.setBackground(QColor(
+                int(HEAT_LOW_COLOR.red() + (HEAT_HIGH_COLOR.red() - HEAT_LOW_COLOR.red()) * fraction),
+                int(HEAT_LOW_COLOR.green() + (HEAT_HIGH_COLOR.green() - HEAT_LOW_COLOR.green()) * fraction),
+                int(HEAT_LOW_COLOR.blue() + (HEAT_HIGH_COLOR.blue() - HEAT_LOW_COLOR.blue()) * fraction),
+            ))
+            shade.setToolTip(f"{self.format_time(seconds)} tracked")
+            self.calendar.setDateTextFormat(QDate(day), shade)
+            self.heat_shaded_days.append(day)
+        self._apply_search_highlight()
+
+    def update_focus_summary(self, summary):
+        self.focus_summary_label.setText("\n".join(format_focus_summary(summary)))
+
+    def toggle_heatmap(self, checked):
+        if checked:
+            self.update_report()  # Loads the heatmap for the selected date in the background
+        self.chart_view.set_mode("heatmap" if checked else "bars")
+
+    def _apply_search_highlight(self):
+        highlight = QTextCharFormat()
+        highlight.setBackground(QColor("#2DA44E"))
+        highlight.setForeground(QColor("#FFFFFF"))
+        for day in self.search_highlighted_days:
+            self.calendar.setDateTextFormat(QDate(day), highlight)
+
+    def search_app_history(self):
+        query = self.app_search.text().strip()
+        # Clear the previous search highlight, restoring any heat shading underneath
+        previous = self.search_highlighted_days
+        self.search_highlighted_days = []
+        for day in previous:
+            self.calendar.setDateTextFormat(QDate(day), QTextCharFormat())
+        if previous:
+            self.on_calendar_page_changed(self.calendar.yearShown(), self.calendar.monthShown())
+        if not query:
+            self.search_loader.submit(lambda is_cancelled: None)  # Drops a search still in flight
+            return
+        self.search_loader.submit(lambda is_cancelled: (query, self.logger.days_with_app(query)))
+
+    def _start_search_warm_up(self):
+        if self.search_loader.latest_id == 0:  # A search already submitted builds the index itself
+            self.search_loader.submit(self._warm_search_index)
+
+    def _warm_search_index(self, is_cancelled):
+        """Runs on the search worker at startup, so the first search does not scan the log."""
+        self.logger.store.app_index()
+
+    def on_search_loaded(self, request_id, result):
+        if result is None or request_id != self.search_loader.latest_id:
+            return  # Startup warm-up, or superseded by a newer search
+        query, days = result
+        if not days:
+            self.status_bar.showMessage(f"No usage found for '{query}'", 5000)
+            return
+        self.search_highlighted_days = days
+        self._apply_search_highlight()
+        # Jump to the most recent match
+        self.calendar.setSelectedDate(QDate(days[-1]))
+        self.update_report()
+        self.status_bar.showMessage(
+            f"'{query}' used on {len(days)} day(s), last on {days[-1]}", 5000
+        )
 
-            self.total_times = combined_usage
-            print(f"Debug: Updating chart with data for {date_str}: {self.total_times}")
-            self.update_summary_table()
-            self.chart_view.update_chart(self.total_times)
-            self.status_bar.showMessage(f"Showing report for {selected_date}", 3000)
-        except Exception as e:
-            self.status_bar.showMessage(f"Error loading report: {str(e)}", 5000)
-            print(f"Error loading report: {e}")
+    def on_search_failed(self, request_id, error):
+        if request_id == self.search_loader.latest_id:
+            self.status_bar.showMessage(f"Error searching history: {error}", 5000)
+            print(f"Error searching history: {error}")
+
+    def _create_exporter(self):
+        # Imported on first export so reportlab stays out of startup
+        from modules.exporter import ReportExporter
+        return ReportExporter(self.logger)
 
     def export_report(self):
         selected_date = self.calendar.selectedDate().toPyDate()
         date_str = selected_date.strftime("%Y-%m-%d")
-        options = "PDF Files (*.pdf);;Text Files (*.txt)"
-        filename, _ = QFileDialog.getSaveFileName(
+        options = ";;".join(["PDF Files (*.pdf)", "Text Files (*.txt)", "HTML Files (*.html)", YEARLY_PDF_FILTER]
+                            + list(DATA_EXPORT_FILTERS))
+        filename, selected_filter = QFileDialog.getSaveFileName(
             self, "Export Report", f"TimeReport_{date_str}", options
         )
         if filename:
-            try:
-                if filename.endswith('.pdf'):
-                    self.exporter.export_pdf(filename, selected_date, selected_date)
-                else:
-                    self.exporter.export_txt(filename, selected_date, selected_date)
-                QMessageBox.information(self, "Success", "Report exported successfully!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to export report: {str(e)}")
+            start_date = end_date = selected_date
+            if selected_filter == YEARLY_PDF_FILTER:
+                # The selected date's year so far, one section per day
+                export_format = "daily_pdf"
+                start_date = selected_date.replace(month=1, day=1)
+                end_date = min(selected_date.replace(month=12, day=31), dt.now().date())
+                if start_date > end_date:
+                    self.status_bar.showMessage(f"No usage to export yet for {selected_date.year}", 5000)
+                    return
+            elif selected_filter in DATA_EXPORT_FILTERS:
+                export_format = DATA_EXPORT_FILTERS[selected_filter]
+                start_date = end_date = None
+            else:
+                extension = os.path.splitext(filename)[1].lower()
+                export_format = {".pdf": "pdf", ".html": "html", ".htm": "html"}.get(extension, "txt")
+            self.export_jobs.submit(export_format, filename, start_date, end_date)
+            queued = self.export_jobs.active_jobs()
+            self.status_bar.showMessage(f"Export queued ({queued} active)", 3000)
+
+    def on_export_progress(self, job_id, percent, message):
+        self.status_bar.showMessage(f"Exporting report #{job_id}: {percent}% - {message}")
+
+    def on_export_finished(self, job_id, filename):
+        self.status_bar.showMessage(f"Report exported to {filename}", 5000)
+        QMessageBox.information(self, "Success", f"Report exported successfully!\n{filename}")
+
+    def on_export_failed(self, job_id, error):
+        self.status_bar.showMessage("Export failed", 5000)
+        QMessageBox.critical(self, "Error", f"Failed to export report: {error}")
 
     def show_email_dialog(self):
         dialog = EmailDialog(self)
         dialog.send_btn.clicked.connect(lambda: self._send_email(
+            dialog,
             dialog.recipient.text(),
             dialog.sender.text(),
             dialog.password.text(),
@@ -382,22 +703,63 @@ class MainWindow(QMainWindow):
         ))
         dialog.exec_()
 
-    def _send_email(self, recipient, sender, password, server, port):
+    def _email_outbox(self):
+        if self.outbox is None:
+            from modules.email_outbox import EmailOutbox
+            self.outbox = EmailOutbox()
+            self.outbox_events = OutboxEvents(self)
+            self.outbox_events.event.connect(self.on_outbox_event)
+            self.outbox.add_listener(self.outbox_events.event.emit)
+            self.outbox.start()
+        return self.outbox
+
+    def _send_email(self, dialog, recipient, sender, password, server, port):
         try:
+            from modules.email_handler import EmailHandler  # smtplib/MIME/reportlab load on first send
             handler = EmailHandler(server, int(port), sender, password)
-            handler.send_report(recipient, self.total_times)
-            QMessageBox.information(self, "Success", "Email sent successfully!")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to send email: {str(e)}")
+        except ValueError:
+            QMessageBox.critical(self, "Error", f"Invalid SMTP port: {port}")
+            return
+        # Same aggregate as an export of the selected day, so a just-exported PDF is reused;
+        # aggregation, rendering and SMTP all happen on the outbox thread
+        selected_date = self.calendar.selectedDate().toPyDate()
+        handler.queue_report(self._email_outbox(), recipient,
+                             lambda: self._create_exporter().report_data(selected_date, selected_date))
+        dialog.accept()
+
+    def on_outbox_event(self, event, message_id, detail):
+        if event == "queued":
+            self.status_bar.showMessage(f"Email queued ({len(self.outbox.pending())} waiting)", 3000)
+        elif event == "sent":
+            self.status_bar.showMessage("Email sent" + (f" ({detail})" if detail else ""), 5000)
+        elif event == "retry":
+            self.status_bar.showMessage(f"Email not sent yet, will retry: {detail}", 5000)
+        elif event == "failed":
+            self.status_bar.showMessage("Email failed", 5000)
+            QMessageBox.critical(self, "Error", f"Failed to send email: {detail}")
 
     def update_tracking_status(self, is_tracking):
+        if self.tracker.remote:  # Another client may have started or stopped the daemon
+            self._show_tracking_controls(is_tracking)
         color = "#2DA44E" if is_tracking else "#F44336"
         self.status_bar.setStyleSheet(f"background-color: #0969DA; color: {color};")
         self.status_bar.showMessage("Tracking Active" if is_tracking else "Tracking Inactive")
 
     def closeEvent(self, event):
-        if self.tracker.tracking_enabled:
-            self.stop_tracking()
+        if self.tracker.tracking_enabled and not self.tracker.remote:
+            self.stop_tracking()  # A tracker daemon keeps tracking after the window closes
+        self.report_loader.shutdown()
+        self.export_jobs.shutdown()
+        self.calendar_loader.shutdown()
+        self.search_loader.shutdown()
+        self.budget_loader.shutdown()
+        self.budget_timer.stop()
+        if self.outbox is not None:
+            self.outbox.stop()  # Unsent mail stays in the outbox directory
+        # Writes only the changed months; off the GUI thread, and not a daemon so it finishes before exit
+        threading.Thread(target=self.logger.store.save_checkpoint, name="usage-checkpoint").start()
+        if self.tray_icon is not None:
+            self.tray_icon.hide()
         self.tracker.quit()
         self.tracker.wait()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,393 @@
+"""
+Optional local HTTP/JSON API for dashboards, built on asyncio with no extra dependencies.
+
+    python -m modules.http_api [--port 8765] [--log-file usage_data.txt] [--workers 4]
+
+Endpoints (GET or HEAD; days are YYYY-MM-DD, today, yesterday or -N):
+
+    /api/day/DAY                          per-app and per-category totals and hourly seconds
+    /api/range?start=&end=&by=app|category|day
+    /api/heatmap?start=&end=&by=category|app
+    /api/rows?view=raw|daily|total[&start=&end=]   JSON Lines, streamed (chunked)
+    /api/live                             open sessions from the tracker daemon
+
+range, heatmap and rows take the report filters: apps=, categories= (comma-separated),
+hours=09:00-17:00 and weekdays=Mon,Tue. Responses carry an ETag derived from the
+store generation of the requested days, so polls with If-None-Match get a 304 until
+those days change. Store work runs on a thread pool, never on the event loop, and
+identical concurrent requests share one computation.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from urllib.parse import parse_qs, urlsplit
+from modules.app_categories import category_for
+from modules.data_export import DATA_VIEWS
+from modules.tracker_client import TrackerClient, TrackerUnavailable
+from modules.usage_filter import UsageFilter
+from modules.usage_store import get_store
+from utils.helpers import parse_day
+
+DEFAULT_PORT = 8765
+KEEPALIVE_TIMEOUT = 15  # Seconds an idle connection is kept open
+STREAM_CHUNK_ROWS = 2000  # Rows per chunk of a streamed response
+MAX_RANGE_DAYS = 3660  # Longer /api/range and /api/heatmap queries are refused; use /api/rows
+LIVE_MAX_AGE = 1.0  # Seconds a daemon snapshot is shared between pollers
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class Query:
+    """A resolved request: the days it reads (for the ETag) and how to produce the body."""
+
+    def __init__(self, start, end, compute=None, rows=None):
+        self.start = start
+        self.end = end
+        self.compute = compute  # Returns a JSON-able object
+        self.rows = rows  # Or: returns an iterator of dicts to stream as JSON Lines
+
+def _param(params, name, default=None):
+    values = params.get(name)
+    return values[0] if values else default
+
+def _day_param(params, name, default=None):
+    value = _param(params, name)
+    if value is None:
+        return default
+    try:
+        return parse_day(value)
+    except ValueError as e:
+        raise HttpError(400, f"{name}: {e}")
+
+def _filter_param(params):
+    split = lambda value: [item for item in value.split(",") if item] if value else None
+    try:
+        return UsageFilter.from_options(split(_param(params, "apps")), split(_param(params, "categories")),
+                                        _param(params, "hours"), _param(params, "weekdays"))
+    except ValueError as e:
+        raise HttpError(400, str(e))
+
+def _bounded_range(params):
+    start = _day_param(params, "start")
+    end = _day_param(params, "end", start)
+    if start is None:
+        raise HttpError(400, "start is required")
+    if end < start:
+        raise HttpError(400, "end is before start")
+    if end - start > timedelta(days=MAX_RANGE_DAYS):
+        raise HttpError(400, f"ranges are limited to {MAX_RANGE_DAYS} days; stream /api/rows instead")
+    return start, end
+
+def _rounded(totals):
+    return {label: round(seconds, 1) for label, seconds in sorted(totals.items(), key=lambda x: x[1], reverse=True)}
+
+class UsageApi:
+    """Maps request paths to store queries; everything here runs on worker threads."""
+
+    def __init__(self, store, tracker_client):
+        self.store = store
+        self.tracker_client = tracker_client
+
+    def route(self, path, params):
+        if path.startswith("/api/day/"):
+            return self.day(path[len("/api/day/"):])
+        handler = {
+            "/api/range": self.range,
+            "/api/heatmap": self.heatmap,
+            "/api/rows": self.rows,
+        }.get(path)
+        if handler is None:
+            raise HttpError(404, f"No such endpoint: {path}")
+        return handler(params)
+
+    def day(self, value):
+        try:
+            day = parse_day(value)
+        except ValueError as e:
+            raise HttpError(400, str(e))
+
+        def compute():
+            apps = self.store.app_totals(day, day)
+            categories = {}
+            for app, seconds in apps.items():
+                categories[category_for(app)] = categories.get(category_for(app), 0) + seconds
+            hourly = [0.0] * 24
+            for hours in self.store.heatmap(day, day, "category").values():
+                hourly = [total + seconds for total, seconds in zip(hourly, hours)]
+            return {'day': day.isoformat(), 'total_seconds': round(sum(apps.values()), 1), 'apps': _rounded(apps),
+                    'categories': _rounded(categories), 'hourly': [round(seconds, 1) for seconds in hourly]}
+        return Query(day, day, compute)
+
+    def range(self, params):
+        start, end = _bounded_range(params)
+        by = _param(params, "by", "app")
+        if by not in ("app", "category", "day"):
+            raise HttpError(400, "by must be app, category or day")
+        usage_filter = _filter_param(params)
+
+        def compute():
+            if by == "day":
+                totals = self.store.day_totals(start, end)
+                if usage_filter is not None:
+                    totals = {day: sum(self.store.app_totals(day, day, usage_filter).values()) for day in totals}
+                totals = {day: seconds for day, seconds in sorted(totals.items()) if seconds}
+                rows = {day: round(seconds, 1) for day, seconds in totals.items()}
+            else:
+                totals = self.store.app_totals(start, end, usage_filter)
+                if by == "category":
+                    categories = {}
+                    for app, seconds in totals.items():
+                        categories[category_for(app)] = categories.get(category_for(app), 0) + seconds
+                    totals = categories
+                rows = _rounded(totals)
+            return {'start': start.isoformat(), 'end': end.isoformat(), 'by': by,
+                    'filter': usage_filter.describe() if usage_filter is not None else None,
+                    'total_seconds': round(sum(totals.values()), 1), 'rows': rows}
+        return Query(start, end, compute)
+
+    def heatmap(self, params):
+        start, end = _bounded_range(params)
+        by = _param(params, "by", "category")
+        if by not in ("app", "category"):
+            raise HttpError(400, "by must be app or category")
+        usage_filter = _filter_param(params)
+
+        def compute():
+            rows = self.store.heatmap(start, end, by, usage_filter)
+            return {'start': start.isoformat(), 'end': end.isoformat(), 'by': by,
+                    'rows': {label: [round(seconds, 1) for seconds in hours] for label, hours in rows.items()}}
+        return Query(start, end, compute)
+
+    def rows(self, params):
+        view = _param(params, "view", "raw")
+        if view not in DATA_VIEWS:
+            raise HttpError(400, f"view must be one of {', '.join(DATA_VIEWS)}")
+        start = _day_param(params, "start")
+        end = _day_param(params, "end")
+        usage_filter = _filter_param(params)
+        row_source, fields = DATA_VIEWS[view]
+        return Query(start, end, rows=lambda: (dict(zip(fields, row))
+                                               for row in row_source(self.store, start, end, usage_filter)))
+
+    def live(self):
+        try:
+            return self.tracker_client.stats()
+        except TrackerUnavailable as e:
+            raise HttpError(503, str(e))
+
+class HttpApiServer:
+    def __init__(self, store, tracker_client=None, workers=4, cache_entries=256):
+        self.api = UsageApi(store, tracker_client or TrackerClient())
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-api")
+        self.instance = uuid.uuid4().hex[:8]  # Generations restart with the process, so ETags carry this too
+        self._bodies = OrderedDict()  # (target, start, end, etag): encoded body
+        self._inflight = {}  # (target, start, end, etag): future of the encoded body
+        self._live = None  # (loop time, future of the daemon's stats)
+        self.cache_entries = cache_entries
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(function, *args))
+
+    def _etag(self, query):
+        # The resolved days are part of it: "today" or start=-7 move at midnight while the generation may not
+        days = "-".join(day.isoformat() if day is not None else "" for day in (query.start, query.end))
+        return f'W/"{self.instance}-{days}-{self.store.range_generation(query.start, query.end)}"'
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get("content-length"):
+                    await reader.readexactly(int(headers["content-length"]))  # Bodies are not used
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(method, target, headers, writer, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _write_head(self, writer, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}", "Server: ProductivityTracker",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    def _write_json(self, writer, status, body, keep_alive, head_only=False, extra=None):
+        headers = {'Content-Type': "application/json", 'Content-Length': len(body)}
+        headers.update(extra or {})
+        self._write_head(writer, status, headers, keep_alive)
+        if not head_only:
+            writer.write(body)
+
+    async def _respond(self, method, target, headers, writer, keep_alive):
+        head_only = method == "HEAD"
+        try:
+            if method not in ("GET", "HEAD"):
+                raise HttpError(405, "Only GET and HEAD are supported")
+            url = urlsplit(target)
+            if url.path == "/api/live":
+                body, etag = await self._live_body()
+                extra = {'ETag': etag, 'Cache-Control': "no-cache"}
+            else:
+                query = self.api.route(url.path, parse_qs(url.query))
+                etag = await self._run(self._etag, query)
+                extra = {'ETag': etag, 'Cache-Control': "no-cache"}
+                if headers.get("if-none-match") == etag:
+                    self._write_head(writer, 304, extra, keep_alive)
+                    await writer.drain()
+                    return
+                if query.rows is not None:
+                    await self._stream_rows(writer, query, extra, keep_alive, head_only)
+                    return
+                body = await self._body(target, etag, query)
+            if headers.get("if-none-match") == etag:
+                self._write_head(writer, 304, extra, keep_alive)
+            else:
+                self._write_json(writer, 200, body, keep_alive, head_only, extra)
+        except HttpError as e:
+            self._write_json(writer, e.status, json.dumps({'error': str(e)}).encode("utf-8"), keep_alive, head_only)
+        except ConnectionError:
+            raise
+        except Exception as e:
+            print(f"Error in HTTP API handling {target}: {e}")
+            self._write_json(writer, 500, json.dumps({'error': str(e)}).encode("utf-8"), keep_alive, head_only)
+        await writer.drain()
+
+    async def _body(self, target, etag, query):
+        """Encoded body for a request at a generation, computed once however many clients ask."""
+        key = (target, query.start, query.end, etag)
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+            return body
+        future = self._inflight.get(key)
+        if future is None:
+            encode = lambda: json.dumps(query.compute(), separators=(",", ":")).encode("utf-8")
+            future = self._inflight[key] = asyncio.ensure_future(self._run(encode))
+            try:
+                body = await future
+            finally:
+                del self._inflight[key]
+            self._bodies[key] = body
+            while len(self._bodies) > self.cache_entries:
+                self._bodies.popitem(last=False)
+            return body
+        return await asyncio.shield(future)
+
+    async def _live_body(self):
+        """The daemon's stats, fetched at most once per LIVE_MAX_AGE for all pollers."""
+        loop = asyncio.get_running_loop()
+        if self._live is None or loop.time() - self._live[0] > LIVE_MAX_AGE:
+            self._live = (loop.time(), asyncio.ensure_future(self._run(self.api.live)))
+        try:
+            stats = await asyncio.shield(self._live[1])
+        except HttpError:
+            self._live = None  # Ask again on the next poll
+            raise
+        etag = f'W/"live-{stats["pid"]}-{stats["ticks"]}"'
+        return json.dumps(stats, separators=(",", ":")).encode("utf-8"), etag
+
+    async def _stream_rows(self, writer, query, extra, keep_alive, head_only):
+        """Send rows as chunked JSON Lines; a worker produces chunks while the loop writes them."""
+        headers = {'Content-Type': "application/x-ndjson", 'Transfer-Encoding': "chunked"}
+        headers.update(extra)
+        self._write_head(writer, 200, headers, keep_alive)
+        if head_only:
+            return
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue(maxsize=4)  # Backpressure: the worker waits for slow clients
+        cancelled = False
+
+        def produce():
+            lines = []
+            try:
+                for row in query.rows():
+                    if cancelled:
+                        return
+                    lines.append(json.dumps(row, separators=(",", ":")))
+                    if len(lines) >= STREAM_CHUNK_ROWS:
+                        asyncio.run_coroutine_threadsafe(chunks.put("\n".join(lines) + "\n"), loop).result()
+                        lines = []
+                if lines:
+                    asyncio.run_coroutine_threadsafe(chunks.put("\n".join(lines) + "\n"), loop).result()
+            finally:
+                asyncio.run_coroutine_threadsafe(chunks.put(None), loop).result()
+
+        producer = loop.run_in_executor(self.executor, produce)
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                data = chunk.encode("utf-8")
+                writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+                await writer.drain()
+            await producer
+            writer.write(b"0\r\n\r\n")
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # The status line is already out, so a failure can only end the connection early
+            print(f"Debug: Row stream ended early: {e}")
+            raise ConnectionAbortedError(str(e))
+        finally:
+            cancelled = True
+            while not producer.done():  # Unblock the worker if the client went away mid-stream
+                if chunks.empty():
+                    await asyncio.sleep(0.01)
+                else:
+                    chunks.get_nowait()
+            await asyncio.wait([producer])
+
+async def serve(host, port, store, tracker_client, workers):
+    server = HttpApiServer(store, tracker_client, workers)
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Debug: HTTP API listening on http://{host}:{port}/api/")
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API over the usage data")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (keep it on localhost)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--log-file", default="usage_data.txt")
+    parser.add_argument("--socket", help="Tracker daemon socket for /api/live (default: per-user runtime dir)")
+    parser.add_argument("--workers", type=int, default=4, help="Threads for store queries")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.log_file):
+        parser.error(f"usage file not found: {args.log_file}")
+    try:
+        asyncio.run(serve(args.host, args.port, get_store(args.log_file), TrackerClient(args.socket), args.workers))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,14 +1,19 @@
 import os
-from datetime import datetime as dt
-from collections import defaultdict
+from datetime import datetime as dt, date
 import threading
+from calendar import monthrange
+from modules.usage_store import get_store
+from modules.focus_analytics import FocusAnalytics
 
 class LogManager:
-    def __init__(self):
-        self.log_file = "usage_data.txt"  # File in current working directory
+    def __init__(self, log_file="usage_data.txt"):
+        self.log_file = log_file  # Default is a file in the current working directory
         self._lock = threading.Lock()  # For thread-safe file operations
+        self.store = get_store(self.log_file)
         self.current_app = None
         self.session_start_time = None
+        self._live_focus = None  # FocusAnalytics for today, fed as sessions are written
+        self._live_focus_day = None
         self._initialize_log_file()
 
     def _initialize_log_file(self):
@@ -54,9 +59,7 @@ class LogManager:
                 self.session_start_time = parsed_time
                 # Log "Session Started" if this is the start of a session
                 if app_name == "Session Started":
-                    with self._lock:
-                        with open(self.log_file, "a") as f:
-                            f.write(f"{timestamp},Session Started\n")
+                    self.store.append_row(timestamp, "Session Started")
             else:
                 self.current_app = None
                 self.session_start_time = None
@@ -67,10 +70,17 @@ class LogManager:
         """Thread-safe session writing in plain-text format."""
         with self._lock:
             try:
-                with open(self.log_file, "a") as f:
-                    timestamp = start_time.strftime("%Y-%m-%d %H:%M:%S")
-                    f.write(f"{timestamp},{app},{duration}\n")
+                # Session rows carry both ends so the interval is unambiguous
+                self.store.append_row(
+                    start_time.strftime("%Y-%m-%d"),
+                    start_time.strftime("%H:%M:%S"),
+                    end_time.strftime("%H:%M:%S"),
+                    app,
+                    duration
+                )
                 print(f"Debug: Wrote session - App: {app}, Duration: {duration}s")
+                if self._live_focus is not None and start_time.date() == self._live_focus_day:
+                    self._live_focus.add_session(app, start_time, end_time)
             except Exception as e:
                 print(f"Error writing session: {e}")
 
@@ -82,68 +92,96 @@ class LogManager:
         Returns:
             list: List of dicts with app and duration
         """
-        sessions = defaultdict(int)
-        target_date_str = target_date.isoformat()
-        print(f"Debug: Reading sessions for date {target_date_str} from file {self.log_file}")
-
-        with self._lock:
-            try:
-                with open(self.log_file, "r") as f:
-                    lines = f.readlines()
-                print(f"Debug: Read {len(lines)} lines from {self.log_file}")
-                print(f"Debug: File contents: {lines}")
-            except FileNotFoundError:
-                print(f"Debug: Log file {self.log_file} not found.")
-                return []
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    print(f"Debug: Skipping empty line")
-                    continue
-                parts = line.split(',')
-                if len(parts) < 2:
-                    print(f"Debug: Skipping malformed line: {line}")
-                    continue
-
-                # Parse timestamp
-                try:
-                    timestamp_str = parts[0]
-                    timestamp = dt.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    line_date_str = timestamp.strftime("%Y-%m-%d")
-                except ValueError:
-                    print(f"Debug: Invalid timestamp in line: {line}")
-                    continue
-
-                # Check if the line is for the target date
-                if line_date_str != target_date_str:
-                    print(f"Debug: Line date {line_date_str} does not match target date {target_date_str}, skipping")
-                    continue
-
-                # Parse the activity
-                activity = parts[1]
-                if activity in ["Session Started", "Session Ended"]:
-                    print(f"Debug: Skipping session marker: {activity}")
-                    continue
-
-                # Parse app and duration
-                if len(parts) >= 3:
-                    app_name = activity
-                    try:
-                        duration = float(parts[2])
-                        sessions[app_name] += duration
-                        print(f"Debug: Processed session - App: {app_name}, Duration: {duration}s")
-                    except ValueError:
-                        print(f"Debug: Invalid duration in line: {line}")
-                        continue
-                else:
-                    print(f"Debug: Incomplete data in line: {line}")
-
-        # Convert defaultdict to list of dicts
+        sessions = self.store.app_totals(target_date, target_date)
         result = [{"app": app, "duration": duration} for app, duration in sessions.items()]
-        print(f"Debug: Aggregated sessions: {result}")
+        print(f"Debug: Aggregated sessions for {target_date}: {result}")
         return result
 
+    def aggregate_usage(self, start_date, end_date, usage_filter=None):
+        """
+        Aggregate durations by app over a date range in a single pass.
+        Args:
+            start_date (date): First day of the range
+            end_date (date): Last day of the range (inclusive)
+            usage_filter (UsageFilter): Optional app/category/hours/weekday filter
+        Returns:
+            dict: app name -> total seconds
+        """
+        return self.store.app_totals(start_date, end_date, usage_filter)
+
+    def days_with_app(self, app_name, start_date=None, end_date=None):
+        """
+        Find the days an app was used without scanning the log.
+        Args:
+            app_name (str): App name or search string (case-insensitive)
+            start_date (date): Optional first day
+            end_date (date): Optional last day
+        Returns:
+            list: Sorted dates
+        """
+        return self.store.days_for(app_name, start_date, end_date)
+
+    def last_used(self, app_name):
+        """Return the last date an app was used, or None if it never was."""
+        return self.store.last_used(app_name)
+
+    def usage_heatmap(self, start_date, end_date, by="app", usage_filter=None):
+        """
+        Hour-of-day usage over a date range, read from the incremental usage cube.
+        Args:
+            start_date (date): First day of the range
+            end_date (date): Last day of the range (inclusive)
+            by (str): "app" or "category"
+            usage_filter (UsageFilter): Optional filter
+        Returns:
+            dict: row label -> list of 24 hourly seconds
+        """
+        return self.store.heatmap(start_date, end_date, by, usage_filter)
+
+    def focus_metrics(self, start_date, end_date, usage_filter=None):
+        """
+        Focus and context-switch metrics over the sessions in a date range, optionally
+        only the sessions a UsageFilter keeps (clipped to its time window).
+        Sessions are streamed from the store, so memory does not grow with the range.
+        Returns:
+            dict: see FocusAnalytics.summary()
+        """
+        def compute():
+            analytics = FocusAnalytics()
+            for record in self.store.scan(start_date, end_date, usage_filter):
+                analytics.add_record(record)
+            return analytics.summary()
+
+        return dict(self.store.cache.get_or_compute(
+            "focus", start_date.isoformat(), end_date.isoformat(), usage_filter, compute
+        ))
+
+    def live_focus_metrics(self):
+        """Focus metrics for today, updated incrementally as sessions are logged."""
+        today = dt.now().date()
+        with self._lock:
+            if self._live_focus_day != today:
+                analytics = FocusAnalytics()
+                for record in self.store.scan(today, today):
+                    analytics.add_record(record)
+                self._live_focus = analytics
+                self._live_focus_day = today
+            return self._live_focus.summary()
+
+    def month_totals(self, year, month, cached_only=False):
+        """
+        Total tracked seconds per day of a month, in one batched query.
+        Args:
+            year (int): Calendar year
+            month (int): Month number (1-12)
+            cached_only (bool): Return None instead of computing when not cached
+        Returns:
+            dict: "YYYY-MM-DD" -> seconds, only for days with data
+        """
+        first = date(year, month, 1)
+        last = date(year, month, monthrange(year, month)[1])
+        return self.store.day_totals(first, last, cached_only)
+
     def end_current_session(self):
         """Cleanly end the current session if one exists."""
         if self.current_app and self.session_start_time:
@@ -157,10 +195,8 @@ class LogManager:
                     duration=int(duration)
                 )
             # Log "Session Ended"
-            with self._lock:
-                with open(self.log_file, "a") as f:
-                    end_timestamp = end_time.strftime("%Y-%m-%d %H:%M:%S")
-                    f.write(f"{end_timestamp},Session Ended\n")
+            end_timestamp = end_time.strftime("%Y-%m-%d %H:%M:%S")
+            self.store.append_row(end_timestamp, "Session Ended")
             self.current_app = None
             self.session_start_time = None
 
@@ -168,8 +204,8 @@ class LogManager:
         """Clear all log data (use with caution)."""
         with self._lock:
             try:
-                with open(self.log_file, "w") as f:
-                    pass  # Just clear the file
+                self.store.clear()
+                self._live_focus_day = None
                 print(f"Debug: Cleared log file {self.log_file}")
             except Exception as e:
                 print(f"Error clearing logs: {e}")
\ No newline at end of file
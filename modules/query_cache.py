@@ -0,0 +1,63 @@
+from collections import OrderedDict
+import threading
+
+class QueryCache:
+    """Bounded LRU cache of aggregate query results, validated against storage generations."""
+
+    def __init__(self, store, max_entries=256):
+        self.store = store
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (kind, start, end, filters): (generation, result)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, kind, start_day, end_day, filters, compute):
+        """
+        Return the cached result for a query, computing and storing it on a miss.
+        Args:
+            kind (str): Query kind, e.g. "app_totals"
+            start_day (str): First day of the range ("YYYY-MM-DD")
+            end_day (str): Last day of the range ("YYYY-MM-DD")
+            filters: Hashable filter spec, or None
+            compute (callable): Produces the result when the cache cannot serve it
+        """
+        key = (kind, start_day, end_day, filters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.store.is_current(entry[0], start_day, end_day):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Snapshot the generation before computing so a concurrent append marks the entry stale
+        generation = self.store.generation
+        result = compute()
+        with self._lock:
+            self._entries[key] = (generation, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def peek(self, kind, start_day, end_day, filters=None):
+        """Return a still-valid cached result without computing anything, or None."""
+        key = (kind, start_day, end_day, filters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.store.is_current(entry[0], start_day, end_day):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            return None
+
+    def clear(self):
+        """Drop every cached entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
\ No newline at end of file
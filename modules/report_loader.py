@@ -0,0 +1,85 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class _QueryRunnable(QRunnable):
+    def __init__(self, loader, request_id, query):
+        super().__init__()
+        self.loader = loader
+        self.request_id = request_id
+        self.query = query
+        self.setAutoDelete(False)  # The loader keeps a reference so pending runs can be taken back
+
+    def run(self):
+        loader = self.loader
+        if loader.is_cancelled(self.request_id):
+            loader._finish(self.request_id)
+            return
+        try:
+            result = self.query(lambda: loader.is_cancelled(self.request_id))
+            if not loader.is_cancelled(self.request_id):
+                loader.result_ready.emit(self.request_id, result)
+        except Exception as e:
+            if not loader.is_cancelled(self.request_id):
+                loader.query_failed.emit(self.request_id, str(e))
+        finally:
+            loader._finish(self.request_id)
+
+class ReportLoader(QObject):
+    """
+    Runs report queries on a worker pool. Each submit() gets a new request id and
+    supersedes every earlier request: queued ones are withdrawn, running ones see
+    their cancel flag and their results are never emitted.
+    """
+    result_ready = pyqtSignal(int, object)  # request_id, result
+    query_failed = pyqtSignal(int, str)  # request_id, error message
+    loading_changed = pyqtSignal(bool)  # True while any request is in flight
+
+    def __init__(self, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.latest_id = 0
+        self._in_flight = {}  # request_id: runnable
+
+    def submit(self, query):
+        """
+        Queue a query and return its request id.
+        Args:
+            query (callable): Called on a worker thread as query(is_cancelled); should
+                check is_cancelled() between expensive steps and return the result
+        """
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            self.latest_id = request_id
+            # Withdraw superseded requests that have not started yet
+            for old_id, runnable in list(self._in_flight.items()):
+                if self.pool.tryTake(runnable):
+                    del self._in_flight[old_id]
+            was_idle = not self._in_flight
+            runnable = _QueryRunnable(self, request_id, query)
+            self._in_flight[request_id] = runnable
+        if was_idle:
+            self.loading_changed.emit(True)
+        self.pool.start(runnable)
+        return request_id
+
+    def is_cancelled(self, request_id):
+        """A request is cancelled as soon as a newer one is submitted."""
+        return request_id != self.latest_id
+
+    def _finish(self, request_id):
+        with self._lock:
+            self._in_flight.pop(request_id, None)
+            idle = not self._in_flight
+        if idle:
+            self.loading_changed.emit(False)
+
+    def shutdown(self):
+        """Cancel everything and wait for running queries to return."""
+        with self._lock:
+            self.latest_id = -1
+        self.pool.clear()
+        self.pool.waitForDone()
\ No newline at end of file
@@ -0,0 +1,333 @@
+import hashlib
+import html
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from io import BytesIO
+from datetime import datetime as dt
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+
+REPORT_FORMATS = ("pdf", "txt", "html")
+
+PRIMARY_COLOR = colors.HexColor("#0969DA")
+ACCENT_COLOR = colors.HexColor("#2DA44E")
+BORDER_COLOR = colors.HexColor("#3A4546")
+ROW_COLOR = colors.HexColor("#E8F0FE")
+
+# Table styles are built once; per-report cell shading is appended to a copy of the command list
+USAGE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), ROW_COLOR),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, BORDER_COLOR),
+    ('BOX', (0, 0), (-1, -1), 1, PRIMARY_COLOR),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+HEATMAP_TABLE_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 6),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 0.25, BORDER_COLOR),
+]
+
+@lru_cache(maxsize=1)
+def report_styles():
+    """
+    Return the paragraph styles shared by every PDF report. Built once: adding the
+    custom styles to the same sheet a second time would raise.
+    """
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='Header', fontSize=16, leading=20, textColor=colors.white))
+    styles.add(ParagraphStyle(name='SubHeader', fontSize=12, leading=14, textColor=ACCENT_COLOR))
+    styles.add(ParagraphStyle(name='NormalBold', fontName='Helvetica-Bold', fontSize=10, leading=12))
+    styles.add(ParagraphStyle(name='Footer', fontSize=8, leading=10, textColor=colors.grey, alignment=1))
+    return styles
+
+def format_hms(seconds):
+    """Format seconds as "01h 05m 09s"."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}h {(seconds % 3600) // 60:02d}m {seconds % 60:02d}s"
+
+def page_decorator(on_page=None, generated=None):
+    """
+    Return the onPage callback drawing the report header and footer; on_page(page number) is called first.
+    generated is the footer timestamp, defaulting to now.
+    """
+    styles = report_styles()
+    generated = generated or dt.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def decorate_page(canvas, doc):
+        if on_page is not None:
+            on_page(canvas.getPageNumber())
+        canvas.saveState()
+        # Header: colored bar with the app name
+        canvas.setFillColor(PRIMARY_COLOR)
+        canvas.rect(0, doc.pagesize[1] - 0.75*inch, doc.pagesize[0], 0.75*inch, fill=1, stroke=0)
+        canvas.setFont('Helvetica-Bold', 18)
+        canvas.setFillColor(colors.white)
+        canvas.drawString(0.5*inch, doc.pagesize[1] - 0.5*inch, "Productivity Tracker Pro")
+        # Footer: tagline and page number
+        canvas.setFillColor(PRIMARY_COLOR)
+        canvas.rect(0, 0, doc.pagesize[0], 0.5*inch, fill=1, stroke=0)
+        text = f"Track Smarter, Work Better | Page {canvas.getPageNumber()} | Generated on {generated}"
+        footer_p = Paragraph(text, styles['Footer'])
+        footer_p.wrap(doc.pagesize[0] - 1*inch, 0.5*inch)
+        footer_p.drawOn(canvas, 0.5*inch, 0.25*inch)
+        canvas.restoreState()
+
+    return decorate_page
+
+def bar_chart(usage, max_bars=12):
+    """Bar chart of the top apps by time, with the rest folded into one "Other" bar."""
+    ranked = sorted(usage.items(), key=lambda x: x[1], reverse=True)
+    if len(ranked) > max_bars:
+        ranked = ranked[:max_bars - 1] + [("Other", sum(seconds for _, seconds in ranked[max_bars - 1:]))]
+    usage = dict(ranked)
+    drawing = Drawing(400, 200)
+    bc = VerticalBarChart()
+    bc.x = 50
+    bc.y = 20
+    bc.height = 150
+    bc.width = 300
+    bc.data = [list(usage.values())]
+    bc.bars.fillColor = PRIMARY_COLOR
+    bc.bars.strokeColor = BORDER_COLOR
+    bc.strokeColor = BORDER_COLOR
+    bc.valueAxis.valueMin = 0
+    bc.valueAxis.valueMax = max(usage.values()) * 1.2 or 1
+    bc.valueAxis.labels.fontName = 'Helvetica'
+    bc.valueAxis.labels.fontSize = 8
+    bc.categoryAxis.labels.fontName = 'Helvetica'
+    bc.categoryAxis.labels.fontSize = 8
+    bc.categoryAxis.labels.angle = 45
+    bc.categoryAxis.labels.boxAnchor = 'ne'
+    bc.categoryAxis.categoryNames = list(usage.keys())
+    bc.categoryAxis.labels.dx = -5
+    bc.categoryAxis.labels.dy = -5
+    drawing.add(bc)
+    return drawing
+
+def heatmap_table(rows):
+    """Build a category x hour table shaded by seconds of use, or None without data."""
+    if not rows:
+        return None
+    max_value = max(max(hours) for hours in rows.values()) or 1
+    data = [[""] + [f"{hour:02d}" for hour in range(24)]]
+    style = list(HEATMAP_TABLE_COMMANDS)
+    sorted_rows = sorted(rows.items(), key=lambda x: sum(x[1]), reverse=True)
+    for row_index, (label, hours) in enumerate(sorted_rows, start=1):
+        data.append([label.title()] + [f"{int(seconds // 60)}" if seconds else "" for seconds in hours])
+        for hour, seconds in enumerate(hours):
+            if seconds:
+                shade = colors.linearlyInterpolatedColor(ROW_COLOR, ACCENT_COLOR, 0, 1, seconds / max_value)
+                style.append(('BACKGROUND', (hour + 1, row_index), (hour + 1, row_index), shade))
+    table = Table(data, colWidths=[1.1*inch] + [0.26*inch] * 24)
+    table.setStyle(TableStyle(style))
+    return table
+
+class ReportData:
+    """Everything a report shows, aggregated once and rendered into any format."""
+
+    def __init__(self, start_date, end_date, usage, heatmap=None, focus_lines=None, filter_description=None,
+                 generated_at=None):
+        self.start_date = str(start_date)
+        self.end_date = str(end_date)
+        self.usage = dict(usage)  # app: seconds
+        self.heatmap = heatmap or {}  # category: [24 hourly seconds]
+        self.focus_lines = list(focus_lines or [])
+        self.filter_description = filter_description
+        self.generated_at = generated_at  # Fixed "Generated on" stamp; makes PDF output byte-for-byte reproducible
+        self._hash = None
+
+    @property
+    def total_seconds(self):
+        return sum(self.usage.values())
+
+    def sorted_usage(self):
+        return sorted(self.usage.items(), key=lambda x: x[1], reverse=True)
+
+    def content_hash(self):
+        """Stable hash of the aggregate; equal data renders to the same cached bytes."""
+        if self._hash is None:
+            payload = {
+                'period': [self.start_date, self.end_date],
+                'filter': self.filter_description,
+                'usage': sorted((app, round(seconds, 1)) for app, seconds in self.usage.items()),
+                'heatmap': sorted((label, [round(s, 1) for s in hours]) for label, hours in self.heatmap.items()),
+                'focus': self.focus_lines,
+                'generated_at': self.generated_at
+            }
+            self._hash = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+        return self._hash
+
+class ReportRenderer:
+    """Renders ReportData into PDF, TXT or HTML bytes, caching by content hash and format."""
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()  # (content hash, format): bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, report, report_format, progress=None):
+        """
+        Return the rendered report.
+        Args:
+            report (ReportData): The aggregate to render
+            report_format (str): "pdf", "txt" or "html"
+            progress (callable): Optional progress(fraction, message); may raise to abort
+        """
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format: {report_format}")
+        key = (report.content_hash(), report_format)
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = getattr(self, f"_render_{report_format}")(report, progress)
+        with self._lock:
+            self._cache[key] = data
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return data
+
+    def _report_progress(self, progress, fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+    def _render_pdf(self, report, progress):
+        styles = report_styles()
+        buffer = BytesIO()
+        # invariant fixes the PDF creation date and document id when the report carries its own timestamp
+        doc = SimpleDocTemplate(buffer, pagesize=letter,
+                                leftMargin=0.5*inch, rightMargin=0.5*inch,
+                                topMargin=1*inch, bottomMargin=0.75*inch,
+                                invariant=1 if report.generated_at else None)
+        decorate_page = page_decorator(lambda page: self._report_progress(progress, 0.8, f"Rendering page {page}"),
+                                       report.generated_at)
+
+        elements = [Paragraph(f"Report Period: {report.start_date} to {report.end_date}", styles['SubHeader'])]
+        if report.filter_description:
+            elements.append(Paragraph(f"Filter: {html.escape(report.filter_description)}", styles['Normal']))
+        elements.append(Spacer(1, 0.25*inch))
+        elements.append(Paragraph(f"Total Tracked Time: {format_hms(report.total_seconds)}", styles['SubHeader']))
+        elements.append(Spacer(1, 0.25*inch))
+
+        self._report_progress(progress, 0.3, "Building charts")
+        if report.usage:
+            elements.append(Paragraph("Usage Distribution", styles['SubHeader']))
+            elements.append(Spacer(1, 0.1*inch))
+            elements.append(bar_chart(report.usage))
+            elements.append(Spacer(1, 0.25*inch))
+            heatmap = heatmap_table(report.heatmap)
+            if heatmap is not None:
+                elements.append(Paragraph("Hourly Activity by Category", styles['SubHeader']))
+                elements.append(Spacer(1, 0.1*inch))
+                elements.append(heatmap)
+                elements.append(Spacer(1, 0.25*inch))
+
+        self._report_progress(progress, 0.5, "Building tables")
+        if not report.usage:
+            elements.append(Paragraph("No usage data available for this period.", styles['Normal']))
+        else:
+            data = [["Application", "Time Spent"]]
+            data.extend([app, format_hms(seconds)] for app, seconds in report.sorted_usage())
+            table = Table(data, colWidths=[3*inch, 2*inch])
+            table.setStyle(USAGE_TABLE_STYLE)
+            elements.append(Paragraph("Detailed Usage", styles['SubHeader']))
+            elements.append(Spacer(1, 0.1*inch))
+            elements.append(table)
+
+        elements.append(Spacer(1, 0.25*inch))
+        elements.append(Paragraph("Focus & Context Switching", styles['SubHeader']))
+        elements.append(Spacer(1, 0.1*inch))
+        for line in report.focus_lines:
+            elements.append(Paragraph(line, styles['Normal']))
+
+        doc.build(elements, onFirstPage=decorate_page, onLaterPages=decorate_page)
+        return buffer.getvalue()
+
+    def _render_txt(self, report, progress):
+        lines = [f"Time Tracking Report ({report.start_date} to {report.end_date})"]
+        if report.filter_description:
+            lines.append(f"Filter: {report.filter_description}")
+        lines.append("")
+        lines.append("Application\tTime Spent")
+        lines.append("")
+        lines.append(f"Total Tracked Time: {format_hms(report.total_seconds)}")
+        lines.extend(f"{app}\t{format_hms(seconds)}" for app, seconds in report.sorted_usage())
+        lines.append("")
+        lines.append("Focus & Context Switching")
+        lines.extend(report.focus_lines)
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _render_html(self, report, progress):
+        esc = html.escape
+        parts = [
+            "<!DOCTYPE html>",
+            "<html><head><meta charset=\"utf-8\">",
+            f"<title>Time Tracking Report {esc(report.start_date)} to {esc(report.end_date)}</title>",
+            "<style>body{font-family:Helvetica,Arial,sans-serif;color:#24292F}"
+            "h1{background:#0969DA;color:#fff;padding:12px}h2{color:#2DA44E}"
+            "table{border-collapse:collapse}td,th{border:1px solid #3A4546;padding:4px 8px;text-align:center}"
+            "th{background:#0969DA;color:#fff}.heat td{font-size:10px;padding:2px 4px}</style>",
+            "</head><body>",
+            "<h1>Productivity Tracker Pro</h1>",
+            f"<h2>Report Period: {esc(report.start_date)} to {esc(report.end_date)}</h2>",
+        ]
+        if report.filter_description:
+            parts.append(f"<p>Filter: {esc(report.filter_description)}</p>")
+        parts.append(f"<h2>Total Tracked Time: {format_hms(report.total_seconds)}</h2>")
+        if not report.usage:
+            parts.append("<p>No usage data available for this period.</p>")
+        else:
+            parts.append("<h2>Detailed Usage</h2><table><tr><th>Application</th><th>Time Spent</th></tr>")
+            parts.extend(f"<tr><td>{esc(app)}</td><td>{format_hms(seconds)}</td></tr>"
+                         for app, seconds in report.sorted_usage())
+            parts.append("</table>")
+        if report.heatmap:
+            max_value = max(max(hours) for hours in report.heatmap.values()) or 1
+            parts.append("<h2>Hourly Activity by Category</h2><table class=\"heat\"><tr><th></th>")
+            parts.extend(f"<th>{hour:02d}</th>" for hour in range(24))
+            parts.append("</tr>")
+            for label, hours in sorted(report.heatmap.items(), key=lambda x: sum(x[1]), reverse=True):
+                cells = []
+                for seconds in hours:
+                    if seconds:
+                        shade = colors.linearlyInterpolatedColor(ROW_COLOR, ACCENT_COLOR, 0, 1, seconds / max_value)
+                        cells.append(f"<td style=\"background:#{shade.hexval()[2:]}\">{int(seconds // 60)}</td>")
+                    else:
+                        cells.append("<td></td>")
+                parts.append(f"<tr><td>{esc(label.title())}</td>{''.join(cells)}</tr>")
+            parts.append("</table>")
+        parts.append("<h2>Focus &amp; Context Switching</h2>")
+        parts.extend(f"<p>{esc(line)}</p>" for line in report.focus_lines)
+        parts.append("</body></html>")
+        return "\n".join(parts).encode("utf-8")
+
+_renderer = ReportRenderer()
+
+def report_renderer():
+    """Return the renderer shared by exports and email, so both hit one cache."""
+    return _renderer
\ No newline at end of file
@@ -0,0 +1,83 @@
+import time
+_PROCESS_ORIGIN = time.perf_counter()  # Import this module first so the origin is close to interpreter start
+import os
+import sys
+_MODULES_AT_ORIGIN = len(sys.modules)
+from contextlib import contextmanager
+import psutil
+from PyQt5.QtCore import QObject, QEvent
+_OWN_IMPORT = (time.perf_counter() - _PROCESS_ORIGIN, len(sys.modules) - _MODULES_AT_ORIGIN)
+
+PROFILE_ENV = "TIMETRACKER_STARTUP_PROFILE"  # Set to print the timeline once the window has painted
+
+class _FirstPaintFilter(QObject):
+    def __init__(self, timeline, callback):
+        super().__init__()
+        self.timeline = timeline
+        self.callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            self.timeline.mark("first paint")
+            self.timeline.rss_bytes = psutil.Process().memory_info().rss
+            if self.callback is not None:
+                self.callback(self.timeline)
+        return False
+
+class StartupTimeline:
+    """Records import spans and milestones from process start to the window's first paint."""
+
+    def __init__(self):
+        self.origin = _PROCESS_ORIGIN
+        self.spans = [("import QtCore, psutil", *_OWN_IMPORT)]  # (label, seconds, modules loaded)
+        self.marks = []  # (label, seconds since origin)
+        self.rss_bytes = None  # Resident memory at first paint
+        self._paint_filter = None
+
+    @contextmanager
+    def span(self, label):
+        """Time a block (typically imports) and count the modules it pulled in."""
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((label, time.perf_counter() - start, len(sys.modules) - modules_before))
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.origin))
+
+    def watch_first_paint(self, widget, callback=None):
+        """
+        Mark "first paint" when the widget first paints, then call callback(timeline).
+        Without a callback the report is printed if TIMETRACKER_STARTUP_PROFILE is set.
+        """
+        if callback is None and os.environ.get(PROFILE_ENV):
+            callback = lambda timeline: print("\n".join(timeline.format_report()))
+        self._paint_filter = _FirstPaintFilter(self, callback)
+        widget.installEventFilter(self._paint_filter)
+
+    def summary(self):
+        return {
+            'spans': [{'label': label, 'seconds': seconds, 'modules': modules}
+                      for label, seconds, modules in self.spans],
+            'marks': [{'label': label, 'seconds': seconds} for label, seconds in self.marks],
+            'rss_bytes': self.rss_bytes
+        }
+
+    def format_report(self):
+        lines = ["Debug: Startup timeline"]
+        for label, seconds, modules in self.spans:
+            lines.append(f"Debug:   {label:<28} {seconds * 1000:8.1f} ms  ({modules} modules)")
+        for label, seconds in self.marks:
+            lines.append(f"Debug:   @ {label:<26} {seconds * 1000:8.1f} ms")
+        if self.rss_bytes is not None:
+            lines.append(f"Debug:   RSS at first paint {self.rss_bytes / (1024 * 1024):.1f} MB")
+        return lines
+
+_timeline = StartupTimeline()
+
+def startup_timeline():
+    """Return the process-wide startup timeline."""
+    return _timeline
\ No newline at end of file
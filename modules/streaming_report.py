@@ -0,0 +1,201 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from modules.focus_analytics import format_focus_summary
+from modules.usage_records import record_interval
+from modules.report_renderer import (
+    PRIMARY_COLOR, BORDER_COLOR, ROW_COLOR, USAGE_TABLE_STYLE,
+    report_styles, format_hms, page_decorator, bar_chart, heatmap_table
+)
+
+TABLE_CHUNK_ROWS = 200  # Rows per Table flowable; each chunk repeats the header when it splits
+FLOWABLE_BATCH = 64  # Flowables pulled from the generator per layout step
+DAY_CHART_BARS = 8
+
+DETAIL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, ROW_COLOR]),
+    ('GRID', (0, 0), (-1, -1), 0.25, BORDER_COLOR),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+])
+
+class StreamingDocTemplate(BaseDocTemplate):
+    """
+    Doc template that lays out flowables as a generator produces them, instead of
+    taking one list that holds the whole report. Only the current batch and the
+    finished pages' compressed content are held in memory.
+    """
+
+    def __init__(self, filename, on_page=None, **kw):
+        super().__init__(filename, **kw)
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
+        self.addPageTemplates([PageTemplate(id='Page', frames=frame, onPage=on_page or (lambda c, d: None),
+                                            pagesize=self.pagesize)])
+
+    def build_stream(self, flowables, batch_size=FLOWABLE_BATCH):
+        """Lay out an iterable of flowables batch by batch and write the document."""
+        self._startBuild()
+        canv = self.canv
+        canv._doctemplate = self
+        try:
+            batch = []
+            iterator = iter(flowables)
+            while True:
+                if not batch:
+                    for flowable in iterator:
+                        batch.append(flowable)
+                        if len(batch) >= batch_size:
+                            break
+                    if not batch:
+                        break
+                self.clean_hanging()
+                self.handle_flowable(batch)  # Consumes batch[0]; split remainders are put back in front
+        finally:
+            del canv._doctemplate
+        self._endBuild()
+
+class ChartCache:
+    """Small LRU of chart Drawings keyed by their plotted values, shared across sections and reports."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._charts = OrderedDict()  # ((app, minutes), ...): Drawing
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def bar_chart(self, usage, max_bars=DAY_CHART_BARS):
+        # Minute resolution: charts that would look identical share one Drawing
+        key = (max_bars,) + tuple(sorted((app, int(seconds // 60)) for app, seconds in usage.items()))
+        with self._lock:
+            drawing = self._charts.get(key)
+            if drawing is not None:
+                self._charts.move_to_end(key)
+                self.hits += 1
+                return drawing
+            self.misses += 1
+        drawing = bar_chart(usage, max_bars)
+        with self._lock:
+            self._charts[key] = drawing
+            while len(self._charts) > self.max_entries:
+                self._charts.popitem(last=False)
+        return drawing
+
+_chart_cache = ChartCache()
+
+def chunked_table(header, rows, col_widths, style=DETAIL_TABLE_STYLE, chunk_rows=TABLE_CHUNK_ROWS):
+    """Yield Tables of at most chunk_rows rows each, every one with the header row repeated on page splits."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield _detail_table(header, chunk, col_widths, style)
+            chunk = []
+    if chunk:
+        yield _detail_table(header, chunk, col_widths, style)
+
+def _detail_table(header, rows, col_widths, style):
+    table = Table([header] + rows, colWidths=col_widths, repeatRows=1)
+    table.setStyle(style)
+    return table
+
+class DailyDetailReport:
+    """
+    Range report with an overview followed by one section per day: the day's total,
+    a chart of its top apps, per-app totals and every session as a detail table.
+    Sections are generated from the store one day at a time, so peak memory is
+    bounded by a single day rather than the range.
+    """
+
+    def __init__(self, log_manager, start_date, end_date, usage_filter=None, chart_cache=None):
+        self.log_manager = log_manager
+        self.store = log_manager.store
+        self.start_date = start_date
+        self.end_date = end_date
+        self.usage_filter = usage_filter
+        self.chart_cache = chart_cache or _chart_cache
+
+    def write(self, filename, progress=None):
+        """Render the report to filename (a path or binary file object)."""
+        on_page = page_decorator()
+        doc = StreamingDocTemplate(filename, on_page=on_page, pagesize=letter,
+                                   leftMargin=0.5*inch, rightMargin=0.5*inch,
+                                   topMargin=1*inch, bottomMargin=0.75*inch)
+        doc.build_stream(self.flowables(progress))
+
+    def _report_progress(self, progress, fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+    def flowables(self, progress=None):
+        """Yield the report's flowables in order."""
+        styles = report_styles()
+        self._report_progress(progress, 0.05, "Aggregating usage")
+        usage = self.log_manager.aggregate_usage(self.start_date, self.end_date, self.usage_filter)
+        yield Paragraph(f"Report Period: {self.start_date} to {self.end_date}", styles['SubHeader'])
+        if self.usage_filter is not None:
+            yield Paragraph(f"Filter: {self.usage_filter.describe()}", styles['Normal'])
+        yield Spacer(1, 0.25*inch)
+        yield Paragraph(f"Total Tracked Time: {format_hms(sum(usage.values()))}", styles['SubHeader'])
+        yield Spacer(1, 0.25*inch)
+        if usage:
+            yield Paragraph("Usage Distribution", styles['SubHeader'])
+            yield self.chart_cache.bar_chart(usage, max_bars=12)
+            heatmap = heatmap_table(self.log_manager.usage_heatmap(
+                self.start_date, self.end_date, "category", self.usage_filter))
+            if heatmap is not None:
+                yield Paragraph("Hourly Activity by Category", styles['SubHeader'])
+                yield Spacer(1, 0.1*inch)
+                yield heatmap
+            yield Spacer(1, 0.25*inch)
+            yield Paragraph("Usage by Application", styles['SubHeader'])
+            yield Spacer(1, 0.1*inch)
+            total = sum(usage.values()) or 1
+            rows = ([app, format_hms(seconds), f"{seconds / total:.1%}"]
+                    for app, seconds in sorted(usage.items(), key=lambda x: x[1], reverse=True))
+            yield from chunked_table(["Application", "Time Spent", "Share"], rows,
+                                     [3*inch, 2*inch, 1*inch], USAGE_TABLE_STYLE)
+        self._report_progress(progress, 0.1, "Computing focus metrics")
+        yield Spacer(1, 0.25*inch)
+        yield Paragraph("Focus & Context Switching", styles['SubHeader'])
+        for line in format_focus_summary(self.log_manager.focus_metrics(self.start_date, self.end_date, self.usage_filter)):
+            yield Paragraph(line, styles['Normal'])
+
+        days = self.store.stamped_days(self.start_date, self.end_date)  # The days _day_section() scans by
+        for index, day in enumerate(days):
+            self._report_progress(progress, 0.1 + 0.85 * index / len(days), f"Rendering {day}")
+            yield from self._day_section(day, styles)
+
+    def _day_section(self, day, styles):
+        # First pass: the day's per-app totals (seeks to this day's lines only)
+        totals = {}
+        for record in self.store.scan(day, day, self.usage_filter):
+            totals[record.app] = totals.get(record.app, 0) + record.duration
+        if not totals:
+            return
+        weekday = date.fromisoformat(day).strftime("%A")
+        yield PageBreak()
+        yield Paragraph(f"{weekday}, {day} - {format_hms(sum(totals.values()))}", styles['SubHeader'])
+        yield Spacer(1, 0.1*inch)
+        yield self.chart_cache.bar_chart(totals)
+        app_rows = ([app, format_hms(seconds)] for app, seconds in sorted(totals.items(), key=lambda x: x[1], reverse=True))
+        yield from chunked_table(["Application", "Time Spent"], app_rows, [3*inch, 2*inch], USAGE_TABLE_STYLE)
+        yield Spacer(1, 0.2*inch)
+        yield Paragraph("Sessions", styles['NormalBold'])
+        yield Spacer(1, 0.05*inch)
+        # Second pass: sessions stream straight into fixed-size table chunks
+        yield from chunked_table(["Start", "End", "Application", "Duration"],
+                                 self._session_rows(day), [1.2*inch, 1.2*inch, 3*inch, 1.5*inch])
+
+    def _session_rows(self, day):
+        for record in self.store.scan(day, day, self.usage_filter):
+            start, end = record_interval(record)
+            yield [start.strftime("%H:%M:%S"), end.strftime("%H:%M:%S"), record.app, format_hms(record.duration)]
\ No newline at end of file
@@ -0,0 +1,110 @@
+import json
+import os
+import socket
+import tempfile
+
+PROTOCOL_VERSION = 1
+
+class TrackerUnavailable(Exception):
+    """The tracker daemon is not running or stopped answering."""
+
+def default_socket_path():
+    """Per-user socket path, overridable with TIMETRACKER_SOCKET."""
+    override = os.environ.get("TIMETRACKER_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(runtime_dir, f"timetracker-{user}.sock")
+
+class Subscription:
+    """Iterator over the daemon's per-tick delta messages; close() ends it from any thread."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._reader = sock.makefile("r", encoding="utf-8")
+
+    def __iter__(self):
+        try:
+            for line in self._reader:
+                yield json.loads(line)
+        except (OSError, ValueError) as e:
+            raise TrackerUnavailable(f"Lost connection to the tracker daemon: {e}")
+        raise TrackerUnavailable("The tracker daemon closed the connection")
+
+    def close(self):
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+class TrackerClient:
+    """
+    Client for the tracker daemon's Unix-socket API (newline-delimited JSON).
+    Each request opens a short connection; subscribe() keeps one open for live updates.
+    """
+
+    def __init__(self, socket_path=None, timeout=2.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def _connect(self, timeout):
+        if not hasattr(socket, "AF_UNIX"):
+            raise TrackerUnavailable("Unix sockets are not available on this platform")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise TrackerUnavailable(f"Tracker daemon not reachable at {self.socket_path}: {e}")
+        return sock
+
+    def request(self, cmd, **params):
+        """Send one command and return the daemon's reply as a dict."""
+        sock = self._connect(self.timeout)
+        try:
+            sock.sendall((json.dumps(dict(params, cmd=cmd)) + "\n").encode("utf-8"))
+            line = sock.makefile("r", encoding="utf-8").readline()
+        except OSError as e:
+            raise TrackerUnavailable(f"Tracker daemon did not answer: {e}")
+        finally:
+            sock.close()
+        if not line:
+            raise TrackerUnavailable("Tracker daemon closed the connection")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise ValueError(reply.get('error', "Tracker daemon rejected the request"))
+        return reply
+
+    def available(self):
+        try:
+            return self.request("ping").get('version') == PROTOCOL_VERSION
+        except (TrackerUnavailable, ValueError):
+            return False
+
+    def stats(self):
+        """Tracking state, open sessions, this run's per-app durations and today's totals."""
+        return self.request("stats")
+
+    def deltas(self, since=0):
+        """App start/stop events after sequence number `since`, plus the current state."""
+        return self.request("deltas", since=since)
+
+    def start_tracking(self):
+        return self.request("start")
+
+    def stop_tracking(self):
+        return self.request("stop")
+
+    def subscribe(self, since=0):
+        """Return a Subscription yielding one delta message per tracker tick."""
+        sock = self._connect(self.timeout)
+        try:
+            sock.sendall((json.dumps({'cmd': "subscribe", 'since': since}) + "\n").encode("utf-8"))
+        except OSError as e:
+            sock.close()
+            raise TrackerUnavailable(f"Tracker daemon did not answer: {e}")
+        sock.settimeout(None)  # Ticks arrive every interval; closing the subscription ends the read
+        return Subscription(sock)
\ No newline at end of file
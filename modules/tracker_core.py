@@ -0,0 +1,247 @@
+import os
+import time
+from datetime import datetime
+import psutil
+from modules.usage_store import get_store
+from modules.app_categories import all_keywords
+from modules.activity_timeline import ActivityRingBuffer
+
+class TrackerCore:
+    """
+    Tracking state and logic without Qt: process detection, per-app timing and storage.
+    ActivityTracker runs it on a QThread for the GUI; the headless tools use it directly.
+    """
+
+    def __init__(self, storage_file="usage_data.txt"):
+        self.tracking_enabled = False
+        self.app_durations = {}  # Track total duration for each app
+        self.app_start_times = {}  # Track when each app was last activated
+        self.last_check = None
+        self.storage_file = storage_file
+        self.store = get_store(self.storage_file)
+        self.timeline = ActivityRingBuffer()  # Last 15 minutes of per-tick app presence
+        
+        # Define the apps we want to track by default (grouped by category in app_categories)
+        self.tracked_apps = all_keywords()
+
+    def set_tracked_apps(self, apps=None):
+        """Set specific apps to track, or None to use default tracked apps"""
+        if apps is None:
+            # Use default tracked apps
+            return
+        else:
+            # Update with custom apps to track
+            self.tracked_apps = {app.lower() for app in apps}
+
+    def should_track_app(self, app_name):
+        """Check if an app should be tracked based on our criteria"""
+        app_lower = app_name.lower()
+        
+        # Skip system processes
+        system_processes = {'system', 'idle', 'svchost', 'kernel', 'runtimebroker'}
+        if app_lower in system_processes:
+            return False
+            
+        # Check if this is one of our tracked apps
+        for tracked_app in self.tracked_apps:
+            if tracked_app in app_lower:
+                return True
+                
+        return False
+
+    def get_running_apps(self):
+        """Get running applications, filtering for only tracked apps and those using more than 50MB memory"""
+        apps = {}
+        MEMORY_THRESHOLD = 50 * 1024 * 1024  # 50 MB in bytes
+        try:
+            for proc in psutil.process_iter(['pid', 'name', 'exe', 'memory_info']):
+                try:
+                    info = proc.info
+                    # Get memory usage
+                    memory_usage = info['memory_info'].rss  # Resident Set Size in bytes
+                    # Try to get the executable name first
+                    exe_name = os.path.basename(info['exe']).lower() if info.get('exe') else None
+                    proc_name = info['name'].lower()
+                    
+                    # Use the most meaningful name available
+                    app_name = exe_name or proc_name
+                    app_name = os.path.splitext(app_name)[0]  # Remove extension
+                    
+                    print(f"Debug: Process found: {app_name} (PID: {info['pid']}, Memory: {memory_usage / (1024 * 1024):.2f} MB)")
+                    
+                    # Check if we should track this app based on name
+                    if self.should_track_app(app_name):
+                        # Check memory usage
+                        if memory_usage > MEMORY_THRESHOLD:
+                            # Standardize app names for consistency
+                            standardized_name = self.standardize_app_name(app_name)
+                            apps[standardized_name] = info['pid']
+                            print(f"Debug: Tracked app: {standardized_name} (PID: {info['pid']}, Memory: {memory_usage / (1024 * 1024):.2f} MB)")
+                        else:
+                            print(f"Debug: Skipped app due to low memory: {app_name} (Memory: {memory_usage / (1024 * 1024):.2f} MB)")
+                            
+                except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                    print(f"Debug: Skipped process due to {type(e).__name__}: {e}")
+                    continue
+                except Exception as e:
+                    print(f"Debug: Unexpected error with process: {e}")
+                    continue
+                    
+        except Exception as e:
+            print(f"Error getting running apps: {e}")
+            
+        if not apps:
+            print("Debug: No tracked applications detected (above 50MB memory threshold)")
+        else:
+            print(f"Debug: Total tracked apps detected (above 50MB): {len(apps)}")
+        return apps
+
+    def standardize_app_name(self, app_name):
+        """Convert similar app names to a standard format"""
+        app_lower = app_name.lower()
+        
+        # Code Editors/IDEs
+        if 'code' in app_lower or 'vscode' in app_lower:
+            return 'VS Code'
+        elif 'visual studio' in app_lower and 'code' not in app_lower:
+            return 'Visual Studio'
+        elif 'android studio' in app_lower or 'studio' in app_lower or 'android-studio' in app_lower:
+            return 'Android Studio'
+        elif 'pycharm' in app_lower:
+            return 'PyCharm'
+        elif 'sublime' in app_lower:
+            return 'Sublime Text'
+        elif 'intellij' in app_lower:
+            return 'IntelliJ IDEA'
+        elif 'cursor' in app_lower:
+            return 'Cursor'
+            
+        # Browsers
+        elif 'chrome' in app_lower:
+            return 'Chrome'
+        elif 'firefox' in app_lower:
+            return 'Firefox'
+        elif 'edge' in app_lower:
+            return 'Edge'
+        elif 'safari' in app_lower:
+            return 'Safari'
+        elif 'opera' in app_lower:
+            return 'Opera'
+        elif 'brave' in app_lower:
+            return 'Brave'
+            
+        # Design Tools
+        elif 'photoshop' in app_lower:
+            return 'Photoshop'
+        elif 'illustrator' in app_lower:
+            return 'Illustrator'
+        elif 'figma' in app_lower:
+            return 'Figma'
+        elif 'xd' in app_lower:
+            return 'Adobe XD'
+            
+        # Development Tools
+        elif 'docker' in app_lower:
+            return 'Docker'
+        elif 'postman' in app_lower:
+            return 'Postman'
+            
+        # Default case - return original name but cleaned up
+        return app_name.title()
+
+    def store_app_usage(self, timestamp, app_name, duration):
+        """Store the app usage in a text file when it closes"""
+        try:
+            self.store.append_row(timestamp, app_name, f"{duration:.1f}")
+            print(f"Debug: Stored usage for {app_name}: {duration:.1f}s at {timestamp}")
+        except Exception as e:
+            print(f"Error storing app usage: {e}")
+
+    def read_app_usage(self, date_str):
+        """Read stored app usage for a specific date, return aggregated durations"""
+        aggregated_durations = {}
+        try:
+            aggregated_durations = self.store.app_totals(date_str, date_str)
+            print(f"Debug: Read usage for {date_str}: {aggregated_durations} (cache: {self.store.cache.stats()})")
+        except Exception as e:
+            print(f"Error reading app usage: {e}")
+        return aggregated_durations
+
+    def poll(self, current_time=None, running_apps=None):
+        """
+        Run one tracking tick and return the app changes as (timestamp, app_name, is_active).
+        Closed apps have their session stored; running apps accumulate time.
+        """
+        if not self.tracking_enabled:
+            return []
+        current_time = current_time if current_time is not None else time.time()
+        if self.last_check is None:
+            self.last_check = current_time
+
+        # Get currently running apps
+        if running_apps is None:
+            running_apps = self.get_running_apps()
+        timestamp = datetime.fromtimestamp(current_time).strftime("%Y-%m-%d %H:%M:%S")
+        events = []
+
+        # 1. Check for apps that have closed
+        for app in list(self.app_start_times.keys()):
+            if app not in running_apps:
+                # App has closed - record its duration
+                duration = current_time - self.app_start_times[app]
+                self.app_durations[app] = self.app_durations.get(app, 0) + duration
+                # Store the usage in the text file
+                self.store_app_usage(timestamp, app, duration)
+                del self.app_start_times[app]
+                events.append((timestamp, app, False))
+                print(f"Debug: App closed: {app} (Duration: {duration:.1f}s)")
+
+        # 2. Check for new or continuing apps
+        for app in running_apps:
+            if app not in self.app_start_times:
+                # New app detected
+                self.app_start_times[app] = current_time
+                events.append((timestamp, app, True))
+                print(f"Debug: New app detected: {app}")
+            else:
+                # App is still running - accumulate time
+                elapsed = current_time - self.last_check
+                self.app_durations[app] = self.app_durations.get(app, 0) + elapsed
+
+        self.timeline.append(running_apps)
+        self.last_check = current_time
+        return events
+
+    def set_tracking(self, enable):
+        """Start or stop tracking; stopping stores every open session and returns their close events."""
+        self.tracking_enabled = enable
+        events = []
+        if enable:
+            print("Debug: Tracking started")
+            self.last_check = time.time()  # Reset timing reference
+        else:
+            print("Debug: Tracking stopped")
+            # Final update for all running apps
+            current_time = time.time()
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for app, start_time in self.app_start_times.items():
+                duration = current_time - start_time
+                self.app_durations[app] = self.app_durations.get(app, 0) + duration
+                # Store the usage in the text file
+                self.store_app_usage(timestamp, app, duration)
+                events.append((timestamp, app, False))
+            self.app_start_times.clear()
+        return events
+
+    def get_current_stats(self):
+        """Get current tracking statistics"""
+        return {
+            'durations': self.app_durations.copy(),
+            'active_apps': self.app_start_times.copy(),
+            'is_tracking': self.tracking_enabled
+        }
+
+    def reset_stats(self):
+        """Reset all tracking statistics"""
+        self.app_durations.clear()
+        self.app_start_times.clear()
\ No newline at end of file
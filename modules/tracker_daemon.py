@@ -0,0 +1,242 @@
+"""
+Headless tracker: runs the tracking loop without Qt and serves live stats over a Unix socket.
+
+    python -m modules.tracker_daemon [--socket PATH] [--log-file usage_data.txt] [--interval 1] [--paused]
+
+Clients (the GUI, python -m modules.cli status) attach and detach without
+affecting tracking. The protocol is one JSON object per line; each request gets
+one reply line, except "subscribe", which streams a delta message every tick:
+
+    {"cmd": "ping"}                 -> {"ok": true, "version": 1, "pid": ...}
+    {"cmd": "stats"}                -> tracking state, open sessions, durations, today's totals
+    {"cmd": "deltas", "since": N}   -> events after sequence N plus the current state
+    {"cmd": "start"} / {"cmd": "stop"}
+    {"cmd": "subscribe", "since": N}
+
+Events are [seq, timestamp, app, is_active]. When N is older than the retained
+events the reply has "reset": true and the client should take the state as is.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime as dt
+from modules.log_manager import LogManager
+from modules.tracker_core import TrackerCore
+from modules.tracker_client import PROTOCOL_VERSION, TrackerClient, default_socket_path
+
+EVENT_HISTORY = 1000  # App start/stop events kept for "deltas"
+
+class TrackerDaemon:
+    """
+    Drives a TrackerCore on its own thread and keeps the state clients ask for.
+    Session rows and the Session Started/Ended markers are written here, as the
+    GUI does when it tracks in-process.
+    """
+
+    def __init__(self, core, logger, interval=1.0):
+        self.core = core
+        self.logger = logger
+        self.interval = interval
+        self.seq = 0  # Sequence number of the newest event
+        self.ticks = 0
+        self._events = deque(maxlen=EVENT_HISTORY)
+        self._changed = threading.Condition()
+        self.stopping = False
+        self.stop_requested = False  # Set from signal handlers; run() does the actual stop
+        self.started_at = time.time()
+
+    def _record_events(self, events):
+        for timestamp, app, is_active in events:
+            self.seq += 1
+            self._events.append((self.seq, timestamp, app, is_active))
+            if is_active:
+                self.logger.log_activity(timestamp, app)
+
+    def tick(self):
+        with self._changed:
+            self._record_events(self.core.poll())
+            self.ticks += 1
+            self._changed.notify_all()
+
+    def set_tracking(self, enable):
+        with self._changed:
+            if enable == self.core.tracking_enabled:
+                return
+            timestamp = dt.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._record_events(self.core.set_tracking(enable))
+            if enable:
+                self.logger.log_activity(timestamp, "Session Started")
+            else:
+                self.logger.end_current_session()
+                self.logger.log_activity(timestamp, "Session Ended")
+            self.ticks += 1
+            self._changed.notify_all()
+
+    def _state(self):
+        return {
+            'ok': True,
+            'tracking': self.core.tracking_enabled,
+            'active_apps': self.core.app_start_times.copy(),
+            'durations': self.core.app_durations.copy(),
+            'seq': self.seq,
+            'ticks': self.ticks
+        }
+
+    def stats(self):
+        with self._changed:
+            state = self._state()
+            now = time.time()
+        # Stored totals for today plus the time of sessions that are still open
+        today = dt.now().strftime("%Y-%m-%d")
+        totals = self.core.read_app_usage(today)
+        for app, started in state['active_apps'].items():
+            totals[app] = totals.get(app, 0) + now - started
+        state.update(today={app: round(seconds, 1) for app, seconds in totals.items()},
+                     started_at=self.started_at, pid=os.getpid())
+        return state
+
+    def deltas(self, since):
+        with self._changed:
+            state = self._state()
+            oldest = self._events[0][0] if self._events else self.seq + 1
+            state['reset'] = since < oldest - 1
+            state['events'] = [list(event) for event in self._events if event[0] > since]
+            return state
+
+    def wait_for_tick(self, seen_ticks, timeout):
+        """Block until a tick newer than seen_ticks (or the timeout); returns the current tick count."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.ticks > seen_ticks or self.stopping, timeout)
+            return self.ticks
+
+    def handle(self, request):
+        cmd = request.get('cmd')
+        if cmd == "ping":
+            return {'ok': True, 'version': PROTOCOL_VERSION, 'pid': os.getpid()}
+        if cmd == "stats":
+            return self.stats()
+        if cmd == "deltas":
+            return self.deltas(int(request.get('since', 0)))
+        if cmd in ("start", "stop"):
+            self.set_tracking(cmd == "start")
+            return self.stats()
+        return {'ok': False, 'error': f"Unknown command: {cmd}"}
+
+    def run(self):
+        """Tracking loop; returns after request_stop() or stop(), with open sessions stored."""
+        try:
+            while not self.stop_requested and not self.stopping:
+                started = time.time()
+                try:
+                    if self.core.tracking_enabled:
+                        self.tick()
+                except Exception as e:
+                    print(f"Error in tracking loop: {e}")
+                time.sleep(max(self.interval - (time.time() - started), 0.05))
+        finally:
+            self.stop()
+
+    def request_stop(self):
+        """
+        Ask run() to stop after the current tick. Only sets a flag, so it is safe in a
+        signal handler that may interrupt the loop in the middle of a poll or append.
+        """
+        self.stop_requested = True
+
+    def stop(self):
+        """Close open sessions so their time is stored, then end the loop and subscriptions."""
+        self.set_tracking(False)
+        with self._changed:
+            self.stopping = True
+            self._changed.notify_all()
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def _send(self, payload):
+        self.wfile.write((json.dumps(payload) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        daemon = self.server.tracker_daemon
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get('cmd') == "subscribe":
+                    self._stream(daemon, int(request.get('since', 0)))
+                    return
+                self._send(daemon.handle(request))
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                self._send({'ok': False, 'error': str(e)})
+
+    def _stream(self, daemon, since):
+        seen_ticks = -1
+        while not daemon.stopping:
+            seen_ticks = daemon.wait_for_tick(seen_ticks, timeout=30)
+            message = daemon.deltas(since)
+            since = message['seq']
+            self._send(message)  # Raises once the client has gone
+
+class TrackerSocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, daemon):
+        self.tracker_daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)  # Usage data is private to the user
+
+def claim_socket_path(socket_path):
+    """Remove a stale socket file; refuse if a daemon is already answering on it."""
+    if not os.path.exists(socket_path):
+        return
+    if TrackerClient(socket_path).available():
+        raise RuntimeError(f"A tracker daemon is already running on {socket_path}")
+    os.remove(socket_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless activity tracker with a local socket API")
+    parser.add_argument("--socket", default=None, help="Unix socket path (default: per-user runtime dir)")
+    parser.add_argument("--log-file", default="usage_data.txt")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between process scans")
+    parser.add_argument("--paused", action="store_true", help="Start without tracking until a client sends start")
+    args = parser.parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        parser.error("Unix sockets are not available on this platform")
+
+    socket_path = args.socket or default_socket_path()
+    try:
+        claim_socket_path(socket_path)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    daemon = TrackerDaemon(TrackerCore(args.log_file), LogManager(args.log_file), args.interval)
+    server = TrackerSocketServer(socket_path, daemon)
+    threading.Thread(target=server.serve_forever, name="tracker-socket", daemon=True).start()
+
+    def shutdown(signum, frame):
+        daemon.request_stop()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"Debug: Tracker daemon {os.getpid()} listening on {socket_path}")
+    if not args.paused:
+        daemon.set_tracking(True)
+    try:
+        daemon.run()
+    finally:
+        server.shutdown()
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        print("Debug: Tracker daemon stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
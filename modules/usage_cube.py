@@ -0,0 +1,124 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import timedelta
+from modules.app_categories import category_for
+from modules.usage_records import day_key, record_interval
+
+HOURS = 24
+
+class UsageCube:
+    """
+    Seconds of usage indexed by (day, app id, hour of day); category is derived from the app.
+    A cube can be limited to some months ("YYYY-MM"), and is checkpointed one month at a time.
+    """
+
+    def __init__(self, months=None):
+        self.app_ids = {}  # app name: app id
+        self.app_names = []  # app id: app name
+        self.app_categories = []  # app id: category
+        self._cells = {}  # day: {app id: array of 24 hourly seconds}
+        self._days = []  # Sorted day keys, for range slicing
+        self.months = months  # Months this cube holds, or None for all
+        self.frozen_months = set()  # Months whose additions are skipped (used while replaying rows)
+        self.dirty_months = set()  # Months changed since the last checkpoint
+
+    def month_state(self, month):
+        """Plain JSON-able state of one month, for store checkpoints."""
+        lo = bisect_left(self._days, month)
+        hi = bisect_left(self._days, month + "-32")
+        return {day: {self.app_names[app_id]: list(hours) for app_id, hours in self._cells[day].items()}
+                for day in self._days[lo:hi]}
+
+    def months_with_data(self):
+        return sorted({day[:7] for day in self._days})
+
+    @classmethod
+    def from_month_states(cls, states, months=None):
+        """Build a cube from month_state() results, limited to `months` when given."""
+        cube = cls(months)
+        for month in sorted(states):
+            for day, day_cells in sorted(states[month].items()):
+                cube._days.append(day)
+                cube._cells[day] = {cube._app_id(app_name): array('d', hours) for app_name, hours in day_cells.items()}
+        return cube
+
+    def _app_id(self, app_name):
+        app_id = self.app_ids.get(app_name)
+        if app_id is None:
+            app_id = len(self.app_names)
+            self.app_ids[app_name] = app_id
+            self.app_names.append(app_name)
+            self.app_categories.append(category_for(app_name))
+        return app_id
+
+    def _hours(self, day, app_id):
+        day_cells = self._cells.get(day)
+        if day_cells is None:
+            day_cells = self._cells[day] = {}
+            insort(self._days, day)
+        hours = day_cells.get(app_id)
+        if hours is None:
+            hours = day_cells[app_id] = array('d', bytes(8 * HOURS))
+        return hours
+
+    def add_record(self, record):
+        """Store-view hook: add one closed interval."""
+        start, end = record_interval(record)
+        self.add_interval(record.app, start, end)
+
+    def add_interval(self, app_name, start, end):
+        """Add the seconds between two datetimes, split at every hour (and day) boundary."""
+        app_id = self._app_id(app_name)
+        current = start
+        while current < end:
+            next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            chunk_end = min(next_hour, end)
+            day = current.date().isoformat()
+            month = day[:7]
+            if (self.months is None or month in self.months) and month not in self.frozen_months:
+                self._hours(day, app_id)[current.hour] += (chunk_end - current).total_seconds()
+                self.dirty_months.add(month)
+            current = chunk_end
+
+    def _days_in_range(self, start_date, end_date):
+        lo = bisect_left(self._days, day_key(start_date)) if start_date else 0
+        hi = bisect_right(self._days, day_key(end_date)) if end_date else len(self._days)
+        return self._days[lo:hi]
+
+    def heatmap(self, start_date, end_date, by="app", usage_filter=None):
+        """
+        Sum hourly seconds over a date range.
+        Args:
+            start_date (date): First day, or None for the beginning of history
+            end_date (date): Last day, or None for the end of history
+            by (str): "app" or "category" rows
+            usage_filter (UsageFilter): Optional filter; the time window is applied per whole hour
+        Returns:
+            dict: row label -> list of 24 hourly seconds
+        """
+        hour_range = range(HOURS)
+        if usage_filter is not None:
+            hour_range = [hour for hour in hour_range if usage_filter.matches_time(f"{hour:02d}:00:00")]
+        rows = {}
+        for day in self._days_in_range(start_date, end_date):
+            if usage_filter is not None and not usage_filter.matches_day(day):
+                continue
+            for app_id, hours in self._cells[day].items():
+                if usage_filter is not None and not usage_filter.matches_app(self.app_names[app_id]):
+                    continue
+                label = self.app_names[app_id] if by == "app" else self.app_categories[app_id]
+                row = rows.get(label)
+                if row is None:
+                    row = rows[label] = [0.0] * HOURS
+                for hour in hour_range:
+                    row[hour] += hours[hour]
+        return rows
+
+    def category_totals(self, start_date, end_date):
+        """Return {category: seconds} over a date range."""
+        return {label: sum(row) for label, row in self.heatmap(start_date, end_date, by="category").items()}
+
+    def day_totals(self, start_date, end_date):
+        """Return {day: seconds} over a date range, only for days with data."""
+        return {day: sum(sum(hours) for hours in self._cells[day].values())
+                for day in self._days_in_range(start_date, end_date)}
\ No newline at end of file
@@ -0,0 +1,142 @@
+from datetime import date, datetime, timedelta
+from modules.app_index import canonical_app_name
+from modules.app_categories import category_for
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+ALL_WEEKDAYS = 0b1111111
+
+def _normalize_time(value):
+    """Turn "9", "9:30" or "09:30:00" into "HH:MM:SS" so times compare as strings."""
+    parts = [int(part) for part in str(value).split(':')]
+    parts += [0] * (3 - len(parts))
+    return "%02d:%02d:%02d" % tuple(parts[:3])
+
+def _time_offset(time_str):
+    """Turn "HH:MM:SS" into the timedelta since midnight."""
+    hours, minutes, seconds = (int(part) for part in time_str.split(':'))
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+class UsageFilter:
+    """
+    Record filter pushed down into the usage file scan.
+    Args:
+        apps (iterable): App names to keep (matched case-insensitively), or None for all
+        categories (iterable): Categories from app_categories to keep, or None for all
+        time_window (tuple): ("09:00", "17:00") time-of-day window, may wrap past midnight
+        weekdays (iterable): Weekday numbers to keep, Monday = 0
+    """
+
+    def __init__(self, apps=None, categories=None, time_window=None, weekdays=None):
+        self.apps = frozenset(canonical_app_name(app) for app in apps) if apps else None
+        self.categories = frozenset(c.lower() for c in categories) if categories else None
+        self.time_window = None
+        if time_window:
+            self.time_window = (_normalize_time(time_window[0]), _normalize_time(time_window[1]))
+        self.weekday_mask = ALL_WEEKDAYS
+        if weekdays is not None:
+            self.weekday_mask = 0
+            for weekday in weekdays:
+                self.weekday_mask |= 1 << weekday
+        self._day_cache = {}
+        self._app_cache = {}
+
+    @classmethod
+    def from_options(cls, apps=None, categories=None, hours=None, weekdays=None):
+        """
+        Build a filter from text options as the CLI and HTTP API take them, or None when none is set.
+        Args:
+            hours (str): "09:00-17:00"
+            weekdays (str): Comma-separated names, e.g. "Mon,Tue"
+        Raises ValueError for an unknown weekday.
+        """
+        time_window = tuple(hours.split("-", 1)) if hours else None
+        weekday_numbers = None
+        if weekdays:
+            names = [name.strip().title()[:3] for name in weekdays.split(",")]
+            unknown = [name for name in names if name not in WEEKDAY_NAMES]
+            if unknown:
+                raise ValueError(f"Unknown weekday: {', '.join(unknown)}")
+            weekday_numbers = [WEEKDAY_NAMES.index(name) for name in names]
+        if not (apps or categories or time_window or weekday_numbers is not None):
+            return None
+        return cls(apps, categories, time_window, weekday_numbers)
+
+    def _key(self):
+        return (self.apps, self.categories, self.time_window, self.weekday_mask)
+
+    def __eq__(self, other):
+        return isinstance(other, UsageFilter) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"UsageFilter({self.describe()})"
+
+    @property
+    def filters_apps(self):
+        return self.apps is not None or self.categories is not None
+
+    def matches_day(self, day):
+        """Check the weekday mask for a "YYYY-MM-DD" day key (memoized per day)."""
+        if self.weekday_mask == ALL_WEEKDAYS:
+            return True
+        result = self._day_cache.get(day)
+        if result is None:
+            result = bool(self.weekday_mask & (1 << date.fromisoformat(day).weekday()))
+            self._day_cache[day] = result
+        return result
+
+    def matches_time(self, time_str):
+        """Check an "HH:MM:SS" time against the time-of-day window."""
+        if self.time_window is None:
+            return True
+        start, end = self.time_window
+        if start <= end:
+            return start <= time_str < end
+        return time_str >= start or time_str < end  # Window wraps past midnight
+
+    def clip_to_window(self, start, end):
+        """Return the [start, end) datetimes as the (start, end) pieces inside the time-of-day window."""
+        if self.time_window is None:
+            return [(start, end)] if start < end else []
+        window_start, window_end = (_time_offset(value) for value in self.time_window)
+        if window_end < window_start:
+            window_end += timedelta(days=1)  # Wraps past midnight into the next day
+        pieces = []
+        day = datetime.combine(start.date(), datetime.min.time()) - timedelta(days=1)  # A wrapped window may start the day before
+        while day < end:
+            piece = (max(start, day + window_start), min(end, day + window_end))
+            if piece[0] < piece[1]:
+                pieces.append(piece)
+            day += timedelta(days=1)
+        return pieces
+
+    def seconds_in_window(self, start, end):
+        """Return how many seconds of the [start, end) datetimes fall inside the time-of-day window."""
+        return sum((piece_end - piece_start).total_seconds() for piece_start, piece_end in self.clip_to_window(start, end))
+
+    def matches_app(self, app_name):
+        """Check app and category membership (memoized per raw app name)."""
+        if not self.filters_apps:
+            return True
+        result = self._app_cache.get(app_name)
+        if result is None:
+            result = ((self.apps is None or canonical_app_name(app_name) in self.apps) and
+                      (self.categories is None or category_for(app_name) in self.categories))
+            self._app_cache[app_name] = result
+        return result
+
+    def describe(self):
+        """Short human-readable summary for report headers."""
+        parts = []
+        if self.apps:
+            parts.append("apps: " + ", ".join(sorted(self.apps)))
+        if self.categories:
+            parts.append("categories: " + ", ".join(sorted(self.categories)))
+        if self.time_window:
+            parts.append(f"hours: {self.time_window[0][:5]}-{self.time_window[1][:5]}")
+        if self.weekday_mask != ALL_WEEKDAYS:
+            days = [name for i, name in enumerate(WEEKDAY_NAMES) if self.weekday_mask & (1 << i)]
+            parts.append("days: " + ", ".join(days))
+        return "; ".join(parts) if parts else "no filter"
\ No newline at end of file
@@ -0,0 +1,77 @@
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+SESSION_MARKERS = ("Session Started", "Session Ended")
+
+# Record kinds: "usage" rows are stamped when an app closes (time is the interval end),
+# "session" rows are foreground sessions written by LogManager (time is the interval start)
+USAGE_KIND = "usage"
+SESSION_KIND = "session"
+
+# One closed interval of app usage as stored in the usage file
+UsageRecord = namedtuple('UsageRecord', ['day', 'time', 'app', 'duration', 'kind'])
+
+def day_key(value):
+    """Normalize a date or "YYYY-MM-DD" string to the string used as a day key."""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def iter_days(start_day, end_day):
+    """Yield every day key from start_day to end_day inclusive."""
+    current = date.fromisoformat(day_key(start_day))
+    last = date.fromisoformat(day_key(end_day))
+    while current <= last:
+        yield current.isoformat()
+        current += timedelta(days=1)
+
+def iter_months(start_day, end_day):
+    """Yield every "YYYY-MM" month key from start_day's month to end_day's month inclusive."""
+    year, month = int(day_key(start_day)[:4]), int(day_key(start_day)[5:7])
+    last = day_key(end_day)[:7]
+    while f"{year:04d}-{month:02d}" <= last:
+        yield f"{year:04d}-{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def record_interval(record):
+    """Return the (start, end) datetimes covered by a record."""
+    stamp = datetime.fromisoformat(f"{record.day} {record.time}")
+    span = timedelta(seconds=record.duration)
+    if record.kind == SESSION_KIND:
+        return stamp, stamp + span
+    return stamp - span, stamp
+
+def record_for_interval(record, start, end):
+    """Return a copy of a record covering [start, end), stamped the way its kind is."""
+    stamp = start if record.kind == SESSION_KIND else end
+    return record._replace(day=stamp.date().isoformat(), time=stamp.strftime('%H:%M:%S'),
+                           duration=(end - start).total_seconds())
+
+def parse_line(line, usage_filter=None):
+    """
+    Parse one line of the usage file.
+    Supports "YYYY-MM-DD HH:MM:SS,app,duration" usage rows and
+    "YYYY-MM-DD,HH:MM:SS,HH:MM:SS,app,duration" session rows.
+    If a filter is given, lines for other apps are dropped before the duration is parsed.
+    Returns:
+        UsageRecord, or None for session markers and malformed lines
+    """
+    parts = line.strip().split(',')
+    try:
+        if len(parts) == 3:
+            timestamp, app, duration = parts
+            day, time_str = timestamp.split(' ')
+            kind = USAGE_KIND
+        elif len(parts) == 5:
+            day, time_str, _, app, duration = parts
+            kind = SESSION_KIND
+        else:
+            return None
+        if app in SESSION_MARKERS or len(day) != 10:
+            return None
+        if usage_filter is not None and not usage_filter.matches_app(app):
+            return None
+        datetime.fromisoformat(f"{day} {time_str}")  # Corrupt stamps would break record_interval() later
+        return UsageRecord(day, time_str, app, float(duration), kind)
+    except ValueError:
+        return None
@@ -0,0 +1,495 @@
+import json
+import os
+import threading
+from datetime import timedelta
+from modules.usage_records import day_key, iter_days, iter_months, parse_line, record_for_interval, record_interval
+from modules.query_cache import QueryCache
+from modules.app_index import AppDayIndex
+from modules.usage_cube import UsageCube
+
+TAIL_BYTES = 64  # Bytes before the known end of file used to tell an append from a rewrite
+CHECKPOINT_VERSION = 2
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_store(path="usage_data.txt"):
+    """Return the process-wide store for a usage file, so every writer shares one generation counter."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = UsageStore(path)
+            _stores[key] = store
+        return store
+
+class UsageStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self.generation = 0  # Bumped on every append
+        self._base_generation = 0  # Results computed before this are stale (file rewritten)
+        self._day_generations = {}  # day: generation of the last append to that day
+        self._known_stat = self._stat()
+        self._tail = self._read_tail(self._known_size())
+        self._views = {}  # name: derived view kept up to date on append
+        self._day_segments = None  # day: [[start, end], ...] byte ranges holding that day's lines
+        self.cache = QueryCache(self)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            return None
+
+    def _known_size(self):
+        return self._known_stat[0] if self._known_stat else 0
+
+    def _read_tail(self, size):
+        """Return the TAIL_BYTES bytes before offset `size`."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(max(size - TAIL_BYTES, 0))
+                return f.read(min(size, TAIL_BYTES))
+        except FileNotFoundError:
+            return b""
+
+    def _check_external_change(self):
+        """
+        Catch up with changes made behind our back. Rows appended by another process
+        (e.g. the tracker while a digest job runs) are fed to the views like our own
+        appends; anything else (truncation, manual edits) invalidates everything.
+        """
+        current = self._stat()
+        if self._known_stat is not None and current != self._known_stat:
+            if self._absorb_external_append(current):
+                return
+            print(f"Debug: {self.path} changed externally, invalidating cached queries")
+            self._invalidate_all()
+            self._tail = self._read_tail(current[0] if current else 0)
+        self._known_stat = current
+
+    def _absorb_external_append(self, current):
+        """Apply complete lines appended past the known end of file; False if the file was rewritten."""
+        known_size = self._known_size()
+        if current is None or current[0] < known_size or self._read_tail(known_size) != self._tail:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(known_size)
+            data = f.read(current[0] - known_size)
+        complete = data.rfind(b"\n") + 1  # A half-written last line is picked up on a later check
+        offset = known_size
+        for raw in data[:complete].splitlines(keepends=True):
+            self._apply_appended_line(raw.decode("utf-8", "replace"), offset, offset + len(raw))
+            offset += len(raw)
+        self._known_stat = (offset, current[1])
+        self._tail = self._read_tail(offset)
+        return True
+
+    def _apply_appended_line(self, line, start, end):
+        """Bump generations and update the segment index and views for one line at [start, end)."""
+        self.generation += 1
+        record = parse_line(line)
+        for day in self._days_touched(line[:10], record):
+            self._day_generations[day] = self.generation
+        if self._day_segments is not None:
+            self._add_segment(self._day_segments, line[:10], start, end)
+        if record is not None:
+            for view in self._views.values():
+                view.add_record(record)
+
+    def _days_touched(self, stamp_day, record):
+        """
+        Days whose results a line can change: the day it is stamped with, plus every day
+        its interval covers, since views like the cube split intervals at midnight
+        (a row stamped 00:10 with an hour of usage adds time to the previous day).
+        """
+        days = {stamp_day}
+        if record is not None:
+            try:
+                interval_start, interval_end = record_interval(record)
+            except ValueError:
+                return days
+            if interval_end > interval_start:
+                days.update(iter_days(interval_start.date(), (interval_end - timedelta(microseconds=1)).date()))
+        return days
+
+    def _invalidate_all(self):
+        self.generation += 1
+        self._base_generation = self.generation
+        self._day_generations.clear()
+        self._views.clear()  # Rebuilt from a fresh scan on next use
+        self._day_segments = None
+
+    def is_current(self, generation, start_day, end_day):
+        """Check whether a result computed at `generation` for a day range (None = open end) is still valid."""
+        with self._lock:
+            self._check_external_change()
+            if generation < self._base_generation:
+                return False
+            # Only days appended to since startup are tracked, so this stays small
+            for day, day_generation in self._day_generations.items():
+                if day_generation > generation and (start_day is None or start_day <= day) \
+                        and (end_day is None or day <= end_day):
+                    return False
+            return True
+
+    def range_generation(self, start_day=None, end_day=None):
+        """
+        Return the generation of the newest change affecting a day range (None = open end).
+        It stays the same for as long as results computed for the range stay valid.
+        """
+        start_day = day_key(start_day)
+        end_day = day_key(end_day)
+        with self._lock:
+            self._check_external_change()
+            latest = self._base_generation
+            for day, day_generation in self._day_generations.items():
+                if day_generation > latest and (not start_day or start_day <= day) \
+                        and (not end_day or day <= end_day):
+                    latest = day_generation
+            return latest
+
+    def append_row(self, *fields):
+        """Append one comma-separated row and bump the generation of the day it belongs to."""
+        line = ",".join(str(field) for field in fields) + "\n"
+        with self._lock:
+            self._check_external_change()
+            offset = self._known_size()
+            with open(self.path, "a") as f:
+                f.write(line)
+            self._known_stat = self._stat()
+            self._tail = (self._tail + line.encode("utf-8"))[-TAIL_BYTES:]
+            self._apply_appended_line(line, offset, self._known_size())
+
+    def clear(self):
+        """Truncate the usage file."""
+        with self._lock:
+            with open(self.path, "w") as f:
+                pass
+            self._invalidate_all()
+            self._known_stat = self._stat()
+            self._tail = b""
+
+    def _add_segment(self, segments, day, start, end):
+        runs = segments.setdefault(day, [])
+        if runs and runs[-1][1] == start:
+            runs[-1][1] = end  # Extend the day's current run of lines
+        else:
+            runs.append([start, end])
+
+    def _segments(self):
+        """Return the day -> byte ranges index, building it with one pass on first use."""
+        if self._day_segments is None:
+            segments = {}
+            offset = 0
+            try:
+                with open(self.path, "rb") as f:
+                    for raw in f:
+                        end = offset + len(raw)
+                        self._add_segment(segments, raw[:10].decode("ascii", "replace"), offset, end)
+                        offset = end
+            except FileNotFoundError:
+                pass
+            self._day_segments = segments
+        return self._day_segments
+
+    def stamped_days(self, start_day=None, end_day=None):
+        """Return the sorted days rows are stamped with in [start_day, end_day], as scan() selects them."""
+        start_day = day_key(start_day)
+        end_day = day_key(end_day)
+        with self._lock:
+            self._check_external_change()
+            return sorted(day for day in self._segments()
+                          if not (start_day and day < start_day) and not (end_day and day > end_day))
+
+    def _days_with_matching_apps(self, usage_filter):
+        """Use the app index to find the only days that can hold records for the filtered apps."""
+        index = self.app_index()
+        days = set()
+        for app_name in index.apps():
+            if usage_filter.matches_app(app_name):
+                days.update(day.isoformat() for day in index.days_for(app_name))
+        return days
+
+    def scan(self, start_day=None, end_day=None, usage_filter=None):
+        """
+        Yield parsed records whose day falls in [start_day, end_day] (both optional).
+        Day range, weekday and app checks run before records are parsed. With a
+        time-of-day window, each record is clipped to the part of its interval inside
+        the window: one record per piece (restamped to match it), none when it is
+        wholly outside.
+        """
+        start_day = day_key(start_day)
+        end_day = day_key(end_day)
+        if not start_day and not end_day and usage_filter is None:
+            yield from self._scan_all()
+            return
+
+        with self._lock:
+            self._check_external_change()
+            segments = self._segments()
+            allowed_days = None
+            if usage_filter is not None and usage_filter.filters_apps:
+                allowed_days = self._days_with_matching_apps(usage_filter)
+            runs = []
+            for day, day_runs in segments.items():
+                if (start_day and day < start_day) or (end_day and day > end_day):
+                    continue
+                if allowed_days is not None and day not in allowed_days:
+                    continue
+                if usage_filter is not None and not usage_filter.matches_day(day):
+                    continue
+                runs.extend((start, end) for start, end in day_runs)
+        runs.sort()
+
+        try:
+            with open(self.path, "rb") as f:
+                for start, end in runs:
+                    f.seek(start)
+                    chunk = f.read(end - start).decode("utf-8", "replace")
+                    for line in chunk.splitlines():
+                        record = parse_line(line, usage_filter)
+                        if record is None:
+                            continue
+                        if usage_filter is not None and usage_filter.time_window is not None:
+                            for start, end in usage_filter.clip_to_window(*record_interval(record)):
+                                yield record_for_interval(record, start, end)
+                            continue
+                        yield record
+        except FileNotFoundError:
+            return
+
+    def _scan_all(self):
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    record = parse_line(line)
+                    if record is not None:
+                        yield record
+        except FileNotFoundError:
+            return
+
+    def derived_view(self, name, factory):
+        """
+        Return a view derived from every record, building it with one scan on first use.
+        The view is fed each appended record through its add_record() method afterwards.
+        Views with from_month_states() start from their monthly checkpoints when those
+        match the file, and then only scan the rows appended since they were saved.
+        """
+        with self._lock:
+            self._check_external_change()
+            view = self._views.get(name)
+            if view is None:
+                view = self._load_checkpoint(name, factory)
+                if view is None:
+                    view = factory()
+                    for record in self.scan():
+                        view.add_record(record)
+                    print(f"Debug: Built {name} view for {self.path}")
+                self._views[name] = view
+            return view
+
+    def period_cube(self, start_day, end_day):
+        """
+        Return a private UsageCube holding only the months that overlap [start_day, end_day].
+        Unless the shared cube is already built, it is loaded from those months' checkpoints
+        plus the rows appended since, so its cost does not grow with the length of history.
+        """
+        months = set(iter_months(start_day, end_day))
+        with self._lock:
+            self._check_external_change()
+            view = self._views.get("usage_cube")
+            if view is None:
+                cube = self._load_checkpoint("usage_cube", UsageCube, months)
+                if cube is not None:
+                    return cube
+                view = self.usage_cube()
+            return UsageCube.from_month_states({month: view.month_state(month) for month in months}, months)
+
+    # Checkpoints live in <usage file>.<view name>/: one <YYYY-MM>.json per month with data,
+    # each holding that month's state and the file offset it covers, and index.json with
+    # the offset up to which its list of months with data is complete.
+
+    def _checkpoint_path(self, name, entry):
+        return os.path.join(f"{self.path}.{name}", f"{entry}.json")
+
+    def _write_checkpoint_entry(self, name, entry, content):
+        path = self._checkpoint_path(name, entry)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(content, version=CHECKPOINT_VERSION, offset=self._known_size(), tail=self._tail.hex()),
+                      f, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    def _read_checkpoint_entry(self, name, entry):
+        """Return a checkpoint file's content if it matches the usage file, else None."""
+        try:
+            with open(self._checkpoint_path(name, entry), "r", encoding="utf-8") as f:
+                content = json.load(f)
+            offset = content['offset']
+            if content['version'] == CHECKPOINT_VERSION and offset <= self._known_size() \
+                    and self._read_tail(offset) == bytes.fromhex(content['tail']):
+                return content
+            print(f"Debug: {name} checkpoint {entry} for {self.path} does not match the file")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Debug: Ignoring unreadable {name} checkpoint {entry}: {e}")
+        return None
+
+    def save_checkpoint(self, name="usage_cube"):
+        """
+        Bring a view's monthly checkpoints up to the current end of the file, writing only
+        the months changed since they were last saved. Without the view built in memory,
+        the rows appended since the last checkpoint are folded into the months they touch.
+        Returns False when there is nothing to start from.
+        """
+        with self._lock:
+            self._check_external_change()
+            view = self._views.get(name)
+            if view is None:
+                return self._fold_checkpoint(name)
+            if not hasattr(view, "month_state"):
+                return False
+            months = view.months_with_data()
+            for month in sorted(view.dirty_months):
+                self._write_checkpoint_entry(name, month, {'state': view.month_state(month)})
+            self._write_checkpoint_entry(name, "index", {'months': months})
+            view.dirty_months.clear()
+            if os.path.exists(f"{self.path}.{name}.json"):
+                os.remove(f"{self.path}.{name}.json")  # Single-file checkpoint from before months
+            directory = os.path.dirname(self._checkpoint_path(name, "index"))
+            for filename in os.listdir(directory):
+                if filename[:7] not in months and filename != "index.json":
+                    os.remove(os.path.join(directory, filename))  # Months left without data
+            return True
+
+    def _fold_checkpoint(self, name):
+        index = self._read_checkpoint_entry(name, "index")
+        if index is None:
+            return False
+        touched = set()
+        with open(self.path, "rb") as f:
+            f.seek(index['offset'])
+            data = f.read(self._known_size() - index['offset'])
+        for raw in data.splitlines():
+            record = parse_line(raw.decode("utf-8", "replace"))
+            if record is not None:
+                start, end = record_interval(record)
+                touched.update(iter_months(start.date(), end.date()))
+        cube = self._load_checkpoint(name, UsageCube, touched) if touched else None
+        if touched and cube is None:
+            return False
+        for month in sorted(touched):
+            self._write_checkpoint_entry(name, month, {'state': cube.month_state(month)})
+        months = sorted(set(index['months']) | set(cube.months_with_data() if cube else []))
+        self._write_checkpoint_entry(name, "index", {'months': months})
+        print(f"Debug: Folded {len(data)} bytes into {len(touched)} {name} checkpoint month(s)")
+        return True
+
+    def _load_checkpoint(self, name, factory, months=None):
+        """
+        Restore a view (or only some months of it) from its monthly checkpoints plus the
+        rows after them, or return None if the checkpoints are missing or out of date.
+        """
+        if not hasattr(factory, "from_month_states"):
+            return None
+        index = self._read_checkpoint_entry(name, "index")
+        if index is None:
+            return None
+        if months is None:
+            directory = os.path.dirname(self._checkpoint_path(name, "index"))
+            wanted = set(index['months']) | {filename[:-5] for filename in os.listdir(directory)
+                                             if filename.endswith(".json") and filename != "index.json"}
+        else:
+            wanted = months
+        states = {}
+        starts = {}  # month: offset its state covers, so replay only adds later rows to it
+        for month in wanted:
+            content = self._read_checkpoint_entry(name, month)
+            if content is not None:
+                states[month] = content['state']
+                starts[month] = content['offset']
+            elif month in index['months']:
+                return None
+            else:
+                starts[month] = index['offset']  # No data up to the index
+        view = factory.from_month_states(states, months)
+        replay_from = min(list(starts.values()) + [index['offset']])
+        with open(self.path, "rb") as f:
+            f.seek(replay_from)
+            data = f.read(self._known_size() - replay_from)
+        offset = replay_from
+        for raw in data.splitlines(keepends=True):
+            view.frozen_months = {month for month, start in starts.items() if start > offset}
+            record = parse_line(raw.decode("utf-8", "replace"))
+            if record is not None:
+                view.add_record(record)
+            offset += len(raw)
+        view.frozen_months = set()
+        print(f"Debug: Restored {len(states)} month(s) of {name} from checkpoints, {len(data)} bytes replayed")
+        return view
+
+    def app_index(self):
+        """
+        Return the app -> days inverted index. Read it through days_for() and last_used(),
+        which hold the store lock while appends on other threads update the index.
+        """
+        return self.derived_view("app_index", AppDayIndex)
+
+    def days_for(self, app_name, start_day=None, end_day=None):
+        """Return the sorted dates an app (or any matching app) was used, from the app index."""
+        with self._lock:
+            return self.app_index().days_for(app_name, start_day, end_day)
+
+    def last_used(self, app_name):
+        """Return the last date an app (or any matching app) was used, or None."""
+        with self._lock:
+            return self.app_index().last_used(app_name)
+
+    def usage_cube(self):
+        """Return the (day, app, hour) usage cube; read it through heatmap() and day_totals()."""
+        return self.derived_view("usage_cube", UsageCube)
+
+    # Cube reads go through these methods: they hold the store lock, so rows appended
+    # or absorbed on another thread cannot change the cube mid-read.
+
+    def heatmap(self, start_day, end_day, by="app", usage_filter=None):
+        """Return {label: 24 hourly seconds} from the usage cube."""
+        with self._lock:
+            return self.usage_cube().heatmap(start_day, end_day, by, usage_filter)
+
+    def _cube_day_totals(self, start_day, end_day):
+        with self._lock:
+            return self.usage_cube().day_totals(start_day, end_day)
+
+    def day_totals(self, start_day, end_day, cached_only=False):
+        """
+        Return {day: seconds} for every day with data in a range, from the usage cube.
+        With cached_only, return None instead of computing when the range is not cached.
+        """
+        start_day = day_key(start_day)
+        end_day = day_key(end_day)
+        if cached_only:
+            result = self.cache.peek("day_totals", start_day, end_day)
+            return dict(result) if result is not None else None
+        return dict(self.cache.get_or_compute(
+            "day_totals", start_day, end_day, None,
+            lambda: self._cube_day_totals(start_day, end_day)
+        ))
+
+    def app_totals(self, start_day, end_day, usage_filter=None):
+        """Return {app: seconds} summed over a day range, served from the query cache when possible."""
+        start_day = day_key(start_day)
+        end_day = day_key(end_day)
+
+        def compute():
+            totals = {}
+            for record in self.scan(start_day, end_day, usage_filter):
+                totals[record.app] = totals.get(record.app, 0) + record.duration
+            return totals
+
+        return dict(self.cache.get_or_compute("app_totals", start_day, end_day, usage_filter, compute))
\ No newline at end of file
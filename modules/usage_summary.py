@@ -0,0 +1,110 @@
+from datetime import timedelta
+from modules.usage_records import record_interval
+
+HOURS = 24
+SKETCH_BUCKETS = 21  # Bucket b counts intervals of [2^b, 2^(b+1)) seconds; the last one is open-ended
+
+def sketch_bucket(seconds):
+    """Log-scale bucket of an interval length."""
+    return min(max(int(seconds), 1).bit_length() - 1, SKETCH_BUCKETS - 1)
+
+def sketch_quantile(counts, q):
+    """
+    Approximate an interval length quantile from bucket counts.
+    Returns the geometric middle of the bucket holding the quantile (within a factor
+    of about 1.4 of the true value), or None for an empty sketch.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for bucket, count in enumerate(counts):
+        seen += count
+        if seen > rank:
+            return 2 ** (bucket + 0.5)
+    return 2 ** (SKETCH_BUCKETS - 0.5)
+
+class UsageSummary:
+    """
+    Compact totals for one usage log that add up across logs: per-app seconds, interval
+    counts and a log-scale sketch of interval lengths, seconds per day and per hour of day.
+    Its size grows with apps and days, not with the number of records.
+    """
+
+    def __init__(self):
+        self.apps = {}  # app: [seconds, intervals, [SKETCH_BUCKETS interval counts]]
+        self.days = {}  # day: seconds
+        self.hourly = [0.0] * HOURS  # Seconds per hour of day
+        self.records = 0
+
+    def to_state(self):
+        """Plain JSON-able state."""
+        return {
+            'apps': self.apps,
+            'days': self.days,
+            'hourly': self.hourly,
+            'records': self.records
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        summary = cls()
+        summary.apps = {app: [seconds, intervals, list(sketch)] for app, (seconds, intervals, sketch) in state['apps'].items()}
+        summary.days = dict(state['days'])
+        summary.hourly = list(state['hourly'])
+        summary.records = state['records']
+        return summary
+
+    def add_record(self, record):
+        """Store-view hook: add one closed interval."""
+        entry = self.apps.get(record.app)
+        if entry is None:
+            entry = self.apps[record.app] = [0.0, 0, [0] * SKETCH_BUCKETS]
+        entry[0] += record.duration
+        entry[1] += 1
+        entry[2][sketch_bucket(record.duration)] += 1
+        self.days[record.day] = self.days.get(record.day, 0.0) + record.duration
+        self.records += 1
+
+        start, end = record_interval(record)
+        current = start
+        while current < end:
+            next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            chunk_end = min(next_hour, end)
+            self.hourly[current.hour] += (chunk_end - current).total_seconds()
+            current = chunk_end
+
+    def merge(self, other):
+        """Add another summary's totals into this one and return self."""
+        for app, (seconds, intervals, sketch) in other.apps.items():
+            entry = self.apps.get(app)
+            if entry is None:
+                self.apps[app] = [seconds, intervals, list(sketch)]
+                continue
+            entry[0] += seconds
+            entry[1] += intervals
+            entry[2] = [mine + theirs for mine, theirs in zip(entry[2], sketch)]
+        for day, seconds in other.days.items():
+            self.days[day] = self.days.get(day, 0.0) + seconds
+        self.hourly = [mine + theirs for mine, theirs in zip(self.hourly, other.hourly)]
+        self.records += other.records
+        return self
+
+    def app_totals(self):
+        """Return {app: seconds}."""
+        return {app: entry[0] for app, entry in self.apps.items()}
+
+    def total_seconds(self):
+        return sum(entry[0] for entry in self.apps.values())
+
+    def day_range(self):
+        """(first day, last day) with data, or (None, None)."""
+        if not self.days:
+            return None, None
+        return min(self.days), max(self.days)
+
+    def interval_quantile(self, app, q):
+        """Approximate interval length quantile for one app, in seconds."""
+        entry = self.apps.get(app)
+        return sketch_quantile(entry[2], q) if entry is not None else None
\ No newline at end of file
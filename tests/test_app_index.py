@@ -0,0 +1,24 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from modules.usage_store import UsageStore
+
+class AppIndexTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "usage_data.txt")
+
+    def test_corrupt_lines_do_not_break_the_index(self):
+        with open(self.path, "w") as f:
+            f.write("2025-04-09 10:00:00,VS Code,5\n2025-04-1x 10:00:00,VS Code,5\n"
+                    "2025-04-10 1x:00:00,Slack,5\n2025-04-11,10:00:00,10:00:05,vs code,5\n")
+        store = UsageStore(self.path)
+        self.assertEqual(store.days_for("vs code"), [date(2025, 4, 9), date(2025, 4, 11)])
+        self.assertEqual(store.days_for("slack"), [])
+        self.assertEqual(store.last_used("VS Code"), date(2025, 4, 11))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from datetime import datetime
+from modules.budget_rules import BudgetMonitor, parse_rules
+
+NOON = datetime(2026, 3, 2, 12).timestamp()
+
+class BudgetMonitorTest(unittest.TestCase):
+    def test_crossing_time_counts_the_baseline(self):
+        monitor = BudgetMonitor(parse_rules("Chrome <= 2h"), {'Chrome': 3600}, {'Chrome': NOON}, now=NOON)
+        self.assertEqual(monitor.next_wakeup(), NOON + 3600)
+        self.assertEqual(monitor.check(NOON + 3599), [])
+        alert, = monitor.check(NOON + 3600)
+        self.assertEqual(alert.crossed_at, NOON + 3600)
+        self.assertEqual(monitor.check(NOON + 7200), [])  # Fires once per day
+
+    def test_two_apps_in_a_category_cross_twice_as_fast(self):
+        monitor = BudgetMonitor(parse_rules("browsers <= 1h"), now=NOON)
+        monitor.app_started("Chrome", NOON)
+        monitor.app_started("Firefox", NOON + 600)
+        # 600 s from Chrome alone, then the remaining 3000 s shared by both
+        self.assertEqual(monitor.next_wakeup(), NOON + 600 + 1500)
+        monitor.app_stopped("Firefox", NOON + 1200)
+        # 1800 s counted at 1200 (Chrome 1200, Firefox 600), then Chrome alone
+        self.assertEqual(monitor.next_wakeup(), NOON + 1200 + 1800)
+
+    def test_stopped_apps_cannot_cross(self):
+        monitor = BudgetMonitor(parse_rules("Slack >= 30m"), now=NOON)
+        monitor.app_started("Slack", NOON)
+        monitor.app_stopped("Slack", NOON + 600)
+        self.assertEqual(monitor.next_wakeup(), datetime(2026, 3, 3).timestamp())  # Only midnight is left
+
+if __name__ == "__main__":
+    unittest.main()
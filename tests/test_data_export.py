@@ -0,0 +1,28 @@
+import os
+import shutil
+import tempfile
+import unittest
+from modules.data_export import daily_rows, raw_rows
+from modules.usage_filter import UsageFilter
+from modules.usage_store import UsageStore
+
+class DataExportTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "usage_data.txt")
+        with open(path, "w") as f:
+            f.write("2026-01-05,08:00:00,10:00:00,Code,7200\n"
+                    "2026-01-07 00:00:00,Slack,1200\n")  # Stamped on the 7th, used only on the 6th
+        self.store = UsageStore(path)
+
+    def test_raw_rows_stay_inside_the_time_window(self):
+        rows = list(raw_rows(self.store, "2026-01-05", "2026-01-05", UsageFilter(time_window=("09:00", "17:00"))))
+        self.assertEqual([row[:3] for row in rows], [("2026-01-05T09:00:00", "2026-01-05T10:00:00", "2026-01-05")])
+
+    def test_daily_rows_follow_stamped_days(self):
+        rows = list(daily_rows(self.store, "2026-01-07", "2026-01-07"))
+        self.assertEqual(rows, [("2026-01-07", "Slack", rows[0][2], 1200)])
+
+if __name__ == "__main__":
+    unittest.main()
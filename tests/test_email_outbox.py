@@ -0,0 +1,138 @@
+import os
+import shutil
+import smtplib
+import tempfile
+import threading
+import time
+import unittest
+from email.mime.text import MIMEText
+from modules.email_outbox import CLAIM_SUFFIX, STALE_CLAIM, EmailAccount, EmailOutbox
+
+ACCOUNT = EmailAccount("127.0.0.1", 2525, "me@example.com", security="none")
+
+class StandInServer:
+    """In-process stand-in for an SMTP server; factory() is passed to EmailOutbox as its smtp_factory."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.refuse_connections = 0  # Connection attempts answered with 421 before accepting
+        self.delivered = []  # (recipients, raw message)
+
+    def factory(self, account, timeout):
+        with self.lock:
+            self.connections += 1
+            if self.refuse_connections:
+                self.refuse_connections -= 1
+                raise smtplib.SMTPConnectError(421, b"busy")
+        return StandInSession(self)
+
+class StandInSession:
+    def __init__(self, server):
+        self.server = server
+
+    def noop(self):
+        return 250, b"ok"
+
+    def login(self, username, password):
+        return 235, b"ok"
+
+    def sendmail(self, sender, recipients, raw):
+        if any(address.startswith("bounce@") for address in recipients):
+            raise smtplib.SMTPResponseException(550, b"no such user")
+        with self.server.lock:
+            self.server.delivered.append((recipients, raw))
+        return {}
+
+    def quit(self):
+        return 221, b"bye"
+
+def message(recipient):
+    msg = MIMEText("hello")
+    msg['From'] = ACCOUNT.username
+    msg['To'] = recipient
+    msg['Subject'] = "Digest"
+    return msg
+
+class EmailOutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.server = StandInServer()
+
+    def outbox(self, **options):
+        outbox = EmailOutbox(self.directory, smtp_factory=self.server.factory, backoff=0.05, idle_timeout=0.2, **options)
+        self.addCleanup(outbox.stop)
+        return outbox
+
+    def wait_for(self, condition, timeout=5):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.02)
+        return condition()
+
+    def test_burst_shares_one_session(self):
+        outbox = self.outbox()
+        for i in range(5):
+            outbox.enqueue(ACCOUNT, message(f"user{i}@example.com"))
+        outbox.enqueue(ACCOUNT, lambda: message("built@example.com"))  # Rendered on the sender thread
+        outbox.start()
+        time.sleep(0.1)
+        self.assertEqual(self.server.delivered, [])  # Nothing is sent before the password is known
+        outbox.set_credentials(ACCOUNT, "secret")
+        self.assertTrue(outbox.flush(5))
+        self.assertEqual(len(self.server.delivered), 6)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_refused_connections_are_retried_with_backoff(self):
+        self.server.refuse_connections = 2
+        events = []
+        outbox = self.outbox()
+        outbox.add_listener(lambda event, message_id, detail: events.append(event))
+        outbox.set_credentials(ACCOUNT, "secret")
+        outbox.enqueue(ACCOUNT, message("user@example.com"))
+        started = time.time()
+        outbox.start()
+        self.assertTrue(self.wait_for(lambda: self.server.delivered))
+        self.assertEqual(events, ["queued", "retry", "retry", "sent"])
+        self.assertGreaterEqual(time.time() - started, 0.05 + 0.1)  # Waits of 0.05 s, then 0.1 s
+
+    def test_permanent_rejection_fails_without_retrying(self):
+        outbox = self.outbox()
+        outbox.set_credentials(ACCOUNT, "secret")
+        message_id = outbox.enqueue(ACCOUNT, message("bounce@example.com"))
+        outbox.start()
+        self.assertTrue(self.wait_for(lambda: outbox.failed()))
+        failed, = outbox.failed()
+        self.assertEqual((failed['id'], failed['attempts']), (message_id, 1))
+        # The failure is written back for other processes and later runs
+        self.assertEqual(EmailOutbox(self.directory).failed()[0]['id'], message_id)
+
+    def test_claimed_messages_are_left_to_their_claimer_until_stale(self):
+        message_id = self.outbox().enqueue(ACCOUNT, message("user@example.com"))
+        claim = os.path.join(self.directory, message_id + CLAIM_SUFFIX)
+        os.rename(os.path.join(self.directory, message_id + ".json"), claim)  # Another process is sending it
+        outbox = self.outbox()
+        outbox.set_credentials(ACCOUNT, "secret")
+        outbox.start()
+        time.sleep(0.5)
+        self.assertEqual(self.server.delivered, [])
+        stale = time.time() - STALE_CLAIM - 1
+        os.utime(claim, (stale, stale))  # Its claimer crashed
+        self.assertTrue(self.wait_for(lambda: self.server.delivered))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_outboxes_sharing_a_directory_send_each_message_once(self):
+        outboxes = [self.outbox() for _ in range(3)]
+        for i in range(30):
+            outboxes[i % 3].enqueue(ACCOUNT, message(f"user{i}@example.com"))
+        for outbox in outboxes:
+            outbox.set_credentials(ACCOUNT, "secret")
+            outbox.start()
+        self.assertTrue(self.wait_for(lambda: not os.listdir(self.directory)))
+        recipients = sorted(recipients[0] for recipients, _ in self.server.delivered)
+        self.assertEqual(recipients, sorted(f"user{i}@example.com" for i in range(30)))
+
+if __name__ == "__main__":
+    unittest.main()
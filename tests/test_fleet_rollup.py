@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+from modules.fleet_rollup import FleetRollup
+
+def rows(day, count, seconds):
+    """count session rows of `seconds` each on one day."""
+    return "".join(f"{day},{9 + i // 60:02d}:{i % 60:02d}:00,{9 + i // 60:02d}:{i % 60:02d}:{seconds:02d},Code,{seconds}\n"
+                   for i in range(count))
+
+class FleetRollupTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.drop = os.path.join(self.directory, "drop")
+        os.mkdir(self.drop)
+        self.rollup = FleetRollup(os.path.join(self.directory, "state.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.drop, name)
+        with open(path, "w") as f:
+            f.write(content)
+        os.utime(path, ns=(0, len(content) + hash(name) % 1000))  # A distinct stat per write
+
+    def ingest(self):
+        counts = self.rollup.ingest_directory(self.drop)
+        self.rollup.save_state()
+        return counts
+
+    def totals(self):
+        summary = FleetRollup(self.rollup.state_file).machine_summaries()['alice']
+        return summary.total_seconds(), summary.days
+
+    def test_replayed_snapshot_of_the_same_file_is_skipped(self):
+        v1 = "2026-01-01,09:00:00,09:01:40,Code,100\n"
+        v2 = v1 + "2026-01-02,09:00:00,09:03:20,Code,200\n"
+        self.write("alice.txt", v1)
+        self.ingest()
+        self.write("alice.txt", v2)
+        self.assertEqual(self.ingest()['appended'], 1)
+        self.write("alice.txt", v1)
+        self.assertEqual(self.ingest()['duplicate'], 1)
+        self.assertEqual(self.totals()[0], 300)
+
+        shutil.move(os.path.join(self.drop, "alice.txt"), os.path.join(self.directory, "old.txt"))
+        self.write("alice-copy.txt", v2)
+        self.assertEqual(self.ingest()['duplicate'], 1)
+        total, days = self.totals()
+        self.assertEqual(total, 300)
+        self.assertEqual(days, {'2026-01-01': 100, '2026-01-02': 200})
+
+    def test_snapshots_under_other_names(self):
+        log = rows("2026-01-01", 200, 10) + rows("2026-01-02", 200, 10)
+        self.write("alice.txt", log)
+        self.ingest()
+        # An older snapshot that was never ingested itself, cut at a line end
+        older = log[:log.index("\n", len(log) // 2) + 1]
+        self.write("alice-older.txt", older)
+        self.assertEqual(self.ingest()['duplicate'], 1)
+        # A newer snapshot under another name only adds its new lines to the source it continues
+        self.write("alice-newer.txt", log + rows("2026-01-03", 10, 30))
+        self.assertEqual(self.ingest()['duplicate'], 1)
+        total, days = self.totals()
+        self.assertEqual(total, 4000 + 300)
+        self.assertEqual(days['2026-01-03'], 300)
+
+    def test_rewritten_file_with_new_content_is_reread(self):
+        self.write("alice.txt", rows("2026-01-01", 5, 10))
+        self.ingest()
+        self.write("alice.txt", rows("2026-02-01", 3, 20))
+        self.assertEqual(self.ingest()['replaced'], 1)
+        self.assertEqual(self.totals()[0], 60)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from modules.log_manager import LogManager
+from modules.usage_filter import UsageFilter
+
+DAY = date(2026, 1, 5)
+
+class FocusMetricsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "usage_data.txt")
+        with open(path, "w") as f:
+            f.write("2026-01-05,08:00:00,10:00:00,Code,7200\n"
+                    "2026-01-05,10:00:00,10:30:00,Slack,1800\n"
+                    "2026-01-05,18:00:00,19:00:00,Code,3600\n")
+        self.logger = LogManager(path)
+
+    def test_filter_limits_the_sessions_counted(self):
+        everything = self.logger.focus_metrics(DAY, DAY)
+        self.assertEqual(everything['tracked_seconds'], 7200 + 1800 + 3600)
+        only_code = self.logger.focus_metrics(DAY, DAY, UsageFilter(apps=["Code"]))
+        self.assertEqual(only_code['tracked_seconds'], 7200 + 3600)
+        office = self.logger.focus_metrics(DAY, DAY, UsageFilter(time_window=("09:00", "17:00")))
+        self.assertEqual(office['tracked_seconds'], 3600 + 1800)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+from modules.http_api import HttpApiServer
+from modules.usage_store import UsageStore
+
+class HttpApiCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "usage_data.txt")
+        with open(path, "w") as f:
+            f.write("2026-01-05 10:00:00,Code,600\n")
+        self.server = HttpApiServer(UsageStore(path), tracker_client=object(), workers=1)
+        self.addCleanup(self.server.executor.shutdown)
+
+    def today_body(self, today):
+        with mock.patch("modules.http_api.parse_day", return_value=today):
+            query = self.server.api.route("/api/day/today", {})
+        etag = self.server._etag(query)
+        return etag, asyncio.run(self.server._body("/api/day/today", etag, query))
+
+    def test_relative_days_are_not_served_from_before_midnight(self):
+        before_etag, before = self.today_body(date(2026, 1, 5))
+        after_etag, after = self.today_body(date(2026, 1, 6))
+        self.assertNotEqual(before_etag, after_etag)
+        self.assertIn(b'"day":"2026-01-05"', before)
+        self.assertIn(b'"day":"2026-01-06"', after)
+        self.assertEqual(self.today_body(date(2026, 1, 5)), (before_etag, before))
+
+if __name__ == "__main__":
+    unittest.main()
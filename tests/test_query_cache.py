@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+from modules.usage_store import UsageStore
+
+class QueryCacheInvalidationTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "usage_data.txt")
+        with open(self.path, "w") as f:
+            f.write("2026-01-05 10:00:00,Code,600\n2026-01-06 10:00:00,Code,600\n2026-01-07 10:00:00,Mail,300\n")
+        self.store = UsageStore(self.path)
+        self.ranges = [("2026-01-05", "2026-01-05"), ("2026-01-05", "2026-01-06"),
+                       ("2026-01-06", "2026-01-07"), ("2026-01-07", "2026-01-07")]
+        for start, end in self.ranges:
+            self.store.app_totals(start, end)
+
+    def recomputed(self):
+        """Query every range again and return the ones the cache could not serve."""
+        missed = []
+        for start, end in self.ranges:
+            misses = self.store.cache.stats()['misses']
+            self.store.app_totals(start, end)
+            if self.store.cache.stats()['misses'] > misses:
+                missed.append((start, end))
+        return missed
+
+    def test_append_invalidates_only_ranges_covering_its_day(self):
+        self.assertEqual(self.recomputed(), [])
+        self.store.append_row("2026-01-06 11:00:00", "Code", 60)
+        self.assertEqual(self.recomputed(), [("2026-01-05", "2026-01-06"), ("2026-01-06", "2026-01-07")])
+        self.assertEqual(self.store.app_totals("2026-01-05", "2026-01-06"), {'Code': 1260})
+        self.assertEqual(self.recomputed(), [])
+
+    def test_interval_crossing_midnight_invalidates_both_days(self):
+        self.store.append_row("2026-01-05", "23:50:00", "00:10:00", "Code", 1200)
+        self.assertEqual(self.recomputed(), self.ranges[:3])
+
+    def test_append_by_another_writer_is_noticed(self):
+        with open(self.path, "a") as f:
+            f.write("2026-01-07 12:00:00,Mail,60\n")
+        self.assertEqual(self.recomputed(), [("2026-01-06", "2026-01-07"), ("2026-01-07", "2026-01-07")])
+        self.assertEqual(self.store.app_totals("2026-01-07", "2026-01-07"), {'Mail': 360})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from modules.log_manager import LogManager
+from modules.streaming_report import DailyDetailReport
+from modules.usage_filter import UsageFilter
+
+class DailyDetailReportTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "usage_data.txt")
+        with open(self.path, "w") as f:
+            f.write("2026-01-05,08:00:00,10:00:00,Code,7200\n"
+                    "2026-01-05 18:00:00,Slack,7200\n"
+                    "2026-01-07 00:00:00,Mail,600\n")  # Stamped on the 7th, used only on the 6th
+
+    def test_session_rows_stay_inside_the_time_window(self):
+        report = DailyDetailReport(LogManager(self.path), date(2026, 1, 5), date(2026, 1, 5),
+                                   UsageFilter(time_window=("09:00", "17:00")))
+        self.assertEqual([row[:3] for row in report._session_rows("2026-01-05")],
+                         [["09:00:00", "10:00:00", "Code"], ["16:00:00", "17:00:00", "Slack"]])
+
+    def test_days_with_only_midnight_stamps_get_a_section(self):
+        report = DailyDetailReport(LogManager(self.path), date(2026, 1, 7), date(2026, 1, 7))
+        self.assertTrue(any(getattr(flowable, 'text', '').startswith("Wednesday, 2026-01-07")
+                            for flowable in report.flowables()))
+
+if __name__ == "__main__":
+    unittest.main()
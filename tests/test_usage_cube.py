@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+import unittest
+from modules.usage_cube import UsageCube
+from modules.usage_records import parse_line
+from modules.usage_store import UsageStore
+
+class UsageCubeTest(unittest.TestCase):
+    def test_session_is_split_at_hours_and_midnight(self):
+        cube = UsageCube()
+        cube.add_record(parse_line("2026-03-01,23:30:00,00:45:00,Code,4500"))
+        self.assertEqual(cube.day_totals("2026-03-01", "2026-03-02"), {'2026-03-01': 1800, '2026-03-02': 2700})
+        first, second = (cube.heatmap(day, day)['Code'] for day in ("2026-03-01", "2026-03-02"))
+        self.assertEqual(first[23], 1800)
+        self.assertEqual((second[0], sum(second)), (2700, 2700))
+
+    def test_usage_row_counts_back_from_its_stamp(self):
+        cube = UsageCube()
+        cube.add_record(parse_line("2026-03-02 00:10:00,Code,1200"))
+        self.assertEqual(cube.day_totals("2026-03-01", "2026-03-02"), {'2026-03-01': 600, '2026-03-02': 600})
+
+    def test_corrupt_stamps_are_skipped(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "usage_data.txt")
+        with open(path, "w") as f:
+            f.write("2025-04-1x 10:00:00,App,5\n2025-04-10 1x:00:00,App,5\n"
+                    "2025-04-10,10:00:00,10:00:05,App,5\n2025-04-10 11:00:00,App,7\n")
+        store = UsageStore(path)
+        self.assertEqual(store.usage_cube().day_totals("2025-04-10", "2025-04-10"), {'2025-04-10': 12})
+
+if __name__ == "__main__":
+    unittest.main()
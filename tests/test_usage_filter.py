@@ -0,0 +1,26 @@
+import unittest
+from datetime import datetime
+from modules.usage_filter import UsageFilter
+
+class UsageFilterTest(unittest.TestCase):
+    def test_seconds_in_window(self):
+        office = UsageFilter(time_window=("09:00", "17:00"))
+        self.assertEqual(office.seconds_in_window(datetime(2026, 1, 1, 8), datetime(2026, 1, 1, 10)), 3600)
+        self.assertEqual(office.seconds_in_window(datetime(2026, 1, 1, 17), datetime(2026, 1, 1, 18)), 0)
+        # 16:00 on day one to 10:00 on day three: 1 + 8 + 1 hours
+        self.assertEqual(office.seconds_in_window(datetime(2026, 1, 1, 16), datetime(2026, 1, 3, 10)), 10 * 3600)
+
+    def test_window_wrapping_past_midnight(self):
+        night = UsageFilter(time_window=("22:00", "02:00"))
+        self.assertEqual(night.clip_to_window(datetime(2026, 1, 1, 0), datetime(2026, 1, 1, 23)),
+                         [(datetime(2026, 1, 1, 0), datetime(2026, 1, 1, 2)),
+                          (datetime(2026, 1, 1, 22), datetime(2026, 1, 1, 23))])
+        self.assertEqual(night.seconds_in_window(datetime(2026, 1, 1, 12), datetime(2026, 1, 1, 13)), 0)
+
+    def test_empty_window_matches_nothing(self):
+        empty = UsageFilter(time_window=("09:00", "09:00"))
+        self.assertEqual(empty.seconds_in_window(datetime(2026, 1, 1), datetime(2026, 1, 2)), 0)
+        self.assertFalse(empty.matches_time("09:00:00"))
+
+if __name__ == "__main__":
+    unittest.main()
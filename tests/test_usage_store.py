@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from modules.usage_filter import UsageFilter
+from modules.usage_records import record_interval
+from modules.usage_store import UsageStore
+
+class UsageStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "usage_data.txt")
+
+    def store_with(self, content):
+        with open(self.path, "w") as f:
+            f.write(content)
+        return UsageStore(self.path)
+
+    def test_time_window_clips_both_record_kinds(self):
+        store = self.store_with("2026-01-05,08:00:00,10:00:00,Code,7200\n"  # Session row, stamped at its start
+                                "2026-01-05 18:00:00,Slack,7200\n")  # Usage row, stamped at its end
+        office = UsageFilter(time_window=("09:00", "17:00"))
+        intervals = {record.app: record_interval(record) for record in store.scan("2026-01-05", "2026-01-05", office)}
+        self.assertEqual(intervals, {
+            'Code': (datetime(2026, 1, 5, 9), datetime(2026, 1, 5, 10)),
+            'Slack': (datetime(2026, 1, 5, 16), datetime(2026, 1, 5, 17))
+        })
+        self.assertEqual(store.app_totals("2026-01-05", "2026-01-05", office), {'Code': 3600, 'Slack': 3600})
+
+    def test_time_window_splits_a_record_spanning_two_windows(self):
+        store = self.store_with("2026-01-05,16:00:00,10:00:00,Code,64800\n")
+        office = UsageFilter(time_window=("09:00", "17:00"))
+        records = list(store.scan("2026-01-05", "2026-01-05", office))
+        self.assertEqual([record_interval(record) for record in records], [
+            (datetime(2026, 1, 5, 16), datetime(2026, 1, 5, 17)),
+            (datetime(2026, 1, 6, 9), datetime(2026, 1, 6, 10))
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
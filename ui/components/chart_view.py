@@ -1,45 +1,182 @@
-from PyQt5.QtWidgets import QWidget
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush
+from bisect import bisect_right
+from PyQt5.QtWidgets import QWidget, QScrollBar
+from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPixmap
 from PyQt5.QtCore import Qt, QRect, QPoint
 
+# Theme colors
+BACKGROUND_COLOR = QColor("#2A3536")
+BAR_COLOR = QColor("#0969DA")
+HIGHLIGHT_COLOR = QColor("#2DA44E")
+TEXT_COLOR = QColor("#D3D7D9")
+BORDER_COLOR = QColor("#3A4546")
+OTHER_COLOR = QColor("#4A5A5B")
+
+MIN_BAR_WIDTH = 20
+BAR_SPACING = 10
+
 class ChartView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.data = {}  # {app_name: duration_in_seconds}
-        self.bar_rects = []  # Initialize bar_rects to avoid AttributeError
+        self.heatmap_rows = {}  # {label: [24 hourly seconds]}
+        self.mode = "bars"  # "bars" or "heatmap"
+        self.bar_rects = []  # [(rect, label, seconds)] in x order, from the layout cache
+        self._bar_lefts = []  # Left edge of each bar, for bisect hit-testing
+        self._heatmap_grid = None  # (left, top, cell_width, cell_height, rows) for heatmap hit-testing
+        self._pixmap = None  # Background, bars and labels; rebuilt only on data/size/mode/scroll changes
+        self._bar_layout = None  # (entries, max_duration, bar_width), rebuilt only on data/size/option changes
+        self.max_bars = None  # Show the top N apps plus an "Other" bucket, or None for every app
+        self.sort_by_duration = False
+        self.scroll_offset = 0  # Horizontal scroll position over the virtual bar strip, in px
         self.setMouseTracking(True)  # Enable mouse tracking for tooltips
         self.hovered_bar = None
         self.setMinimumHeight(300)
 
+        self.scrollbar = QScrollBar(Qt.Horizontal, self)
+        self.scrollbar.hide()
+        self.scrollbar.valueChanged.connect(self.scroll_to)
+
     def update_chart(self, data):
         """Update the chart with new data"""
-        self.data = data
+        if data == self.data:
+            return  # Nothing changed, keep the cached rendering
+        self.data = dict(data)
         print(f"Debug: ChartView received data: {self.data}")
+        if self.mode == "bars":
+            self._invalidate()
+
+    def update_heatmap(self, rows):
+        """Update the hour-of-day heatmap data ({label: [24 hourly seconds]})"""
+        if rows == self.heatmap_rows:
+            return
+        self.heatmap_rows = rows
+        if self.mode == "heatmap":
+            self._invalidate()
+
+    def set_mode(self, mode):
+        """Switch between the "bars" and "heatmap" views"""
+        if mode != self.mode:
+            self.mode = mode
+            self._invalidate()
+
+    def set_level_of_detail(self, max_bars):
+        """Show only the top max_bars apps with the rest folded into "Other" (None shows all and scrolls)"""
+        if max_bars != self.max_bars:
+            self.max_bars = max_bars
+            self._invalidate()
+
+    def set_sort_by_duration(self, enabled):
+        """Order bars by duration (longest first) instead of insertion order"""
+        if enabled != self.sort_by_duration:
+            self.sort_by_duration = enabled
+            self._invalidate()
+
+    def scroll_to(self, offset):
+        """Scroll the bar strip horizontally; the cache is redrawn with just the bars in the new viewport"""
+        offset = max(0, min(offset, self.scrollbar.maximum()))
+        if offset != self.scroll_offset:
+            self.scroll_offset = offset
+            self._pixmap = None
+            self.hovered_bar = None
+            self.update()
+        if self.scrollbar.value() != offset:
+            self.scrollbar.setValue(offset)
+
+    def wheelEvent(self, event):
+        """Scroll horizontally with the mouse wheel when bars overflow"""
+        if self.scrollbar.isVisible():
+            delta = event.angleDelta().x() or event.angleDelta().y()
+            self.scroll_to(self.scroll_offset - delta // 2)
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
+    def _invalidate(self):
+        self._pixmap = None
+        self._bar_layout = None
         self.hovered_bar = None
         self.update()  # Trigger a repaint
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def _layout_bars(self):
+        """Order, fold and size the bars; the result is cached until data, size or options change"""
+        entries = list(self.data.items())
+        if self.sort_by_duration or (self.max_bars and len(entries) > self.max_bars):
+            entries.sort(key=lambda x: x[1], reverse=True)
+        if self.max_bars and len(entries) > self.max_bars:
+            rest = entries[self.max_bars:]
+            entries = entries[:self.max_bars]
+            entries.append((f"Other ({len(rest)})", sum(duration for _, duration in rest)))
 
-        # Define colors from the app's theme
-        background_color = QColor("#2A3536")
-        bar_color = QColor("#0969DA")
-        highlight_color = QColor("#2DA44E")
-        text_color = QColor("#D3D7D9")
-        border_color = QColor("#3A4546")
+        chart_width = self.width() - 80
+        bar_width = max(MIN_BAR_WIDTH, chart_width // max(1, len(entries)) - BAR_SPACING)
+        max_duration = max((duration for _, duration in entries), default=1) or 1  # Avoid division by zero
 
-        # Fill background
-        painter.fillRect(self.rect(), background_color)
+        # Bars that do not fit become a scrollable strip
+        content_width = len(entries) * (bar_width + BAR_SPACING)
+        overflow = max(0, content_width - chart_width)
+        self.scrollbar.blockSignals(True)
+        self.scrollbar.setRange(0, overflow)
+        self.scrollbar.setPageStep(max(1, chart_width))
+        self.scrollbar.setSingleStep(bar_width + BAR_SPACING)
+        self.scrollbar.setVisible(overflow > 0)
+        self.scroll_offset = min(self.scroll_offset, overflow)
+        self.scrollbar.setValue(self.scroll_offset)
+        self.scrollbar.blockSignals(False)
 
-        # Reset bar_rects
+        self._bar_layout = (entries, max_duration, bar_width)
+
+    def _render_cache(self):
+        """Recompute the layout and draw everything except the hover highlight into a pixmap."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(BACKGROUND_COLOR)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
         self.bar_rects = []
+        self._bar_lefts = []
+        self._heatmap_grid = None
+        if self.mode == "heatmap":
+            self.scrollbar.hide()
+            self.paint_heatmap(painter)
+        else:
+            self.paint_bars(painter)
+        painter.end()
+        self._pixmap = pixmap
 
+    def paintEvent(self, event):
+        if self._pixmap is None:
+            self._render_cache()
+        painter = QPainter(self)
+        # Only the exposed region is blitted, so hover updates copy two small rects
+        painter.drawPixmap(event.rect(), self._pixmap, self._source_rect(event.rect()))
+        if self.hovered_bar is not None and self.hovered_bar < len(self.bar_rects):
+            rect = self.bar_rects[self.hovered_bar][0]
+            painter.setRenderHint(QPainter.Antialiasing)
+            if self.mode == "heatmap":
+                painter.setPen(QPen(HIGHLIGHT_COLOR, 2))
+                painter.setBrush(Qt.NoBrush)
+            else:
+                painter.setPen(BORDER_COLOR)
+                painter.setBrush(HIGHLIGHT_COLOR)
+            painter.drawRect(rect)
+
+    def _source_rect(self, rect):
+        ratio = self._pixmap.devicePixelRatio()
+        return QRect(int(rect.x() * ratio), int(rect.y() * ratio),
+                     int(rect.width() * ratio), int(rect.height() * ratio))
+
+    def paint_bars(self, painter):
+        """Draw the visible part of the bar chart into the cache"""
         if not self.data:
-            painter.setPen(text_color)
+            self.scrollbar.hide()
+            painter.setPen(TEXT_COLOR)
             painter.setFont(QFont("Segoe UI", 12))
             painter.drawText(self.rect(), Qt.AlignCenter, "No data to display")
             return
+        if self._bar_layout is None:
+            self._layout_bars()
+        entries, max_duration, bar_width = self._bar_layout
 
         # Chart dimensions
         width = int(self.width())
@@ -47,27 +184,18 @@ class ChartView(QWidget):
         margin = 40  # Margin for labels and borders
         chart_width = width - 2 * margin
         chart_height = height - 2 * margin
+        step = bar_width + BAR_SPACING
 
-        # Calculate bar width and spacing
-        num_bars = len(self.data)
-        if num_bars == 0:
-            return
-        bar_width = chart_width // num_bars - 10  # 10px spacing between bars
-        if bar_width < 20:
-            bar_width = 20  # Minimum bar width
-        bar_spacing = 10
+        # Only bars intersecting the viewport are laid out and drawn
+        first = self.scroll_offset // step
+        last = min(len(entries), (self.scroll_offset + chart_width) // step + 1)
 
-        # Find the maximum duration for scaling
-        max_duration = max(self.data.values(), default=1)
-        if max_duration == 0:
-            max_duration = 1  # Avoid division by zero
-
-        # Draw bars
         painter.setFont(QFont("Segoe UI", 10))
-        x = margin
-        bar_index = 0
+        painter.setClipRect(QRect(margin, 0, chart_width, height))
+        for index in range(first, last):
+            app, duration = entries[index]
+            x = margin + index * step - self.scroll_offset
 
-        for app, duration in self.data.items():
             # Calculate bar height
             bar_height = (duration / max_duration) * (chart_height - 20)  # 20px for label
             if bar_height < 5:
@@ -75,47 +203,84 @@ class ChartView(QWidget):
             bar_height = int(bar_height)  # Convert to integer
 
             # Bar position
-            y = height - margin - bar_height
-            y = int(y)  # Convert to integer
+            y = int(height - margin - bar_height)
             bar_rect = QRect(x, y, bar_width, bar_height)
             self.bar_rects.append((bar_rect, app, duration))
-
-            # Determine bar color (highlight if hovered)
-            if self.hovered_bar == bar_index:
-                painter.setBrush(highlight_color)
-            else:
-                painter.setBrush(bar_color)
+            self._bar_lefts.append(x)
 
             # Draw bar
-            painter.setPen(border_color)
+            painter.setPen(BORDER_COLOR)
+            painter.setBrush(OTHER_COLOR if app.startswith("Other (") else BAR_COLOR)
             painter.drawRect(bar_rect)
 
             # Draw app name (rotated 45 degrees for readability)
             painter.save()
             painter.translate(x + bar_width // 2, height - margin + 10)
             painter.rotate(-45)
-            painter.setPen(text_color)
+            painter.setPen(TEXT_COLOR)
             painter.drawText(0, 0, app[:15])  # Truncate long names
             painter.restore()
 
             # Draw duration label above bar
-            formatted_time = self.format_time(duration)
-            painter.setPen(text_color)
-            painter.drawText(x, y - 10, f"{formatted_time}")
-
-            x += bar_width + bar_spacing
-            bar_index += 1
+            painter.setPen(TEXT_COLOR)
+            painter.drawText(x, y - 10, self.format_time(duration))
+        painter.setClipping(False)
 
         # Draw Y-axis labels (time)
-        painter.setPen(text_color)
+        painter.setPen(TEXT_COLOR)
         painter.setFont(QFont("Segoe UI", 8))
         for i in range(0, 5):  # 5 steps on Y-axis
             fraction = i / 4
-            y = height - margin - fraction * chart_height
-            y = int(y)  # Convert to integer
+            y = int(height - margin - fraction * chart_height)
             duration = fraction * max_duration
             painter.drawText(margin - 30, y + 5, self.format_time(duration))
 
+    def paint_heatmap(self, painter):
+        """Draw one row per label and one column per hour, shaded by seconds of use"""
+        rows = sorted(self.heatmap_rows.items(), key=lambda x: sum(x[1]), reverse=True)
+        if not rows:
+            painter.setPen(TEXT_COLOR)
+            painter.setFont(QFont("Segoe UI", 12))
+            painter.drawText(self.rect(), Qt.AlignCenter, "No hourly data to display")
+            return
+
+        margin = 20
+        label_width = 110
+        axis_height = 20
+        cell_width = max(1, (self.width() - 2 * margin - label_width) // 24)
+        cell_height = max(1, min(28, (self.height() - 2 * margin - axis_height) // len(rows)))
+        max_value = max(max(hours) for _, hours in rows) or 1
+        low = BACKGROUND_COLOR
+        high = HIGHLIGHT_COLOR
+        self._heatmap_grid = (margin + label_width, margin, cell_width, cell_height, len(rows))
+
+        painter.setFont(QFont("Segoe UI", 9))
+        for row_index, (label, hours) in enumerate(rows):
+            y = margin + row_index * cell_height
+            painter.setPen(TEXT_COLOR)
+            painter.drawText(QRect(margin, y, label_width - 5, cell_height),
+                             Qt.AlignVCenter | Qt.AlignRight, label[:15])
+            for hour, seconds in enumerate(hours):
+                x = margin + label_width + hour * cell_width
+                fraction = seconds / max_value
+                color = QColor(
+                    int(low.red() + (high.red() - low.red()) * fraction),
+                    int(low.green() + (high.green() - low.green()) * fraction),
+                    int(low.blue() + (high.blue() - low.blue()) * fraction),
+                )
+                cell_rect = QRect(x, y, cell_width, cell_height)
+                painter.fillRect(cell_rect, color)
+                painter.setPen(BORDER_COLOR)
+                painter.drawRect(cell_rect)
+                self.bar_rects.append((cell_rect, f"{label} {hour:02d}:00", seconds))
+
+        # Hour labels every 3 hours
+        painter.setPen(TEXT_COLOR)
+        painter.setFont(QFont("Segoe UI", 8))
+        axis_y = margin + len(rows) * cell_height + 15
+        for hour in range(0, 24, 3):
+            painter.drawText(margin + label_width + hour * cell_width, axis_y, f"{hour:02d}")
+
     def format_time(self, seconds):
         """Format duration in seconds to a readable string"""
         total_seconds = round(float(seconds))
@@ -129,21 +294,40 @@ class ChartView(QWidget):
         else:
             return f"{secs}s"
 
+    def hit_test(self, pos):
+        """Return the index of the bar (or heatmap cell) under pos, or None"""
+        if self._heatmap_grid is not None:
+            left, top, cell_width, cell_height, num_rows = self._heatmap_grid
+            col = (pos.x() - left) // cell_width
+            row = (pos.y() - top) // cell_height
+            if pos.x() >= left and pos.y() >= top and 0 <= col < 24 and 0 <= row < num_rows:
+                return row * 24 + col
+            return None
+        index = bisect_right(self._bar_lefts, pos.x()) - 1
+        if index >= 0 and self.bar_rects[index][0].contains(pos):
+            return index
+        return None
+
     def mouseMoveEvent(self, event):
         """Handle mouse movement to show tooltips"""
-        pos = event.pos()
-        self.hovered_bar = None
-        for index, (rect, app, duration) in enumerate(self.bar_rects):
-            if rect.contains(pos):
-                self.hovered_bar = index
-                formatted_time = self.format_time(duration)
-                self.setToolTip(f"{app}: {formatted_time}")
-                break
+        index = self.hit_test(event.pos())
+        if index == self.hovered_bar:
+            return  # Same bar, nothing to repaint
+        previous = self.hovered_bar
+        self.hovered_bar = index
+        if index is not None:
+            rect, app, duration = self.bar_rects[index]
+            self.setToolTip(f"{app}: {self.format_time(duration)}")
         else:
             self.setToolTip("")
-        self.update()  # Repaint to show highlight
+        # Repaint only the old and new highlight areas
+        for changed in (previous, index):
+            if changed is not None and changed < len(self.bar_rects):
+                self.update(self.bar_rects[changed][0].adjusted(-2, -2, 2, 2))
 
     def resizeEvent(self, event):
         """Handle widget resize"""
         super().resizeEvent(event)
-        self.update()
\ No newline at end of file
+        bar_height = self.scrollbar.sizeHint().height()
+        self.scrollbar.setGeometry(0, self.height() - bar_height, self.width(), bar_height)
+        self._invalidate()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import os
+from PyQt5.QtCore import QResource, QFile
+from PyQt5.QtGui import QIcon
+from modules.app_index import canonical_app_name
+from modules.app_categories import category_for
+
+ICON_DIR = "icons"
+RESOURCE_FILE = os.path.join(ICON_DIR, "icons.rcc")  # Compiled from icons/icons.qrc
+
+# Specific icon per app keyword, used when the bundle ships it
+APP_ICONS = {
+    'chrome': 'browser',
+    'firefox': 'browser',
+    'edge': 'browser',
+    'safari': 'browser',
+    'opera': 'browser',
+    'brave': 'browser',
+    'code': 'vscode',
+    'vscode': 'vscode',
+    'visual studio': 'vs',
+    'sublime': 'sublime',
+    'atom': 'atom',
+    'android studio': 'android',
+    'pycharm': 'pycharm',
+    'intellij': 'intellij',
+    'photoshop': 'photoshop',
+    'illustrator': 'illustrator',
+    'figma': 'figma',
+    'docker': 'docker',
+    'postman': 'postman'
+}
+
+# Fallback icon per category
+CATEGORY_ICONS = {
+    'editors': 'code',
+    'browsers': 'browser',
+    'design': 'design',
+}
+
+class IconCache:
+    """Process-wide QIcon cache keyed by canonical app name, including misses."""
+
+    def __init__(self):
+        self._icons = {}  # canonical app name: QIcon (a null QIcon records a miss)
+        self._sources = None  # icon name: path (":/icons/..." or on disk), filled by preload()
+        self._loaded = {}  # icon name: QIcon, shared between apps
+
+    def preload(self):
+        """Register the bundled resource file (or list the icon directory once) and load every icon."""
+        if self._sources is not None:
+            return
+        self._sources = {}
+        if os.path.exists(RESOURCE_FILE) and QResource.registerResource(RESOURCE_FILE):
+            for name in APP_ICONS.values():
+                self._add_source(name, f":/icons/{name}.png")
+            for name in CATEGORY_ICONS.values():
+                self._add_source(name, f":/icons/{name}.png")
+            self._add_source('app_icon', ":/icons/app_icon.png")
+        else:
+            try:
+                for filename in os.listdir(ICON_DIR):
+                    name, ext = os.path.splitext(filename)
+                    if ext.lower() == ".png":
+                        self._sources[name] = os.path.join(ICON_DIR, filename)
+            except FileNotFoundError:
+                print(f"Debug: Icon directory {ICON_DIR} not found")
+        for name, path in self._sources.items():
+            self._loaded[name] = QIcon(path)
+        print(f"Debug: Preloaded icons: {sorted(self._loaded)}")
+
+    def _add_source(self, name, path):
+        if QFile.exists(path):
+            self._sources[name] = path
+
+    def named(self, name):
+        """Return a preloaded icon by file name (without extension), or a null icon."""
+        self.preload()
+        icon = self._loaded.get(name)
+        return icon if icon is not None else QIcon()
+
+    def icon_for(self, app_name):
+        """Return the icon for an app; resolved once per canonical name, never touching disk again."""
+        key = canonical_app_name(app_name)
+        icon = self._icons.get(key)
+        if icon is None:
+            self.preload()
+            icon = self._resolve(key)
+            self._icons[key] = icon
+        return icon
+
+    def _resolve(self, key):
+        for keyword, name in APP_ICONS.items():
+            if keyword in key and name in self._loaded:
+                return self._loaded[name]
+        name = CATEGORY_ICONS.get(category_for(key))
+        if name in self._loaded:
+            return self._loaded[name]
+        return QIcon()  # Negative entry: no icon shipped for this app
+
+_cache = IconCache()
+
+def icon_cache():
+    """Return the shared icon cache."""
+    return _cache
\ No newline at end of file
@@ -0,0 +1,116 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from utils.helpers import format_duration
+
+APP_COLUMN = 0
+TIME_COLUMN = 1
+SHARE_COLUMN = 2
+HEADERS = ["Application", "Time Spent", "Share"]
+
+SORT_ROLE = Qt.UserRole  # Raw value used by the proxy for sorting
+
+class UsageSummaryModel(QAbstractTableModel):
+    """
+    Table model over {app: seconds}. set_totals() diffs against the current rows and
+    emits only the insert/remove/dataChanged signals needed; rows never move, the
+    sorting proxy takes care of order.
+    """
+
+    def __init__(self, icon_provider=None, parent=None):
+        super().__init__(parent)
+        self.icon_provider = icon_provider  # callable(app_name) -> QIcon, expected to be cached
+        self._apps = []  # Row order (append-only, compacted on removal)
+        self._seconds = {}  # app: seconds
+        self._row_of = {}  # app: row
+        self._total = 0.0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._apps)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        app = self._apps[index.row()]
+        seconds = self._seconds[app]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == APP_COLUMN:
+                return app
+            if column == TIME_COLUMN:
+                return format_duration(seconds)
+            share = (seconds / self._total) * 100 if self._total > 0 else 0
+            return f"{share:.1f}%"
+        if role == SORT_ROLE:
+            return app.lower() if column == APP_COLUMN else seconds
+        if role == Qt.DecorationRole and column == APP_COLUMN and self.icon_provider:
+            return self.icon_provider(app)
+        if role == Qt.TextAlignmentRole and column != APP_COLUMN:
+            return Qt.AlignCenter
+        return None
+
+    def set_totals(self, totals):
+        """Apply a new {app: seconds} aggregate, touching only rows and cells that changed."""
+        # Remove vanished apps, highest rows first so earlier indices stay valid
+        removed_rows = sorted((self._row_of[app] for app in self._apps if app not in totals), reverse=True)
+        for row in removed_rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            app = self._apps.pop(row)
+            del self._seconds[app]
+            self.endRemoveRows()
+        if removed_rows:
+            self._row_of = {app: row for row, app in enumerate(self._apps)}
+
+        # Update changed values in place
+        changed_rows = []
+        for app, seconds in totals.items():
+            row = self._row_of.get(app)
+            if row is not None and self._seconds[app] != seconds:
+                self._seconds[app] = seconds
+                changed_rows.append(row)
+        for first, last in _row_ranges(changed_rows):
+            self.dataChanged.emit(self.index(first, TIME_COLUMN), self.index(last, TIME_COLUMN),
+                                  [Qt.DisplayRole, SORT_ROLE])
+
+        # Append new apps in one block
+        new_apps = [app for app in totals if app not in self._row_of]
+        if new_apps:
+            first = len(self._apps)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_apps) - 1)
+            for app in new_apps:
+                self._row_of[app] = len(self._apps)
+                self._apps.append(app)
+                self._seconds[app] = totals[app]
+            self.endInsertRows()
+
+        # Shares depend on the grand total, so refresh that column only when it moves
+        total = sum(totals.values())
+        if total != self._total:
+            self._total = total
+            if self._apps:
+                self.dataChanged.emit(self.index(0, SHARE_COLUMN),
+                                      self.index(len(self._apps) - 1, SHARE_COLUMN), [Qt.DisplayRole])
+
+def _row_ranges(rows):
+    """Group row numbers into contiguous (first, last) ranges."""
+    ranges = []
+    for row in sorted(rows):
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+class UsageSortProxy(QSortFilterProxyModel):
+    """Sorts the summary by raw seconds (or app name) and re-sorts as values change."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
\ No newline at end of file
@@ -0,0 +1,91 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QColor, QFont, QPixmap
+from PyQt5.QtCore import Qt, QRect
+
+# Theme colors
+BACKGROUND_COLOR = QColor("#2A3536")
+TEXT_COLOR = QColor("#D3D7D9")
+LANE_COLORS = [QColor("#0969DA"), QColor("#2DA44E"), QColor("#BF8700"), QColor("#8250DF"),
+               QColor("#CF222E"), QColor("#1B7C83"), QColor("#BC4C00"), QColor("#57606A")]
+
+COLUMN_WIDTH = 1  # Pixels per tick
+LANE_HEIGHT = 12
+MAX_VISIBLE_LANES = 8
+
+class TimelineView(QWidget):
+    """
+    Scrolling strip of recent app presence, one lane per app and one column per tick.
+    The strip lives in a cached pixmap; each tick scrolls it left and paints only the
+    new column, so drawing cost does not grow with the window or the session length.
+    """
+
+    def __init__(self, timeline, parent=None):
+        super().__init__(parent)
+        self.timeline = timeline  # ActivityRingBuffer filled by the tracker
+        self._pixmap = None
+        self._drawn_total = 0  # timeline.total_appended at the last draw
+        self._lanes = []  # (lane, app name) the pixmap was laid out for, one row each
+        self.setMinimumHeight(LANE_HEIGHT * 3)
+        self.setMaximumHeight(LANE_HEIGHT * MAX_VISIBLE_LANES)
+
+    def refresh(self):
+        """Draw samples appended since the last call; call once per tracker tick."""
+        if self._pixmap is None or self._pixmap.size() != self.size() or self._lanes != self._visible_lanes():
+            self._redraw_all()
+        else:
+            samples = self.timeline.samples_since(self._drawn_total)
+            if not samples:
+                return
+            shift = len(samples) * COLUMN_WIDTH
+            if shift >= self._pixmap.width():
+                self._redraw_all()
+            else:
+                self._pixmap.scroll(-shift, 0, self._pixmap.rect())
+                painter = QPainter(self._pixmap)
+                right = self._pixmap.width()
+                for i, mask in enumerate(samples):
+                    self._paint_column(painter, right - shift + i * COLUMN_WIDTH, mask)
+                painter.end()
+                self._drawn_total = self.timeline.total_appended
+        self.update()
+
+    def _visible_lanes(self):
+        """(lane, app name) of the apps present within the buffered window, the first MAX_VISIBLE_LANES of them."""
+        return [(lane, self.timeline.lane_names[lane]) for lane in self.timeline.active_lanes()[:MAX_VISIBLE_LANES]]
+
+    def _redraw_all(self):
+        """Lay out the pixmap again from the ring buffer (resize or a change in visible lanes)."""
+        self._pixmap = QPixmap(self.size())
+        self._pixmap.fill(BACKGROUND_COLOR)
+        self._lanes = self._visible_lanes()
+        painter = QPainter(self._pixmap)
+        columns = self._pixmap.width() // COLUMN_WIDTH
+        for age in range(min(columns, self.timeline.count)):
+            x = self._pixmap.width() - (age + 1) * COLUMN_WIDTH
+            self._paint_column(painter, x, self.timeline.sample(age))
+        painter.end()
+        self._drawn_total = self.timeline.total_appended
+
+    def _paint_column(self, painter, x, mask):
+        painter.fillRect(x, 0, COLUMN_WIDTH, self._pixmap.height(), BACKGROUND_COLOR)
+        for row, (lane, _) in enumerate(self._lanes):
+            if mask >> lane & 1:
+                painter.fillRect(x, row * LANE_HEIGHT + 1, COLUMN_WIDTH, LANE_HEIGHT - 2,
+                                 LANE_COLORS[lane % len(LANE_COLORS)])
+
+    def resizeEvent(self, event):
+        self._pixmap = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self._pixmap is None:
+            self._redraw_all()
+        painter = QPainter(self)
+        painter.drawPixmap(event.rect(), self._pixmap, event.rect())
+        # Lane labels are drawn over the strip so they never scroll with it
+        painter.setPen(TEXT_COLOR)
+        painter.setFont(QFont("Arial", 7))
+        for row, (_, name) in enumerate(self._lanes):
+            painter.drawText(QRect(4, row * LANE_HEIGHT, self.width() - 8, LANE_HEIGHT),
+                             Qt.AlignLeft | Qt.AlignVCenter, name)
+        painter.end()
\ No newline at end of file
@@ -0,0 +1,31 @@
+from datetime import date, timedelta
+
+def format_duration(seconds):
+    """Format seconds as "1 hr 5 min", "3 min 20 sec" or "12 sec"."""
+    try:
+        total_seconds = round(float(seconds))
+        hours = int(total_seconds // 3600)
+        minutes = int((total_seconds % 3600) // 60)
+        secs = int(total_seconds % 60)
+        if hours > 0:
+            return f"{hours} hr {minutes} min"
+        elif minutes > 0:
+            return f"{minutes} min {secs} sec"
+        else:
+            return f"{secs} sec"
+    except (ValueError, TypeError):
+        return "0 sec"
+
+def parse_day(value):
+    """Parse "YYYY-MM-DD", "today", "yesterday" or "-N" (N days ago) into a date; raises ValueError."""
+    value = value.strip().lower()
+    if value == "today":
+        return date.today()
+    if value == "yesterday":
+        return date.today() - timedelta(days=1)
+    if value.startswith("-") and value[1:].isdigit():
+        return date.today() - timedelta(days=int(value[1:]))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"not a day: {value!r} (use YYYY-MM-DD, today, yesterday or -N)")
\ No newline at end of file